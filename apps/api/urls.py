@@ -4,8 +4,13 @@ from apps.api import views
 
 urlpatterns = [
     path('events/', views.events_collection, name='events_collection'),
+    path('events/export/', views.events_export, name='events_export'),
     path('events/<slug:slug>/', views.event_detail, name='event_detail'),
     path('categories/', views.categories_list, name='categories'),
     path('venues/', views.venues_list, name='venues'),
     path('reviews/', views.reviews_list, name='reviews'),
+    path('notifications/', views.notifications_list, name='notifications'),
+    path('notifications/read/', views.notifications_read, name='notifications_read'),
+    path('checkin/', views.checkin, name='checkin'),
+    path('payments/webhook/', views.payment_webhook, name='payment_webhook'),
 ]
@@ -1,18 +1,32 @@
 import json
+import uuid
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.core.paginator import Paginator
-from django.db.models import Avg, Count, Q
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.utils.dateparse import parse_datetime
+from django.views.decorators.csrf import csrf_exempt
 
 from apps.categories.models import Category
+from apps.core.pagination import InvalidCursor
 from apps.events.models import Event
+from apps.events.query import COUNT_MODES, EventFilters, EventQuery
+from apps.notifications import inbox
+from apps.notifications.models import Notification
+from apps.orders.payments import SIGNATURE_HEADER, WebhookError, ingest
 from apps.organizers.models import OrganizerMember
 from apps.reviews.models import Review
+from apps.tickets import checkin as ticket_checkin
 from apps.venues.models import Venue
 
 
+EXPORT_CHUNK_SIZE = 500
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'json': 'application/json; charset=utf-8',
+}
+
+
 def _error(message: str, code: str = 'bad_request', status: int = 400):
     return JsonResponse({'error': {'code': code, 'message': message}}, status=status)
 
@@ -33,8 +47,6 @@ def _can_manage_event(user, *, organizer_id=None, event: Event | None = None) ->
 
 
 def _event_to_dict(event: Event) -> dict:
-    avg_rating = getattr(event, 'avg_rating', None)
-    reviews_count = getattr(event, 'reviews_count', None)
     return {
         'id': event.id,
         'title': event.title,
@@ -47,8 +59,8 @@ def _event_to_dict(event: Event) -> dict:
         'tags': [t.name for t in event.tags.all()],
         'price_from': str(event.price_from),
         'status': event.status,
-        'avg_rating': round(avg_rating, 1) if avg_rating is not None else None,
-        'reviews_count': reviews_count if reviews_count is not None else 0,
+        'avg_rating': round(event.avg_rating, 1) if event.avg_rating is not None else None,
+        'reviews_count': event.reviews_count,
     }
 
 
@@ -63,39 +75,96 @@ def _review_to_dict(review: Review) -> dict:
     }
 
 
+def _notification_to_dict(notification: Notification) -> dict:
+    return {
+        'id': notification.id,
+        'title': notification.title,
+        'message': notification.message,
+        'is_read': notification.is_read,
+        'created_at': notification.created_at.isoformat(),
+    }
+
+
+def _page_size(request, default: int = 10) -> int | None:
+    raw = request.GET.get('page_size')
+    if raw in (None, ''):
+        return default
+    try:
+        size = int(raw)
+    except ValueError:
+        return None
+    if size < 1:
+        return None
+    return min(size, settings.API_MAX_PAGE_SIZE)
+
+
+def _export_lines(events, fmt: str):
+    """Serialize events one chunk at a time so memory does not grow with the table size."""
+    batch = []
+    first = True
+    if fmt == 'json':
+        yield '['
+    for event in events:
+        line = json.dumps(_event_to_dict(event), ensure_ascii=False)
+        if fmt == 'json':
+            batch.append(line if first else ',' + line)
+        else:
+            batch.append(line + '\n')
+        first = False
+        if len(batch) >= EXPORT_CHUNK_SIZE:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+    if fmt == 'json':
+        yield ']'
+
+
+def events_export(request):
+    if request.method != 'GET':
+        return _error('Method not allowed', 'method_not_allowed', 405)
+    fmt = request.GET.get('format', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        return _error(f"format must be one of: {', '.join(EXPORT_FORMATS)}", 'validation_error', 400)
+    events = (
+        EventQuery(EventFilters.from_params(request.GET)).queryset()
+        .for_api()
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    response = StreamingHttpResponse(_export_lines(events, fmt), content_type=EXPORT_FORMATS[fmt])
+    response['Content-Disposition'] = f'attachment; filename="events.{fmt}"'
+    return response
+
+
 def events_collection(request):
     if request.method == 'GET':
-        events = (
-            Event.objects.select_related('venue', 'organizer')
-            .prefetch_related('categories', 'tags')
-            .filter(status=Event.STATUS_PUBLISHED)
-            .annotate(
-                avg_rating=Avg('reviews__rating', distinct=True),
-                reviews_count=Count('reviews', distinct=True),
-            )
-        )
-        q = request.GET.get('q')
-        if q:
-            events = events.filter(Q(title__icontains=q) | Q(organizer__name__icontains=q))
-        category = request.GET.get('category')
-        if category:
-            events = events.filter(categories__slug=category)
-        city = request.GET.get('city')
-        if city:
-            events = events.filter(venue__city__slug=city)
-        year = request.GET.get('year')
-        if year and year.isdigit():
-            events = events.filter(start_at__year=year)
-        ordering = request.GET.get('ordering')
-        if ordering in {'start_at', '-start_at', 'price_from', '-price_from'}:
-            events = events.order_by(ordering)
-        paginator = Paginator(events.distinct(), int(request.GET.get('page_size', 10)))
-        page = paginator.get_page(request.GET.get('page'))
+        query = EventQuery(EventFilters.from_params(request.GET))
+        events = Event.objects.for_api()
+        per_page = _page_size(request)
+        if per_page is None:
+            message = f'page_size must be an integer from 1 to {settings.API_MAX_PAGE_SIZE}.'
+            return _error(message, 'validation_error', 400)
+        if 'cursor' in request.GET or request.GET.get('pagination') == 'cursor':
+            count_mode = request.GET.get('count', 'none')
+            if count_mode not in COUNT_MODES:
+                return _error(f"count must be one of: {', '.join(COUNT_MODES)}", 'validation_error', 400)
+            try:
+                page = query.cursor_page(request.GET.get('cursor') or None, per_page, events)
+            except InvalidCursor as exc:
+                return _error(str(exc), 'invalid_cursor', 400)
+            return JsonResponse({
+                'count': query.count(count_mode),
+                'next': page.next_cursor,
+                'previous': page.prev_cursor,
+                'results': [_event_to_dict(e) for e in page.object_list],
+            })
+
+        page = query.page(request.GET.get('page'), per_page, events)
         data = [_event_to_dict(e) for e in page.object_list]
         return JsonResponse({
-            'count': paginator.count,
+            'count': page.paginator.count,
             'page': page.number,
-            'pages': paginator.num_pages,
+            'pages': page.paginator.num_pages,
             'results': data,
         })
 
@@ -140,15 +209,7 @@ def events_collection(request):
 
 def event_detail(request, slug):
     try:
-        event = (
-            Event.objects.select_related('venue', 'organizer')
-            .prefetch_related('categories', 'tags')
-            .annotate(
-                avg_rating=Avg('reviews__rating', distinct=True),
-                reviews_count=Count('reviews', distinct=True),
-            )
-            .get(slug=slug)
-        )
+        event = Event.objects.for_api().get(slug=slug)
     except Event.DoesNotExist:
         return _error('Event not found.', 'not_found', 404)
 
@@ -192,9 +253,124 @@ def venues_list(request):
 
 
 def reviews_list(request):
-    reviews = Review.objects.select_related('event', 'user').order_by('-created_at')
+    per_page = _page_size(request, default=50)
+    if per_page is None:
+        message = f'page_size must be an integer from 1 to {settings.API_MAX_PAGE_SIZE}.'
+        return _error(message, 'validation_error', 400)
+    reviews = Review.objects.select_related('event')
+    count = None
     event_slug = request.GET.get('event')
     if event_slug:
-        reviews = reviews.filter(event__slug=event_slug)
-    data = [_review_to_dict(r) for r in reviews[:50]]
-    return JsonResponse({'results': data})
+        event = Event.objects.filter(slug=event_slug).only('reviews_count').first()
+        reviews = reviews.filter(event=event) if event else reviews.none()
+        # The stored counter, not a COUNT over the reviews table.
+        count = event.reviews_count if event else 0
+    try:
+        page = reviews.page(request.GET.get('cursor') or None, per_page)
+    except InvalidCursor as exc:
+        return _error(str(exc), 'invalid_cursor', 400)
+    return JsonResponse({
+        'count': count,
+        'next': page.next_cursor,
+        'previous': page.prev_cursor,
+        'results': [_review_to_dict(r) for r in page.object_list],
+    })
+
+
+def notifications_list(request):
+    """The signed-in user's inbox, newest first; ``?unread=1`` keeps unread ones only."""
+    if not request.user.is_authenticated:
+        return _error('Authentication required.', 'unauthorized', 401)
+    per_page = _page_size(request, default=20)
+    if per_page is None:
+        message = f'page_size must be an integer from 1 to {settings.API_MAX_PAGE_SIZE}.'
+        return _error(message, 'validation_error', 400)
+    notifications = Notification.objects.filter(user=request.user)
+    if request.GET.get('unread') == '1':
+        notifications = notifications.filter(is_read=False)
+    try:
+        page = notifications.page(request.GET.get('cursor') or None, per_page)
+    except InvalidCursor as exc:
+        return _error(str(exc), 'invalid_cursor', 400)
+    return JsonResponse({
+        'unread': inbox.unread_count(request.user.pk),
+        'next': page.next_cursor,
+        'previous': page.prev_cursor,
+        'results': [_notification_to_dict(n) for n in page.object_list],
+    })
+
+
+def notifications_read(request):
+    """Mark notifications read: ``{"ids": [...]}`` or ``{"all": true}``, each one UPDATE."""
+    if request.method != 'POST':
+        return _error('Method not allowed', 'method_not_allowed', 405)
+    if not request.user.is_authenticated:
+        return _error('Authentication required.', 'unauthorized', 401)
+    try:
+        payload = json.loads(request.body.decode('utf-8'))
+    except json.JSONDecodeError:
+        return _error('Invalid JSON payload.', 'invalid_json', 400)
+    if not isinstance(payload, dict):
+        return _error('Expected a JSON object.', 'validation_error', 400)
+    if payload.get('all') is True:
+        updated = inbox.mark_all_read(request.user.pk)
+    else:
+        ids = payload.get('ids')
+        if not isinstance(ids, list) or not all(type(pk) is int for pk in ids):
+            return _error('ids must be a list of notification ids, or pass "all": true.', 'validation_error', 400)
+        updated = inbox.mark_read(request.user.pk, ids)
+    return JsonResponse({'updated': updated, 'unread': inbox.unread_count(request.user.pk)})
+
+
+def checkin(request):
+    """Scan one ticket at the door: ``{"event": <id>, "code": "<uuid>"}``.
+
+    Codes are checked against the event's in-memory index; ``used`` is written in batches, by this
+    request once a batch is due or by the background flusher within ``FLUSH_INTERVAL``.
+    """
+    if request.method != 'POST':
+        return _error('Method not allowed', 'method_not_allowed', 405)
+    try:
+        payload = json.loads(request.body.decode('utf-8'))
+        event_id = int(payload['event'])
+        code = uuid.UUID(str(payload['code']))
+    except json.JSONDecodeError:
+        return _error('Invalid JSON payload.', 'invalid_json', 400)
+    except (KeyError, TypeError, ValueError):
+        return _error('event must be an id and code a ticket UUID.', 'validation_error', 400)
+
+    index = ticket_checkin.loaded(event_id)
+    if index is None or not index.is_staff(request.user.pk):
+        event = Event.objects.filter(pk=event_id).only('organizer').first()
+        if event is None:
+            return _error('Event not found.', 'not_found', 404)
+        if not _can_manage_event(request.user, event=event):
+            return _error('Not enough permissions.', 'forbidden', 403)
+        index = ticket_checkin.index_for(event_id)
+        index.admit_staff(request.user.pk)
+
+    result = index.scan(code, shared_guard=True)
+    if result == ticket_checkin.UNKNOWN and index.refresh(code):
+        result = index.scan(code, shared_guard=True)
+    if index.should_flush():
+        index.flush()
+
+    if result == ticket_checkin.ALREADY_USED:
+        return _error('Ticket has already been used.', 'already_used', 409)
+    if result == ticket_checkin.CANCELLED:
+        return _error('Ticket has been cancelled.', 'cancelled', 409)
+    if result == ticket_checkin.UNKNOWN:
+        return _error('Ticket not found for this event.', 'unknown_ticket', 404)
+    return JsonResponse({'result': result, 'code': str(code)})
+
+
+@csrf_exempt  # called by the payment provider; the HMAC signature stands in for the CSRF token
+def payment_webhook(request):
+    """Provider callback: the payment status is applied at once, tickets are issued by the job worker."""
+    if request.method != 'POST':
+        return _error('Method not allowed', 'method_not_allowed', 405)
+    try:
+        result = ingest(request.body, request.headers.get(SIGNATURE_HEADER, ''))
+    except WebhookError as exc:
+        return _error(exc.message, exc.code, exc.status)
+    return JsonResponse({'result': result})
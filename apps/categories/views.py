@@ -1,6 +1,5 @@
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Avg, Count
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, DeleteView, UpdateView
@@ -55,12 +54,5 @@ def category_list(request):
 
 def category_detail(request, slug):
     category = get_object_or_404(Category, slug=slug)
-    events = (
-        Event.objects.filter(categories=category)
-        .annotate(
-            avg_rating=Avg('reviews__rating', distinct=True),
-            reviews_count=Count('reviews', distinct=True),
-        )
-        .order_by('start_at')
-    )
+    events = Event.objects.for_cards().filter(categories=category).order_by('start_at')
     return render(request, 'categories/category_detail.html', {'category': category, 'events': events})
@@ -0,0 +1,188 @@
+import os
+import pickle
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# Share of writes that also sweep expired rows; culling scans the table.
+CULL_PROBABILITY = 0.01
+
+
+class SQLiteCache(BaseCache):
+    """Cache in a local SQLite file shared by every worker process on the host.
+
+    Integers are stored as SQLite integers so ``incr``/``decr`` update them in place, atomically;
+    other values are pickled. Expired rows are removed lazily and when the table is culled.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self.path = Path(location)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections never cross a fork: gunicorn may import the app before forking workers.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entry '
+                '(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL) WITHOUT ROWID'
+            )
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @staticmethod
+    def _encode(value):
+        if type(value) is int:
+            return value
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _decode(value):
+        return value if isinstance(value, int) else pickle.loads(value)
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            'SELECT value FROM cache_entry WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time()),
+        ).fetchone()
+        return default if row is None else self._decode(row[0])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        conn.execute(
+            'INSERT INTO cache_entry (key, value, expires) VALUES (?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires',
+            (key, self._encode(value), self.get_backend_timeout(timeout)),
+        )
+        self._maybe_cull(conn)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        # Takes over an expired row, never a live one.
+        cursor = conn.execute(
+            'INSERT INTO cache_entry (key, value, expires) VALUES (?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires '
+            'WHERE cache_entry.expires IS NOT NULL AND cache_entry.expires <= ?',
+            (key, self._encode(value), self.get_backend_timeout(timeout), time.time()),
+        )
+        self._maybe_cull(conn)
+        return cursor.rowcount > 0
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute(
+            'UPDATE cache_entry SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self.get_backend_timeout(timeout), key, time.time()),
+        )
+        return cursor.rowcount > 0
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute('DELETE FROM cache_entry WHERE key = ?', (key,))
+        return cursor.rowcount > 0
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            'SELECT 1 FROM cache_entry WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time()),
+        ).fetchone()
+        return row is not None
+
+    def incr(self, key, delta=1, version=None):
+        raw_key, key = key, self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = conn.execute(
+                'UPDATE cache_entry SET value = value + ? WHERE key = ? '
+                "AND typeof(value) = 'integer' AND (expires IS NULL OR expires > ?)",
+                (delta, key, time.time()),
+            )
+            if not cursor.rowcount:
+                raise ValueError(f"Key '{raw_key}' not found")
+            value = conn.execute('SELECT value FROM cache_entry WHERE key = ?', (key,)).fetchone()[0]
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return value
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache_entry')
+
+    def close(self, **kwargs):
+        # One connection per thread is kept for the life of the worker.
+        pass
+
+    def _maybe_cull(self, conn: sqlite3.Connection) -> None:
+        if random.random() >= CULL_PROBABILITY:
+            return
+        now = time.time()
+        conn.execute('DELETE FROM cache_entry WHERE expires IS NOT NULL AND expires <= ?', (now,))
+        (count,) = conn.execute('SELECT COUNT(*) FROM cache_entry').fetchone()
+        if count > self._max_entries:
+            conn.execute(
+                'DELETE FROM cache_entry WHERE key IN '
+                '(SELECT key FROM cache_entry ORDER BY expires IS NULL, expires LIMIT ?)',
+                (count // self._cull_frequency,),
+            )
+
+
+class CacheNamespace:
+    """Keys that are invalidated together by bumping one shared version counter.
+
+    Old entries are not deleted; they stop being addressed and expire on their own.
+    """
+
+    def __init__(self, name: str, alias: str = 'default'):
+        self.name = name
+        self.alias = alias
+
+    @property
+    def version_key(self) -> str:
+        return f'{self.name}:version'
+
+    def version(self) -> int:
+        cache = caches[self.alias]
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, 1, None)
+            version = cache.get(self.version_key, 1)
+        return version
+
+    def key(self, *parts) -> str:
+        return ':'.join([self.name, f'v{self.version()}', *map(str, parts)])
+
+    def invalidate(self) -> None:
+        cache = caches[self.alias]
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            # The counter was evicted; any fresh value differs from what readers cached.
+            cache.set(self.version_key, int(time.time()), None)
+
+
+def count_hit(key: str, timeout: int, alias: str = 'default') -> int:
+    """Atomically count one more hit in a window that starts with the first hit."""
+    cache = caches[alias]
+    cache.add(key, 0, timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # The window expired between add() and incr().
+        cache.set(key, 1, timeout)
+        return 1
@@ -0,0 +1,89 @@
+import logging
+import traceback
+import uuid
+from datetime import timedelta
+from typing import Callable
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.core.models import Job
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+# Seconds before a retry: RETRY_DELAY, then doubling with every failed attempt.
+RETRY_DELAY = 10
+# A job claimed longer ago than this belongs to a worker that died; another worker may take it.
+LEASE = timedelta(minutes=5)
+
+_handlers: dict[str, Callable] = {}
+
+
+class LeaseLost(Exception):
+    """The job was claimed by another worker while this one ran it."""
+
+
+def job(name: str):
+    """Register the decorated function as the handler of jobs called ``name``.
+
+    Handlers live in each app's ``jobs`` module, imported from ``AppConfig.ready``. They receive
+    the payload as keyword arguments and run in one transaction with the removal of the job, so
+    their database writes happen once; anything else they do must be safe to repeat on a retry.
+    """
+    def register(func):
+        _handlers[name] = func
+        return func
+    return register
+
+
+def enqueue(name: str, run_at=None, **payload) -> Job:
+    """Queue a job; inside a transaction it becomes visible to workers only on commit."""
+    return Job.objects.create(name=name, payload=payload, run_at=run_at or timezone.now())
+
+
+def run_jobs(batch_size: int = 100, now=None) -> int:
+    """Claim one batch of due jobs and run them; returns how many were run."""
+    now = now or timezone.now()
+    ids = list(
+        Job.objects.filter(status=Job.STATUS_QUEUED, run_at__lte=now)
+        .filter(Q(claim__isnull=True) | Q(claimed_at__lt=now - LEASE))
+        .order_by('run_at')
+        .values_list('pk', flat=True)[:batch_size]
+    )
+    if not ids:
+        return 0
+    token = uuid.uuid4()
+    Job.objects.filter(pk__in=ids).filter(Q(claim__isnull=True) | Q(claimed_at__lt=now - LEASE)).update(
+        claim=token, claimed_at=now, attempts=F('attempts') + 1
+    )
+    jobs = list(Job.objects.filter(claim=token).order_by('run_at'))
+    for queued in jobs:
+        _run(queued)
+    return len(jobs)
+
+
+def _run(queued: Job) -> None:
+    handler = _handlers.get(queued.name)
+    try:
+        if handler is None:
+            raise LookupError(f'No handler registered for job {queued.name!r}')
+        with transaction.atomic():
+            handler(**queued.payload)
+            # Done only if the handler's writes commit; a crash before the commit leaves the job queued.
+            deleted, _by_model = Job.objects.filter(pk=queued.pk, claim=queued.claim).delete()
+            if not deleted:
+                raise LeaseLost(f'{queued} was taken over after its lease expired')
+    except LeaseLost:
+        # The other worker runs it; this run's writes were rolled back.
+        logger.warning('job %s lost its lease while running', queued)
+    except Exception:
+        logger.exception('job %s failed (attempt %s)', queued, queued.attempts)
+        error = traceback.format_exc()
+        if queued.attempts >= MAX_ATTEMPTS:
+            changes = {'status': Job.STATUS_FAILED}
+        else:
+            delay = timedelta(seconds=RETRY_DELAY * 2 ** (queued.attempts - 1))
+            changes = {'run_at': timezone.now() + delay}
+        Job.objects.filter(pk=queued.pk, claim=queued.claim).update(claim=None, last_error=error, **changes)
@@ -0,0 +1,129 @@
+import logging
+import traceback
+import uuid
+from collections.abc import Iterable
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.core.models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 5
+# Seconds before a retry: RETRY_DELAY, then doubling with every failed attempt.
+RETRY_DELAY = 60
+# A message claimed longer ago than this belongs to a worker that died.
+LEASE = timedelta(minutes=5)
+
+
+def queue_mail(subject: str, body: str, to: list[str], from_email: str = '', html_body: str = '',
+               send_at=None) -> OutboundEmail:
+    """Queue one message for `send_queued_mail`; inside a transaction it is sent only after commit."""
+    return OutboundEmail.objects.create(
+        subject=subject, body=body, to=list(to), from_email=from_email, html_body=html_body,
+        send_at=send_at or timezone.now(),
+    )
+
+
+def queue_mass_mail(subject: str, body: str, recipients: Iterable[str]) -> int:
+    """Queue the same message to each recipient separately, in one INSERT per batch."""
+    emails = [OutboundEmail(subject=subject, body=body, to=[address]) for address in recipients]
+    OutboundEmail.objects.bulk_create(emails, batch_size=500)
+    return len(emails)
+
+
+def _rate_key(now) -> str:
+    return f'mail:sent:{now:%Y%m%d%H%M}'
+
+
+def _reserve(now, wanted: int) -> int:
+    """Take up to ``wanted`` sends from this minute's ``EMAIL_RATE_LIMIT``, shared through the cache."""
+    limit = settings.EMAIL_RATE_LIMIT
+    if not limit:
+        return wanted
+    key = _rate_key(now)
+    cache.add(key, 0, 120)
+    try:
+        used = cache.incr(key, wanted)
+    except ValueError:
+        cache.set(key, wanted, 120)
+        used = wanted
+    return max(min(wanted, limit - (used - wanted)), 0)
+
+
+def _release(now, unused: int) -> None:
+    if settings.EMAIL_RATE_LIMIT and unused > 0:
+        try:
+            cache.decr(_rate_key(now), unused)
+        except ValueError:
+            pass
+
+
+def _message(email: OutboundEmail, connection) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(
+        email.subject, email.body, email.from_email or None, email.to, connection=connection
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, 'text/html')
+    return message
+
+
+def _retry(email: OutboundEmail, error: str) -> None:
+    logger.warning('email #%s failed (attempt %s)', email.pk, email.attempts)
+    if email.attempts >= MAX_ATTEMPTS:
+        changes = {'status': OutboundEmail.STATUS_FAILED}
+    else:
+        changes = {'send_at': timezone.now() + timedelta(seconds=RETRY_DELAY * 2 ** (email.attempts - 1))}
+    OutboundEmail.objects.filter(pk=email.pk, claim=email.claim).update(claim=None, last_error=error, **changes)
+
+
+def send_queued(batch_size: int = BATCH_SIZE, now=None) -> int:
+    """Claim one batch of due messages and send them over a single connection; returns how many were sent.
+
+    Returns 0 when the queue is empty or this minute's rate limit is used up.
+    """
+    now = now or timezone.now()
+    due = (
+        OutboundEmail.objects.filter(status=OutboundEmail.STATUS_QUEUED, send_at__lte=now)
+        .filter(Q(claim__isnull=True) | Q(claimed_at__lt=now - LEASE))
+    )
+    ids = list(due.order_by('send_at').values_list('pk', flat=True)[:batch_size])
+    if not ids:
+        return 0
+    granted = _reserve(now, len(ids))
+    if not granted:
+        return 0
+    token = uuid.uuid4()
+    due.filter(pk__in=ids[:granted]).update(claim=token, claimed_at=now, attempts=F('attempts') + 1)
+    emails = list(OutboundEmail.objects.filter(claim=token).order_by('send_at'))
+    _release(now, granted - len(emails))
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception:
+        logger.exception('could not open the mail connection')
+        error = traceback.format_exc()
+        for email in emails:
+            _retry(email, error)
+        return 0
+    sent = []
+    try:
+        # One message per call, so a rejected address fails alone, over the connection opened above.
+        for email in emails:
+            try:
+                connection.send_messages([_message(email, connection)])
+            except Exception:
+                _retry(email, traceback.format_exc())
+            else:
+                sent.append(email.pk)
+    finally:
+        connection.close()
+    OutboundEmail.objects.filter(pk__in=sent, claim=token).delete()
+    return len(sent)
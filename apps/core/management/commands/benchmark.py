@@ -0,0 +1,272 @@
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.api.views import _event_to_dict
+from apps.categories.models import Category
+from apps.core.models import City
+from apps.events.models import Event
+from apps.orders.models import Order
+from apps.tickets.models import Ticket
+
+# Wall time differences below this are noise, whatever the ratio. Above it, a slowdown counts only
+# when every new run is slower than every baseline run (see ``compare``).
+NOISE_MS = 2.0
+# The benchmark's own cache: --cold clears it without touching the one a running server shares.
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'cityevents-benchmark',
+    }
+}
+# Plan lines of a sort on SQLite and PostgreSQL.
+SORT_MARKERS = ('TEMP B-TREE FOR ORDER BY', 'Sort Key')
+
+
+def _scans_table(line: str) -> bool:
+    """A plan line reading a whole table: SQLite ``SCAN t`` without an index, PostgreSQL ``Seq Scan``."""
+    return (line.startswith('SCAN ') and 'INDEX' not in line) or 'Seq Scan' in line
+
+
+class Command(BaseCommand):
+    help = 'Time views, querysets and serializers against the current database and compare with a JSON baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case; the median is reported')
+        parser.add_argument('--cold', action='store_true', help='Clear the cache before every run')
+        parser.add_argument('--only', nargs='+', metavar='CASE', help='Run only these cases')
+        parser.add_argument(
+            '--explain', action='store_true', help='Print and store the plan of every SELECT and count full-table sorts',
+        )
+        parser.add_argument('--output', help='Write the results to this JSON file')
+        parser.add_argument('--compare', metavar='BASELINE', help='Compare with a JSON file written by --output')
+        parser.add_argument(
+            '--threshold', type=float, default=0.2, help='Slowdown or memory growth that counts as a regression',
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            try:
+                baseline = json.loads(Path(options['compare']).read_text())
+            except (OSError, ValueError) as exc:
+                raise CommandError(f'Cannot read baseline: {exc}')
+            if baseline['meta']['cold'] != options['cold']:
+                recorded = 'with' if baseline['meta']['cold'] else 'without'
+                raise CommandError(f'The baseline was recorded {recorded} --cold; compare in the same mode.')
+        if not Event.objects.exists():
+            raise CommandError('No events; run generate_data first.')
+
+        targets = baseline['meta']['targets'] if baseline else self.pick_targets()
+        cases = self.cases(targets)
+        if options['only']:
+            unknown = set(options['only']) - set(cases)
+            if unknown:
+                raise CommandError(f"Unknown cases: {', '.join(sorted(unknown))}. Known: {', '.join(cases)}")
+            cases = {name: run for name, run in cases.items() if name in options['only']}
+
+        results = {}
+        # The in-process client calls itself "testserver".
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'], CACHES=BENCHMARK_CACHES):
+            for name, run in cases.items():
+                results[name] = self.measure(run, options['repeat'], options['cold'], options['explain'])
+                self.stdout.write(self.format_line(name, results[name]))
+                for plan in results[name].get('plans', []):
+                    self.stdout.write(f"    {plan['sql'][:160]}")
+                    for line in plan['plan']:
+                        self.stdout.write(self.style.WARNING(f'      {line}') if plan['sorts'] else f'      {line}')
+
+        if options['output']:
+            report = {
+                'meta': {
+                    'created_at': timezone.now().isoformat(),
+                    'database': connection.vendor,
+                    'repeat': options['repeat'],
+                    'cold': options['cold'],
+                    'rows': {
+                        'events': Event.objects.count(),
+                        'orders': Order.objects.count(),
+                        'tickets': Ticket.objects.count(),
+                    },
+                    'targets': targets,
+                },
+                'results': results,
+            }
+            Path(options['output']).write_text(json.dumps(report, indent=2, ensure_ascii=False) + '\n')
+            self.stdout.write(f"Results written to {options['output']}.")
+        if baseline:
+            self.compare(baseline['results'], results, options['threshold'])
+
+    def pick_targets(self) -> dict:
+        """The user, event, city and category the cases request; stored in the baseline and reused by --compare."""
+        busiest = (
+            Ticket.objects.values('user').annotate(n=Count('id')).order_by('-n', 'user').values_list('user', flat=True)
+        )
+        user_id = busiest.first() or User.objects.order_by('pk').values_list('pk', flat=True).first()
+        if user_id is None:
+            raise CommandError('No users; run generate_data first.')
+        event = (
+            Event.objects.filter(status=Event.STATUS_PUBLISHED)
+            .order_by('-reviews_count', 'pk')
+            .values_list('slug', flat=True)
+            .first()
+        )
+        return {
+            'user': User.objects.get(pk=user_id).username,
+            'event': event,
+            'city': City.objects.order_by('pk').values_list('slug', flat=True).first(),
+            'category': Category.objects.order_by('pk').values_list('slug', flat=True).first(),
+        }
+
+    def cases(self, targets: dict) -> dict:
+        """Case name -> a callable doing one unit of work."""
+        anonymous = Client()
+        member = Client()
+        member.force_login(User.objects.get(username=targets['user']))
+
+        def get(client, url):
+            def run():
+                response = client.get(url)
+                if response.status_code != 200:
+                    raise CommandError(f'{url} returned {response.status_code}')
+            return run
+
+        events = reverse('events:list')
+        api_events = reverse('api:events_collection')
+        filtered = f"?city={targets['city']}&category={targets['category']}&ordering=start_at"
+        return {
+            'event_list': get(anonymous, events),
+            'event_list_filtered': get(anonymous, events + filtered),
+            'event_list_today': get(anonymous, events + '?when=today'),
+            'event_list_deep_page': get(anonymous, events + '?page=1000'),
+            'event_detail': get(anonymous, reverse('events:detail', kwargs={'slug': targets['event']})),
+            'events_collection': get(anonymous, api_events),
+            'events_collection_cursor': get(anonymous, api_events + '?pagination=cursor&page_size=100'),
+            'favorite_list': get(member, reverse('favorites:list')),
+            'stats': get(anonymous, reverse('pages:stats')),
+            'my_tickets': get(member, reverse('tickets:my')),
+            'queryset_for_cards': lambda: list(
+                Event.objects.for_cards().filter(status=Event.STATUS_PUBLISHED).order_by('start_at')[:100]
+            ),
+            'serialize_events': lambda: [_event_to_dict(event) for event in Event.objects.for_api().order_by('pk')[:500]],
+        }
+
+    def measure(self, run, repeat: int, cold: bool, explain: bool = False) -> dict:
+        """Queries and peak memory from one run each, then wall time over ``repeat`` runs."""
+        if cold:
+            cache.clear()
+        else:
+            run()  # warm the caches
+        with CaptureQueriesContext(connection) as ctx:
+            run()
+        queries = len(ctx)
+        plans = self.explain(ctx.captured_queries) if explain else None
+
+        if cold:
+            cache.clear()
+        tracemalloc.start()
+        try:
+            run()
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        timings = []
+        for _ in range(repeat):
+            if cold:
+                cache.clear()
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+        result = {
+            'time_ms': round(statistics.median(timings), 2),
+            'min_ms': round(min(timings), 2),
+            'max_ms': round(max(timings), 2),
+            'queries': queries,
+            'peak_kb': round(peak / 1024),
+        }
+        if plans is not None:
+            result['sorts'] = sum(plan['sorts'] for plan in plans)
+            result['plans'] = plans
+        return result
+
+    def explain(self, queries: list[dict]) -> list[dict]:
+        """The plan of each captured SELECT; the backend has already inlined its parameters."""
+        plans = []
+        prefix = connection.ops.explain_query_prefix()
+        with connection.cursor() as cursor:
+            for query in queries:
+                if not query['sql'].lstrip().upper().startswith('SELECT'):
+                    continue
+                cursor.execute(f"{prefix} {query['sql']}")
+                lines = [str(row[-1]) for row in cursor.fetchall()]
+                # A sort over a full scan orders the whole table instead of reading an index.
+                sorts = any(map(_scans_table, lines)) and any(m in line for line in lines for m in SORT_MARKERS)
+                plans.append({'sql': query['sql'], 'plan': lines, 'sorts': sorts})
+        return plans
+
+    def format_line(self, name: str, result: dict) -> str:
+        line = (
+            f"{name:<26} {result['time_ms']:>9.2f} ms (min {result['min_ms']:.2f})"
+            f"  {result['queries']:>3} queries  {result['peak_kb']:>7} KiB"
+        )
+        if 'sorts' in result:
+            line += f"  {result['sorts']} full sorts"
+        return line
+
+    def compare(self, baseline: dict, results: dict, threshold: float) -> None:
+        regressions = []
+        self.stdout.write('')
+        for name, result in results.items():
+            before = baseline.get(name)
+            if before is None:
+                self.stdout.write(f'{name:<26} not in the baseline')
+                continue
+            notes = []
+            delta = result['time_ms'] - before['time_ms']
+            ratio = result['time_ms'] / before['time_ms'] if before['time_ms'] else 1
+            # A shift of the median alone is noise while the two runs' timings overlap; baselines
+            # written before max_ms was recorded fall back to their median.
+            if delta > 0:
+                apart = result['min_ms'] > before.get('max_ms', before['time_ms'])
+            else:
+                apart = result.get('max_ms', result['time_ms']) < before['min_ms']
+            if apart and abs(delta) >= NOISE_MS and abs(ratio - 1) > threshold:
+                notes.append(f"time {before['time_ms']:.2f} -> {result['time_ms']:.2f} ms ({ratio - 1:+.0%})")
+                if delta > 0:
+                    regressions.append(name)
+            if result['queries'] != before['queries']:
+                notes.append(f"queries {before['queries']} -> {result['queries']}")
+                if result['queries'] > before['queries']:
+                    regressions.append(name)
+            if 'sorts' in result and 'sorts' in before and result['sorts'] != before['sorts']:
+                notes.append(f"full sorts {before['sorts']} -> {result['sorts']}")
+                if result['sorts'] > before['sorts']:
+                    regressions.append(name)
+            if before['peak_kb'] and abs(result['peak_kb'] / before['peak_kb'] - 1) > threshold:
+                notes.append(f"memory {before['peak_kb']} -> {result['peak_kb']} KiB")
+                if result['peak_kb'] > before['peak_kb']:
+                    regressions.append(name)
+            if not notes:
+                self.stdout.write(f'{name:<26} unchanged')
+            elif name in regressions:
+                self.stdout.write(self.style.ERROR(f"{name:<26} REGRESSION: {'; '.join(notes)}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{name:<26} better: {'; '.join(notes)}"))
+        if regressions:
+            regressed = sorted(set(regressions))
+            raise CommandError(f"{len(regressed)} case(s) regressed beyond {threshold:.0%}: {', '.join(regressed)}")
+        self.stdout.write(self.style.SUCCESS(f'No regressions beyond {threshold:.0%}.'))
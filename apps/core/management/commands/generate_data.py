@@ -0,0 +1,467 @@
+import math
+import random
+import time
+import uuid
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Case, Count, F, FloatField, Max, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Greatest
+from django.utils import timezone
+
+from apps.categories.models import Category
+from apps.core.models import City
+from apps.events.models import Event, EventSchedule
+from apps.events.query import EVENT_QUERIES
+from apps.favorites.models import Favorite
+from apps.orders.models import Order, OrderItem, Payment
+from apps.organizers.models import Organizer, OrganizerMember
+from apps.reviews.models import Review
+from apps.search.engine import reindex_all
+from apps.stats.rollups import rebuild
+from apps.tags.models import Tag
+from apps.tickets.models import Ticket, TicketType
+from apps.users.models import UserProfile
+from apps.venues.models import Venue
+
+# Row counts at --scale 1; --scale 10 gives about a million tickets and favorites.
+SIZES = {
+    'cities': 10,
+    'venues': 200,
+    'organizers': 100,
+    'users': 5_000,
+    'events': 10_000,
+    'schedules': 10_000,
+    'ticket_types': 20_000,
+    'orders': 50_000,
+    'tickets': 100_000,
+    'reviews': 50_000,
+    'favorites': 100_000,
+}
+PASSWORD = 'DemoPass123'
+
+CITY_NAMES = ['Almaty', 'Astana', 'Shymkent', 'Karaganda', 'Aktobe', 'Taraz', 'Pavlodar', 'Oskemen', 'Semey', 'Atyrau']
+CATEGORIES = [
+    ('music', 'Музыка'), ('sport', 'Спорт'), ('expo', 'Выставки'), ('theatre', 'Театр'), ('kids', 'Детям'),
+    ('food', 'Гастрономия'), ('lectures', 'Лекции'), ('cinema', 'Кино'), ('festival', 'Фестивали'),
+    ('standup', 'Стендап'), ('art', 'Искусство'), ('tech', 'Технологии'),
+]
+TAGS = [
+    ('free', 'Бесплатно'), ('family', 'Семейное'), ('evening', 'Вечер'), ('outdoor', 'На открытом воздухе'),
+    ('premiere', 'Премьера'), ('weekend', 'Выходные'), ('18plus', '18+'), ('online', 'Онлайн'),
+]
+KINDS = ['Концерт', 'Фестиваль', 'Спектакль', 'Выставка', 'Лекция', 'Мастер-класс', 'Турнир', 'Показ', 'Ярмарка']
+ADJECTIVES = ['Весенний', 'Ночной', 'Городской', 'Джазовый', 'Большой', 'Летний', 'Зимний', 'Открытый', 'Новый']
+NOUNS = ['вечер', 'марафон', 'сезон', 'парк', 'квартал', 'берег', 'фестиваль', 'салон', 'клуб']
+PLACES = ['Дворец', 'Арена', 'Галерея', 'Театр', 'Клуб', 'Центр', 'Парк', 'Зал']
+TYPE_NAMES = ['Стандарт', 'VIP', 'Партер', 'Балкон', 'Студенческий', 'Семейный']
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let ``bulk_create`` keep the given ``created_at``/``updated_at`` instead of stamping now."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def next_id(model) -> int:
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+def coprime_step(rng: random.Random, modulus: int) -> int:
+    while True:
+        step = rng.randrange(1, max(modulus, 2))
+        if math.gcd(step, modulus) == 1:
+            return step
+
+
+class Command(BaseCommand):
+    help = 'Generate a large, reproducible synthetic dataset with bulk inserts (see SIZES for the defaults)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help='Multiply every default size')
+        for name, size in SIZES.items():
+            parser.add_argument(f'--{name.replace("_", "-")}', type=int, dest=name, help=f'Default: {size} × scale')
+        parser.add_argument('--seed', type=int, default=42, help='Same seed and sizes, same data')
+        parser.add_argument('--prefix', default='gen', help='Prefix of generated slugs and usernames')
+        parser.add_argument('--chunk-size', type=int, default=5_000, help='Rows per INSERT batch')
+        parser.add_argument('--skip-rollups', action='store_true', help='Leave the statistics rollups to rebuild_stats')
+        parser.add_argument('--skip-search', action='store_true', help='Leave the search index to search_reindex')
+
+    def handle(self, *args, **options):
+        self.sizes = {
+            name: options[name] if options[name] is not None else max(int(size * options['scale']), 1)
+            for name, size in SIZES.items()
+        }
+        self.prefix = options['prefix']
+        self.chunk_size = options['chunk_size']
+        self.seed = options['seed']
+        self.validate()
+        if Event.objects.filter(slug__startswith=f'{self.prefix}-').exists():
+            raise CommandError(f'Data with prefix "{self.prefix}" already exists; pass another --prefix or flush.')
+
+        self.anchor = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        started = time.perf_counter()
+        models = (City, Venue, Organizer, OrganizerMember, UserProfile, Event, EventSchedule, TicketType,
+                  Order, OrderItem, Payment, Ticket, Review, Favorite)
+        # One transaction, so a failed run leaves no half-written prefix that blocks the next one.
+        with transaction.atomic():
+            with explicit_timestamps(*models):
+                self.generate()
+            self.derive(rollups=not options['skip_rollups'], search=not options['skip_search'])
+        rows = sum(self.sizes.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated about {rows} rows in {time.perf_counter() - started:.1f}s. '
+            f'Users {self.prefix}_user_1… log in with {PASSWORD}.'
+        ))
+
+    def validate(self):
+        sizes = self.sizes
+        if sizes['tickets'] < sizes['orders']:
+            raise CommandError('--tickets must be at least --orders: every order has one ticket or more.')
+        for name in ('reviews', 'favorites'):
+            if sizes[name] > sizes['users'] * sizes['events']:
+                raise CommandError(f'--{name} is limited to one per user and event ({sizes["users"] * sizes["events"]}).')
+
+    def rng(self, stream: str) -> random.Random:
+        # One generator per table, so changing one size leaves the other tables as they were. The prefix
+        # is part of the seed: ticket codes are drawn from it and must not repeat across prefixes.
+        return random.Random(f'{self.seed}:{self.prefix}:{stream}')
+
+    def write(self, label: str, chunks) -> None:
+        """Insert each chunk, a list of ``(model, objects)``, under its own savepoint."""
+        started = time.perf_counter()
+        rows = 0
+        for chunk in chunks:
+            with transaction.atomic():
+                for model, objects in chunk:
+                    model.objects.bulk_create(objects, batch_size=self.chunk_size)
+                    rows += len(objects)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'{label}: {rows} rows in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):.0f} rows/s)')
+
+    def ranges(self, total: int):
+        for start in range(0, total, self.chunk_size):
+            yield range(start, min(start + self.chunk_size, total))
+
+    def past(self, rng: random.Random, days: float):
+        return self.anchor - timedelta(seconds=rng.uniform(0, days * 86400))
+
+    def generate(self):
+        sizes, prefix = self.sizes, self.prefix
+        self.categories = [
+            Category.objects.get_or_create(slug=slug, defaults={'name': name})[0].pk for slug, name in CATEGORIES
+        ]
+        self.tags = [Tag.objects.get_or_create(slug=slug, defaults={'name': name})[0].pk for slug, name in TAGS]
+
+        self.city_id = next_id(City)
+        self.write('cities', [[(City, [
+            City(
+                pk=self.city_id + n,
+                name=CITY_NAMES[n % len(CITY_NAMES)] + (f' {n // len(CITY_NAMES) + 1}' if n >= len(CITY_NAMES) else ''),
+                slug=f'{prefix}-city-{n + 1}',
+            )
+            for n in range(sizes['cities'])
+        ])]])
+
+        self.venue_id = next_id(Venue)
+        self.write('venues', self.venues())
+        self.user_id = next_id(User)
+        self.write('users', self.users())
+        self.organizer_id = next_id(Organizer)
+        self.write('organizers', self.organizers())
+
+        # Kept per event and ticket type for the tables that refer to them.
+        self.event_starts = array('q')
+        self.type_prices = array('l')
+        self.event_id = next_id(Event)
+        self.write('events', self.events())
+        self.write('schedules', self.schedules())
+        self.type_id = next_id(TicketType)
+        self.write('ticket types', self.ticket_types())
+        self.write('orders, payments and tickets', self.orders())
+        self.write('reviews', self.reviews())
+        self.write('favorites', self.favorites())
+
+    def venues(self):
+        rng = self.rng('venues')
+        for part in self.ranges(self.sizes['venues']):
+            venues = []
+            for n in part:
+                stamp = self.past(rng, 1000)
+                venues.append(Venue(
+                    pk=self.venue_id + n,
+                    name=f'{rng.choice(PLACES)} {n + 1}',
+                    slug=f'{self.prefix}-venue-{n + 1}',
+                    city_id=self.city_id + rng.randrange(self.sizes['cities']),
+                    address=f'ул. Абая, {rng.randint(1, 300)}',
+                    capacity=rng.choice([100, 300, 800, 1500, 5000]),
+                    created_at=stamp,
+                    updated_at=stamp,
+                ))
+            yield [(Venue, venues)]
+
+    def users(self):
+        rng = self.rng('users')
+        password = make_password(PASSWORD)
+        for part in self.ranges(self.sizes['users']):
+            users, profiles = [], []
+            for n in part:
+                joined = self.past(rng, 730)
+                users.append(User(
+                    pk=self.user_id + n,
+                    username=f'{self.prefix}_user_{n + 1}',
+                    email=f'{self.prefix}_user_{n + 1}@example.com',
+                    password=password,
+                    date_joined=joined,
+                ))
+                # The first users run the organizers.
+                role = UserProfile.ROLE_ORGANIZER if n < self.sizes['organizers'] else UserProfile.ROLE_USER
+                profiles.append(UserProfile(user_id=self.user_id + n, role=role, created_at=joined, updated_at=joined))
+            yield [(User, users), (UserProfile, profiles)]
+
+    def organizers(self):
+        rng = self.rng('organizers')
+        for part in self.ranges(self.sizes['organizers']):
+            organizers, members = [], []
+            for n in part:
+                stamp = self.past(rng, 1000)
+                organizers.append(Organizer(
+                    pk=self.organizer_id + n,
+                    name=f'{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {n + 1}',
+                    slug=f'{self.prefix}-organizer-{n + 1}',
+                    contact_email=f'org{n + 1}@example.com',
+                    created_at=stamp,
+                    updated_at=stamp,
+                ))
+                members.append(OrganizerMember(
+                    organizer_id=self.organizer_id + n,
+                    user_id=self.user_id + n % self.sizes['users'],
+                    role='Owner',
+                    is_owner=True,
+                    created_at=stamp,
+                    updated_at=stamp,
+                ))
+            yield [(Organizer, organizers), (OrganizerMember, members)]
+
+    def events(self):
+        rng = self.rng('events')
+        statuses = [Event.STATUS_PUBLISHED] * 16 + [Event.STATUS_DRAFT] * 3 + [Event.STATUS_CANCELLED]
+        categories_through, tags_through = Event.categories.through, Event.tags.through
+        for part in self.ranges(self.sizes['events']):
+            events, categories, tags = [], [], []
+            for n in part:
+                pk = self.event_id + n
+                # A year back to a year ahead, starting between 10:00 and 21:00.
+                start = self.anchor + timedelta(days=rng.randint(-365, 365), hours=rng.randint(10, 21))
+                created = min(start - timedelta(days=rng.randint(7, 120)), self.anchor)
+                price = 0 if rng.random() < 0.1 else rng.randrange(2, 60) * 500
+                self.event_starts.append(int(start.timestamp()))
+                kind = rng.choice(KINDS)
+                events.append(Event(
+                    pk=pk,
+                    title=f'{kind} «{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}» №{n + 1}',
+                    slug=f'{self.prefix}-event-{n + 1}',
+                    description=f'{kind}: {" ".join(rng.choices(NOUNS + ADJECTIVES, k=20)).lower()}.',
+                    start_at=start,
+                    end_at=start + timedelta(hours=rng.randint(1, 4)),
+                    venue_id=self.venue_id + rng.randrange(self.sizes['venues']),
+                    organizer_id=self.organizer_id + rng.randrange(self.sizes['organizers']),
+                    status=rng.choice(statuses),
+                    price_from=Decimal(price),
+                    is_featured=rng.random() < 0.02,
+                    created_at=created,
+                    updated_at=created,
+                ))
+                categories += [categories_through(event_id=pk, category_id=c) for c in rng.sample(self.categories, rng.randint(1, 3))]
+                tags += [tags_through(event_id=pk, tag_id=t) for t in rng.sample(self.tags, rng.randint(0, 3))]
+            yield [(Event, events), (categories_through, categories), (tags_through, tags)]
+
+    def event_start(self, event_index: int):
+        return datetime.fromtimestamp(self.event_starts[event_index], tz=self.anchor.tzinfo)
+
+    def schedules(self):
+        rng = self.rng('schedules')
+        events = self.sizes['events']
+        for part in self.ranges(self.sizes['schedules']):
+            schedules = []
+            for n in part:
+                # Extra occurrences a day, a week, ... after the event's first one.
+                start = self.event_start(n % events) + timedelta(days=(n // events + 1) * rng.choice([1, 7]))
+                schedules.append(EventSchedule(
+                    event_id=self.event_id + n % events,
+                    start_at=start,
+                    end_at=start + timedelta(hours=2),
+                    created_at=self.anchor,
+                    updated_at=self.anchor,
+                ))
+            yield [(EventSchedule, schedules)]
+
+    def ticket_types(self):
+        rng = self.rng('ticket_types')
+        events = self.sizes['events']
+        prices = Event.objects.filter(pk__gte=self.event_id).order_by('pk').values_list('price_from', flat=True)
+        price_from = array('l', (int(price) for price in prices.iterator(chunk_size=self.chunk_size)))
+        for part in self.ranges(self.sizes['ticket_types']):
+            types = []
+            for n in part:
+                event, tier = n % events, n // events
+                # The first type of an event costs its price_from, later ones more.
+                price = price_from[event] + tier * rng.randrange(1, 10) * 500
+                self.type_prices.append(price)
+                types.append(TicketType(
+                    pk=self.type_id + n,
+                    event_id=self.event_id + event,
+                    name=TYPE_NAMES[tier] if tier < len(TYPE_NAMES) else f'Тип {tier + 1}',
+                    price=Decimal(price),
+                    quota=rng.choice([50, 100, 200, 500, 1000]),
+                    created_at=self.anchor,
+                    updated_at=self.anchor,
+                ))
+            yield [(TicketType, types)]
+
+    def orders(self):
+        rng = self.rng('orders')
+        sizes = self.sizes
+        order_id = next_id(Order)
+        # Every order gets tickets // orders seats, the first tickets % orders one more.
+        seats, extra = divmod(sizes['tickets'], sizes['orders'])
+        for part in self.ranges(sizes['orders']):
+            orders, items, payments, tickets = [], [], [], []
+            for n in part:
+                pk = order_id + n
+                ticket_type = rng.randrange(sizes['ticket_types'])
+                start = self.event_start(ticket_type % sizes['events'])
+                qty = seats + (n < extra)
+                price = self.type_prices[ticket_type]
+                cancelled = rng.random() < 0.05
+                bought = start - timedelta(days=rng.uniform(1, 60))
+                bought = min(bought, self.anchor - timedelta(minutes=rng.randint(1, 600)))
+                changed = bought + timedelta(days=rng.uniform(0, 3)) if cancelled else bought
+                user_id = self.user_id + rng.randrange(sizes['users'])
+                orders.append(Order(
+                    pk=pk,
+                    user_id=user_id,
+                    status=Order.STATUS_CANCELLED if cancelled else Order.STATUS_PAID,
+                    total=Decimal(price * qty),
+                    tickets_issued_at=bought,
+                    created_at=bought,
+                    updated_at=min(changed, self.anchor),
+                ))
+                items.append(OrderItem(
+                    order_id=pk, ticket_type_id=self.type_id + ticket_type, qty=qty, price=Decimal(price),
+                    created_at=bought, updated_at=bought,
+                ))
+                payments.append(Payment(
+                    order_id=pk, status=Payment.STATUS_SUCCESS, amount=Decimal(price * qty),
+                    transaction_id=f'{self.prefix}_{pk}', created_at=bought, updated_at=bought,
+                ))
+                if cancelled:
+                    status = Ticket.STATUS_CANCELLED
+                elif start < self.anchor and rng.random() < 0.85:
+                    status = Ticket.STATUS_USED
+                else:
+                    status = Ticket.STATUS_NEW
+                tickets += [
+                    Ticket(
+                        ticket_type_id=self.type_id + ticket_type, user_id=user_id, order_id=pk,
+                        code=uuid.UUID(int=rng.getrandbits(128), version=4), status=status,
+                        created_at=bought, updated_at=bought,
+                    )
+                    for _ in range(qty)
+                ]
+            yield [(Order, orders), (OrderItem, items), (Payment, payments), (Ticket, tickets)]
+
+    def pairs(self, stream: str, total: int):
+        """``total`` distinct (user, event) index pairs: each user walks the events with a coprime step."""
+        rng = self.rng(f'{stream}:pairs')
+        users, events = self.sizes['users'], self.sizes['events']
+        offset, step = rng.randrange(events), coprime_step(rng, events)
+        for n in range(total):
+            user, k = n % users, n // users
+            yield user, (user * offset + k * step) % events
+
+    def reviews(self):
+        rng = self.rng('reviews')
+        pairs = self.pairs('reviews', self.sizes['reviews'])
+        for part in self.ranges(self.sizes['reviews']):
+            reviews = []
+            for _n, (user, event) in zip(part, pairs):
+                stamp = self.past(rng, 365)
+                reviews.append(Review(
+                    event_id=self.event_id + event,
+                    user_id=self.user_id + user,
+                    rating=rng.choices([1, 2, 3, 4, 5], weights=[1, 1, 3, 6, 8])[0],
+                    comment=' '.join(rng.choices(NOUNS + ADJECTIVES, k=rng.randint(0, 12))).capitalize(),
+                    created_at=stamp,
+                    updated_at=stamp,
+                ))
+            yield [(Review, reviews)]
+
+    def favorites(self):
+        rng = self.rng('favorites')
+        pairs = self.pairs('favorites', self.sizes['favorites'])
+        for part in self.ranges(self.sizes['favorites']):
+            favorites = []
+            for _n, (user, event) in zip(part, pairs):
+                stamp = self.past(rng, 365)
+                favorites.append(Favorite(
+                    event_id=self.event_id + event, user_id=self.user_id + user, created_at=stamp, updated_at=stamp,
+                ))
+            yield [(Favorite, favorites)]
+
+    def derive(self, rollups: bool = True, search: bool = True):
+        """Counters, sequences, rollups and the search index that the bulk inserts skipped."""
+        started = time.perf_counter()
+        events = Event.objects.filter(pk__gte=self.event_id)
+        reviews = Review.objects.filter(event=OuterRef('pk')).order_by().values('event')
+        events.update(
+            reviews_count=Coalesce(Subquery(reviews.annotate(total=Count('pk')).values('total')), 0),
+            rating_sum=Coalesce(Subquery(reviews.annotate(total=Sum('rating')).values('total')), 0),
+        )
+        events.update(avg_rating=Case(
+            When(reviews_count__gt=0, then=Cast('rating_sum', FloatField()) / F('reviews_count')),
+            default=Value(None),
+            output_field=FloatField(),
+        ))
+        sold = Subquery(
+            Ticket.objects.filter(ticket_type=OuterRef('pk')).exclude(status=Ticket.STATUS_CANCELLED)
+            .order_by().values('ticket_type').annotate(total=Count('pk')).values('total')
+        )
+        TicketType.objects.filter(pk__gte=self.type_id).update(
+            sold=Coalesce(sold, 0), quota=Greatest('quota', Coalesce(sold, 0))
+        )
+        self.stdout.write(f'counters: {time.perf_counter() - started:.1f}s')
+
+        # Explicit ids leave PostgreSQL sequences behind; SQLite needs nothing.
+        statements = connection.ops.sequence_reset_sql(no_style(), [City, Venue, Organizer, User, Event, TicketType, Order])
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+        if rollups:
+            started = time.perf_counter()
+            rebuild()
+            self.stdout.write(f'statistics rollups: {time.perf_counter() - started:.1f}s')
+        if search:
+            started = time.perf_counter()
+            indexed = reindex_all(batch_size=self.chunk_size)
+            self.stdout.write(f'search index: {indexed} events in {time.perf_counter() - started:.1f}s')
+        EVENT_QUERIES.invalidate()
@@ -0,0 +1,288 @@
+import http.cookiejar
+import json
+import random
+import statistics
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from apps.categories.models import Category
+from apps.core.management.commands.generate_data import PASSWORD
+from apps.core.models import City
+from apps.events.models import Event
+from apps.events.query import ORDERING_FIELDS, WHEN_CHOICES
+
+# Scenario: default weight. A worker picks one per iteration.
+SCENARIOS = {
+    'catalogue': 35,
+    'event_detail': 25,
+    'api': 20,
+    'favorite_toggle': 10,
+    'login': 5,
+    'home': 5,
+}
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Report a redirect as the response instead of following it, as a browser's first hop."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class Visitor:
+    """One worker's browser: a cookie jar, a seeded random source and its own latency log."""
+
+    def __init__(self, base_url: str, username: str | None, rng: random.Random, timeout: float):
+        self.base_url = base_url
+        self.username = username
+        self.rng = rng
+        self.timeout = timeout
+        self.jar = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.jar), _NoRedirect)
+        self.logged_in = False
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.outcomes: dict[str, Counter] = defaultdict(Counter)
+
+    def request(self, label: str, path: str, data: dict | None = None, ok=range(200, 400)) -> tuple[int, bytes]:
+        """Send one request and log its latency and outcome under ``label``; returns status and body."""
+        headers = {}
+        body = None
+        if data is not None:
+            body = urllib.parse.urlencode(data).encode()
+            headers['X-CSRFToken'] = self.csrf_token()
+        req = urllib.request.Request(self.base_url + path, data=body, headers=headers)
+        started = time.perf_counter()
+        try:
+            with self.opener.open(req, timeout=self.timeout) as response:
+                status, content = response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            # Redirects land here too, since they are not followed.
+            status, content = exc.code, exc.read()
+        except OSError as exc:
+            status, content, outcome = None, b'', f'error:{type(exc).__name__}'
+        if status == 429:
+            outcome = 'throttled'
+        elif status is not None:
+            outcome = 'ok' if status in ok else f'http_{status}'
+        self.latencies[label].append((time.perf_counter() - started) * 1000)
+        self.outcomes[label][outcome] += 1
+        return status, content
+
+    def csrf_token(self) -> str:
+        return next((cookie.value for cookie in self.jar if cookie.name == 'csrftoken'), '')
+
+    def login(self) -> bool:
+        path = reverse('users:login')
+        self.request('login_form', path)
+        # Only a redirect means the session is logged in; the form re-renders on a wrong password
+        # and answers 429 while the server throttles this IP.
+        status, _content = self.request('login', path, {'username': self.username, 'password': PASSWORD}, ok=(302,))
+        self.logged_in = status == 302
+        return self.logged_in
+
+
+class Command(BaseCommand):
+    help = 'Drive weighted browsing scenarios against a running server and report latency percentiles per endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the server under test')
+        parser.add_argument('--workers', type=int, default=16, help='Concurrent threads, one visitor each')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds to run')
+        parser.add_argument(
+            '--scenario', action='append', default=[], metavar='NAME=WEIGHT',
+            help=f"Override a weight, e.g. --scenario login=0; scenarios: {', '.join(SCENARIOS)}",
+        )
+        parser.add_argument('--prefix', default='gen', help='Log in as the <prefix>_user_N users of generate_data')
+        parser.add_argument('--events', type=int, default=1000, help='Published events to sample URLs from')
+        parser.add_argument('--timeout', type=float, default=30, help='Seconds before a request counts as failed')
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--json', dest='json_path', help='Also write the report to this JSON file')
+
+    def handle(self, *args, **options):
+        weights = dict(SCENARIOS)
+        for item in options['scenario']:
+            name, _sep, weight = item.partition('=')
+            if name not in SCENARIOS or not weight.isdigit():
+                raise CommandError(f"Bad --scenario {item!r}; expected NAME=WEIGHT with NAME one of: {', '.join(SCENARIOS)}")
+            weights[name] = int(weight)
+        weights = {name: weight for name, weight in weights.items() if weight}
+        if not weights:
+            raise CommandError('Every scenario has weight 0.')
+
+        rng = random.Random(options['seed'])
+        self.targets = self.load_targets(options['events'], rng)
+        usernames = [None] * options['workers']
+        if {'favorite_toggle', 'login'} & set(weights):
+            usernames = self.load_usernames(options['prefix'], options['workers'])
+        base_url = options['url'].rstrip('/')
+        visitors = [
+            Visitor(base_url, usernames[n], random.Random(rng.random()), options['timeout'])
+            for n in range(options['workers'])
+        ]
+
+        self.stdout.write(
+            f"{options['workers']} workers for {options['duration']:.0f}s against {base_url}: "
+            + ' '.join(f'{name}={weight}' for name, weight in weights.items())
+        )
+        deadline = time.monotonic() + options['duration']
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            for future in [pool.submit(self.drive, visitor, weights, deadline) for visitor in visitors]:
+                future.result()
+        elapsed = time.perf_counter() - started
+        report = self.report(visitors, elapsed)
+        if options['json_path']:
+            with open(options['json_path'], 'w') as fh:
+                json.dump(report, fh, indent=2)
+                fh.write('\n')
+
+    def load_targets(self, limit: int, rng: random.Random) -> dict:
+        published = Event.objects.filter(status=Event.STATUS_PUBLISHED)
+        ids = list(published.values_list('pk', flat=True))
+        if not ids:
+            raise CommandError('No published events; run generate_data first.')
+        sample = rng.sample(ids, min(limit, len(ids)))
+        events = list(published.filter(pk__in=sample).values('slug', 'title', 'start_at'))
+        return {
+            'events': events,
+            'words': sorted({word for event in events for word in event['title'].lower().split() if len(word) > 3}),
+            'years': sorted({event['start_at'].year for event in events}),
+            'cities': list(City.objects.values_list('slug', flat=True)),
+            'categories': list(Category.objects.values_list('slug', flat=True)),
+        }
+
+    def load_usernames(self, prefix: str, count: int) -> list[str]:
+        usernames = [f'{prefix}_user_{n + 1}' for n in range(count)]
+        found = set(User.objects.filter(username__in=usernames, is_active=True).values_list('username', flat=True))
+        if len(found) < count:
+            raise CommandError(
+                f'Need {count} active users named {prefix}_user_N for favorite_toggle and login; '
+                'run generate_data, or set those weights to 0.'
+            )
+        return usernames
+
+    def drive(self, visitor: Visitor, weights: dict, deadline: float) -> None:
+        names, values = list(weights), list(weights.values())
+        while time.monotonic() < deadline:
+            getattr(self, f'scenario_{visitor.rng.choices(names, values)[0]}')(visitor)
+
+    def scenario_home(self, visitor: Visitor) -> None:
+        visitor.request('home', reverse('pages:home'))
+
+    def scenario_catalogue(self, visitor: Visitor) -> None:
+        """The event list with a random combination of filters, date window, ordering and page."""
+        rng, targets = visitor.rng, self.targets
+        params = {}
+        if targets['cities'] and rng.random() < 0.5:
+            params['city'] = rng.choice(targets['cities'])
+        if targets['categories'] and rng.random() < 0.4:
+            params['category'] = rng.choice(targets['categories'])
+        if rng.random() < 0.2:
+            params['year'] = rng.choice(targets['years'])
+        elif rng.random() < 0.25:
+            params['when'] = rng.choice(WHEN_CHOICES)
+        if targets['words'] and rng.random() < 0.15:
+            params['q'] = rng.choice(targets['words'])
+        if rng.random() < 0.3:
+            params['ordering'] = rng.choice(ORDERING_FIELDS)
+        if rng.random() < 0.3:
+            params['page'] = rng.randint(2, 5)
+        label = 'catalogue_filtered' if params.keys() - {'page'} else 'catalogue'
+        visitor.request(label, reverse('events:list') + ('?' + urllib.parse.urlencode(params) if params else ''))
+
+    def scenario_event_detail(self, visitor: Visitor) -> None:
+        event = visitor.rng.choice(self.targets['events'])
+        visitor.request('event_detail', reverse('events:detail', kwargs={'slug': event['slug']}))
+
+    def scenario_api(self, visitor: Visitor) -> None:
+        """A page of the events API, a cursor walk over three pages, or one event."""
+        rng = visitor.rng
+        roll = rng.random()
+        collection = reverse('api:events_collection')
+        if roll < 0.4:
+            params = {'page': rng.randint(1, 5), 'page_size': rng.choice((10, 20, 50))}
+            if self.targets['cities'] and rng.random() < 0.5:
+                params['city'] = rng.choice(self.targets['cities'])
+            visitor.request('api_events', f'{collection}?{urllib.parse.urlencode(params)}')
+        elif roll < 0.7:
+            cursor = ''
+            for _ in range(3):
+                params = urllib.parse.urlencode({'pagination': 'cursor', 'page_size': 20, 'cursor': cursor})
+                status, content = visitor.request('api_events_cursor', f'{collection}?{params}')
+                if status != 200:
+                    break
+                cursor = json.loads(content).get('next')
+                if not cursor:
+                    break
+        else:
+            event = rng.choice(self.targets['events'])
+            visitor.request('api_event', reverse('api:event_detail', kwargs={'slug': event['slug']}))
+
+    def scenario_favorite_toggle(self, visitor: Visitor) -> None:
+        if not visitor.logged_in and not visitor.login():
+            return
+        event = visitor.rng.choice(self.targets['events'])
+        visitor.request('favorite_toggle', reverse('favorites:toggle', kwargs={'slug': event['slug']}), {}, ok=(302,))
+
+    def scenario_login(self, visitor: Visitor) -> None:
+        visitor.login()
+
+    def report(self, visitors: list[Visitor], elapsed: float) -> dict:
+        latencies: dict[str, list[float]] = defaultdict(list)
+        outcomes: dict[str, Counter] = defaultdict(Counter)
+        for visitor in visitors:
+            for label, values in visitor.latencies.items():
+                latencies[label] += values
+                outcomes[label].update(visitor.outcomes[label])
+        latencies['total'] = [value for label in list(latencies) for value in latencies[label]]
+        outcomes['total'] = sum(outcomes.values(), Counter())
+
+        self.stdout.write(
+            f"{'endpoint':<20} {'requests':>8} {'req/s':>8} {'errors':>7} {'throttled':>9} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+        )
+        report = {'elapsed': round(elapsed, 2), 'endpoints': {}}
+        for label in sorted(latencies, key=lambda label: (label == 'total', label)):
+            values = latencies[label]
+            if not values:
+                continue
+            count = len(values)
+            throttled = outcomes[label]['throttled']
+            errors = count - outcomes[label]['ok'] - throttled
+            quantiles = statistics.quantiles(values, n=100, method='inclusive') if count > 1 else values * 99
+            row = {
+                'requests': count,
+                'throughput': round(count / elapsed, 1),
+                'error_rate': round(errors / count, 4),
+                'throttled': throttled,
+                'p50': round(quantiles[49], 1),
+                'p95': round(quantiles[94], 1),
+                'p99': round(quantiles[98], 1),
+                'max': round(max(values), 1),
+                'outcomes': dict(outcomes[label]),
+            }
+            report['endpoints'][label] = row
+            line = (
+                f"{label:<20} {count:>8} {row['throughput']:>8.1f} {errors / count:>7.1%} {throttled:>9} "
+                f"{row['p50']:>8.1f} {row['p95']:>8.1f} {row['p99']:>8.1f} {row['max']:>8.1f}"
+            )
+            self.stdout.write(self.style.ERROR(line) if errors else line)
+        failures = {
+            outcome: count for outcome, count in outcomes['total'].items() if outcome not in ('ok', 'throttled')
+        }
+        if failures:
+            self.stdout.write('errors: ' + ' '.join(f'{name}={count}' for name, count in sorted(failures.items())))
+        if outcomes['total']['throttled']:
+            self.stdout.write(self.style.WARNING(
+                f"{outcomes['total']['throttled']} login requests throttled: every worker shares one IP; "
+                'start the server with LOGIN_ATTEMPT_LIMIT=0 to measure logins without the limit.'
+            ))
+        return report
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.jobs import run_jobs
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (ticket issuance, notifications), in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--loop', action='store_true', help='Keep running and poll every --interval seconds')
+        parser.add_argument('--interval', type=float, default=1.0)
+
+    def handle(self, *args, **options):
+        while True:
+            ran = 0
+            while batch := run_jobs(batch_size=options['batch_size']):
+                ran += batch
+            if ran or not options['loop']:
+                self.stdout.write(f'Ran {ran} jobs.')
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -1,19 +1,35 @@
 from django.contrib.auth.models import Group, Permission, User
-from django.core.management.base import BaseCommand
 from django.contrib.contenttypes.models import ContentType
-from django.utils import timezone
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
 
 from apps.categories.models import Category
-from apps.core.models import City
+from apps.core.management.commands.generate_data import PASSWORD
 from apps.events.models import Event
 from apps.organizers.models import Organizer, OrganizerMember
 from apps.tags.models import Tag
 from apps.users.models import UserProfile
 from apps.venues.models import Venue
 
+# A small catalogue for trying the site; generate_data builds it the same way as the large sets.
+DEMO_PREFIX = 'demo'
+DEMO_SIZES = {
+    'cities': 2,
+    'venues': 6,
+    'organizers': 3,
+    'users': 20,
+    'events': 40,
+    'schedules': 40,
+    'ticket_types': 80,
+    'orders': 60,
+    'tickets': 120,
+    'reviews': 60,
+    'favorites': 120,
+}
+
 
 class Command(BaseCommand):
-    help = 'Seed demo data for CityEvents'
+    help = 'Seed roles, demo accounts and a small demo catalogue for CityEvents'
 
     def handle(self, *args, **options):
         groups = ['User', 'Organizer', 'Staff']
@@ -38,59 +54,27 @@ class Command(BaseCommand):
         add_perms('Staff', [Event, Category, Venue, Organizer, Tag])
 
         user, _ = User.objects.get_or_create(username='demo_user', defaults={'email': 'user@example.com'})
-        user.set_password('DemoPass123')
+        user.set_password(PASSWORD)
         user.save()
 
         organizer_user, _ = User.objects.get_or_create(username='demo_org', defaults={'email': 'org@example.com'})
-        organizer_user.set_password('DemoPass123')
+        organizer_user.set_password(PASSWORD)
         organizer_user.save()
         profile, _ = UserProfile.objects.get_or_create(user=organizer_user)
         profile.role = UserProfile.ROLE_ORGANIZER
         profile.save()
 
-        city, _ = City.objects.get_or_create(name='Almaty', slug='almaty')
-
-        categories = [
-            Category.objects.get_or_create(name='Музыка', slug='music')[0],
-            Category.objects.get_or_create(name='Спорт', slug='sport')[0],
-            Category.objects.get_or_create(name='Выставки', slug='expo')[0],
-        ]
-
-        tags = [
-            Tag.objects.get_or_create(name='Бесплатно', slug='free')[0],
-            Tag.objects.get_or_create(name='Семейное', slug='family')[0],
-            Tag.objects.get_or_create(name='Вечер', slug='evening')[0],
-        ]
-
-        venue, _ = Venue.objects.get_or_create(
-            name='City Hall',
-            slug='city-hall',
-            city=city,
-            address='Abay Ave 10',
-            capacity=1200,
-        )
-
-        organizer, _ = Organizer.objects.get_or_create(name='CityEvents Team', slug='cityevents-team')
-        OrganizerMember.objects.get_or_create(
-            organizer=organizer,
-            user=organizer_user,
-            defaults={'role': 'Owner', 'is_owner': True},
-        )
+        if Event.objects.filter(slug__startswith=f'{DEMO_PREFIX}-').exists():
+            self.stdout.write('Demo catalogue already present.')
+        else:
+            call_command('generate_data', prefix=DEMO_PREFIX, stdout=self.stdout, **DEMO_SIZES)
 
-        event, _ = Event.objects.get_or_create(
-            title='Городской концерт',
-            slug='city-concert',
-            defaults={
-                'description': 'Музыкальный вечер на открытой площадке.',
-                'start_at': timezone.now() + timezone.timedelta(days=3),
-                'end_at': timezone.now() + timezone.timedelta(days=3, hours=2),
-                'venue': venue,
-                'organizer': organizer,
-                'status': Event.STATUS_PUBLISHED,
-                'price_from': 0,
-            },
-        )
-        event.categories.set(categories)
-        event.tags.set(tags)
+        organizer = Organizer.objects.filter(slug=f'{DEMO_PREFIX}-organizer-1').first()
+        if organizer is not None:
+            OrganizerMember.objects.get_or_create(
+                organizer=organizer,
+                user=organizer_user,
+                defaults={'role': 'Owner', 'is_owner': True},
+            )
 
         self.stdout.write(self.style.SUCCESS('Seed data created.'))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.mail import BATCH_SIZE, send_queued
+
+
+class Command(BaseCommand):
+    help = 'Send queued email in batches, one mail server connection per batch, within EMAIL_RATE_LIMIT'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help='Keep running and poll every --interval seconds')
+        parser.add_argument('--interval', type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        while True:
+            sent = 0
+            while batch := send_queued(batch_size=options['batch_size']):
+                sent += batch
+            if sent or not options['loop']:
+                self.stdout.write(f'Sent {sent} emails.')
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,111 @@
+import logging
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+
+logger = logging.getLogger('cityevents.perf')
+
+_current: ContextVar['RequestTimings | None'] = ContextVar('perf_timings', default=None)
+
+
+@dataclass
+class RequestTimings:
+    queries: int = 0
+    db_ms: float = 0.0
+    template_ms: float = 0.0
+    template_depth: int = 0
+
+
+def _query_wrapper(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.db_ms += (time.perf_counter() - started) * 1000
+
+
+_template_render = Template.render
+
+
+def _timed_render(self, context):
+    timings = _current.get()
+    if timings is None:
+        return _template_render(self, context)
+    # Included and extended templates render inside their parent; only the outermost call counts.
+    timings.template_depth += 1
+    started = time.perf_counter()
+    try:
+        return _template_render(self, context)
+    finally:
+        timings.template_depth -= 1
+        if not timings.template_depth:
+            timings.template_ms += (time.perf_counter() - started) * 1000
+
+
+class PerformanceMiddleware:
+    """Per-request SQL count, DB time, template time and latency.
+
+    Reported as ``Server-Timing`` and logged to ``cityevents.perf``; requests over their
+    query budget (``PERF_QUERY_BUDGET``, ``PERF_VIEW_QUERY_BUDGETS``) are logged as warnings.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PERF_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        Template.render = _timed_render
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_query_wrapper))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={timings.db_ms:.1f};desc="{timings.queries} queries"',
+            f'tpl;dur={timings.template_ms:.1f}',
+            f'total;dur={total_ms:.1f}',
+        ])
+        self.log(request, response, timings, total_ms)
+        return response
+
+    def log(self, request, response, timings: RequestTimings, total_ms: float) -> None:
+        match = request.resolver_match
+        view = match.view_name if match else ''
+        budget = settings.PERF_VIEW_QUERY_BUDGETS.get(view, settings.PERF_QUERY_BUDGET)
+        record = {
+            'view': view,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': timings.queries,
+            'db_ms': round(timings.db_ms, 1),
+            'template_ms': round(timings.template_ms, 1),
+            'total_ms': round(total_ms, 1),
+            'query_budget': budget,
+        }
+        if response.streaming:
+            # The body is produced after this point; only the setup phase was measured.
+            record['streaming'] = True
+        message = ' '.join(f'{key}={value}' for key, value in record.items())
+        if budget and timings.queries > budget:
+            logger.warning('query budget exceeded %s', message, extra={'perf': record})
+        else:
+            logger.info('%s', message, extra={'perf': record})
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class TimeStampedModel(models.Model):
@@ -19,3 +20,68 @@ class City(models.Model):
 
     def __str__(self) -> str:
         return f"{self.name}" 
+
+
+class Job(models.Model):
+    """Deferred work for the `run_jobs` worker, enqueued in the caller's transaction.
+
+    A row exists while the job is queued or running; done jobs are deleted, failed ones kept.
+    """
+
+    STATUS_QUEUED = 'queued'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=120)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    run_at = models.DateTimeField(default=timezone.now)
+    # Set by the worker that runs the job, in the same UPDATE that checks nobody else holds it.
+    claim = models.UUIDField(null=True, blank=True, editable=False, db_index=True)
+    claimed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['run_at']
+        indexes = [models.Index(fields=['status', 'run_at'], name='job_due_idx')]
+
+    def __str__(self) -> str:
+        return f"{self.name} #{self.pk}"
+
+
+class OutboundEmail(models.Model):
+    """A queued message for the `send_queued_mail` worker; sent rows are deleted, failed ones kept."""
+
+    STATUS_QUEUED = 'queued'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    to = models.JSONField(default=list)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    send_at = models.DateTimeField(default=timezone.now)
+    claim = models.UUIDField(null=True, blank=True, editable=False, db_index=True)
+    claimed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['send_at']
+        indexes = [models.Index(fields=['status', 'send_at'], name='outbound_email_due_idx')]
+
+    def __str__(self) -> str:
+        return f"{self.subject} → {', '.join(self.to)}"
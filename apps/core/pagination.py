@@ -0,0 +1,119 @@
+import base64
+import json
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q, QuerySet
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class CursorPage:
+    object_list: list
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    count: int | None = None
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.prev_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+
+def encode_cursor(values: list, direction: str) -> str:
+    raw = json.dumps({'k': values, 'd': direction}, separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> tuple[list, str]:
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        values, direction = data['k'], data['d']
+    except (ValueError, TypeError, KeyError, UnicodeError):
+        raise InvalidCursor('Malformed cursor.') from None
+    if direction not in {'n', 'p'} or not isinstance(values, list):
+        raise InvalidCursor('Malformed cursor.')
+    return values, direction
+
+
+def _after(fields: list[str], descending: bool, values: list) -> Q:
+    """Row-value comparison ``(f1, f2, ...) > (v1, v2, ...)`` spelled out for every backend."""
+    lookup = 'lt' if descending else 'gt'
+    condition = Q()
+    for i, name in enumerate(fields):
+        step = Q(**{f'{name}__{lookup}': values[i]})
+        for prev_name, prev_value in zip(fields[:i], values[:i]):
+            step &= Q(**{prev_name: prev_value})
+        condition |= step
+    return condition
+
+
+def keyset_page(
+    queryset: QuerySet, ordering: tuple[str, ...], cursor: str | None, per_page: int
+) -> CursorPage:
+    """Page through ``queryset`` by the unique key ``ordering`` without OFFSET or COUNT.
+
+    All ordering fields share one direction, and the last one must be unique (usually ``id``).
+    """
+    descending = ordering[0].startswith('-')
+    fields = [name.lstrip('-') for name in ordering]
+    model_fields = [queryset.model._meta.get_field(name) for name in fields]
+
+    direction = 'n'
+    if cursor:
+        raw_values, direction = decode_cursor(cursor)
+        if len(raw_values) != len(fields):
+            raise InvalidCursor('Cursor does not match ordering.')
+        try:
+            values = [f.to_python(v) for f, v in zip(model_fields, raw_values)]
+        except ValidationError:
+            raise InvalidCursor('Cursor does not match ordering.') from None
+        queryset = queryset.filter(_after(fields, descending != (direction == 'p'), values))
+
+    backwards = direction == 'p'
+    reverse_order = descending != backwards
+    order = [f'-{name}' if reverse_order else name for name in fields]
+    rows = list(queryset.order_by(*order)[:per_page + 1])
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    def key(obj):
+        return [getattr(obj, name) for name in fields]
+
+    page = CursorPage(rows)
+    if rows:
+        more_after = has_more if not backwards else True
+        more_before = has_more if backwards else bool(cursor)
+        if more_after:
+            page.next_cursor = encode_cursor(key(rows[-1]), 'n')
+        if more_before:
+            page.prev_cursor = encode_cursor(key(rows[0]), 'p')
+    return page
+
+
+def estimate_count(queryset: QuerySet) -> int | None:
+    """Planner row estimate where the database exposes one (PostgreSQL); ``None`` elsewhere."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
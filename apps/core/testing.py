@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.core.models import City
+from apps.events.models import Event
+from apps.organizers.models import Organizer
+from apps.venues.models import Venue
+
+# The default cache is a file shared with the development server; tests get their own.
+LOCMEM_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'cityevents-tests',
+    }
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CacheIsolatedTestCase(TestCase):
+    """TestCase on a per-process cache that starts empty for every test."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+
+def make_event(slug: str = 'test-event', **fields):
+    """A published event a day from now, with its own city, venue and organizer."""
+    city, _created = City.objects.get_or_create(slug='test-city', defaults={'name': 'Test City'})
+    start = timezone.now() + timedelta(days=1)
+    defaults = {
+        'title': slug.replace('-', ' ').capitalize(),
+        'description': '-',
+        'start_at': start,
+        'end_at': start + timedelta(hours=2),
+        'venue': Venue.objects.create(name=f'{slug} venue', slug=f'{slug}-venue', city=city, address='-'),
+        'organizer': Organizer.objects.create(name=f'{slug} organizer', slug=f'{slug}-organizer'),
+        'status': Event.STATUS_PUBLISHED,
+    }
+    return Event.objects.create(slug=slug, **{**defaults, **fields})
@@ -0,0 +1,191 @@
+import io
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from apps.core import jobs
+from apps.core.management.commands import benchmark, generate_data
+from apps.core.models import City, Job
+from apps.core.testing import CacheIsolatedTestCase, make_event
+from apps.events.models import Event
+from apps.tickets.models import Ticket
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.calls = []
+        jobs.job('tests.flaky')(self.flaky)
+        self.addCleanup(jobs._handlers.pop, 'tests.flaky')
+
+    def flaky(self, fail_times: int) -> None:
+        self.calls.append(timezone.now())
+        if len(self.calls) <= fail_times:
+            raise RuntimeError('flaky')
+
+    def test_done_job_is_deleted(self):
+        jobs.enqueue('tests.flaky', fail_times=0)
+        self.assertEqual(jobs.run_jobs(), 1)
+        self.assertEqual(jobs.run_jobs(), 0)
+        self.assertFalse(Job.objects.exists())
+
+    def test_failed_job_is_retried_with_backoff(self):
+        queued = jobs.enqueue('tests.flaky', fail_times=2)
+        now = timezone.now()
+        with self.assertLogs('apps.core.jobs', 'ERROR'):
+            jobs.run_jobs(now=now)
+        queued.refresh_from_db()
+        self.assertEqual((queued.attempts, queued.status), (1, Job.STATUS_QUEUED))
+        self.assertIn('RuntimeError', queued.last_error)
+        self.assertGreater(queued.run_at, now + timedelta(seconds=jobs.RETRY_DELAY - 1))
+        # Not due before the delay.
+        self.assertEqual(jobs.run_jobs(now=now), 0)
+        later = queued.run_at + timedelta(hours=1)
+        with self.assertLogs('apps.core.jobs', 'ERROR'):
+            jobs.run_jobs(now=later)
+        jobs.run_jobs(now=later + timedelta(hours=1))
+        self.assertEqual(len(self.calls), 3)
+        self.assertFalse(Job.objects.exists())
+
+    def test_job_fails_for_good_after_max_attempts(self):
+        queued = jobs.enqueue('tests.flaky', fail_times=jobs.MAX_ATTEMPTS)
+        now = timezone.now()
+        with self.assertLogs('apps.core.jobs', 'ERROR'):
+            for attempt in range(jobs.MAX_ATTEMPTS + 1):
+                jobs.run_jobs(now=now + timedelta(days=attempt))
+        queued.refresh_from_db()
+        self.assertEqual((queued.attempts, queued.status), (jobs.MAX_ATTEMPTS, Job.STATUS_FAILED))
+        self.assertEqual(len(self.calls), jobs.MAX_ATTEMPTS)
+
+    def test_expired_lease_is_taken_over(self):
+        queued = jobs.enqueue('tests.flaky', fail_times=0)
+        # Claimed by a worker that died before finishing it.
+        Job.objects.filter(pk=queued.pk).update(claim=uuid.uuid4(), claimed_at=timezone.now())
+        self.assertEqual(jobs.run_jobs(), 0)
+        self.assertEqual(jobs.run_jobs(now=timezone.now() + jobs.LEASE + timedelta(seconds=1)), 1)
+        self.assertFalse(Job.objects.exists())
+
+    def test_run_taken_over_after_the_lease_is_rolled_back(self):
+        def slow(fail_times: int) -> None:
+            City.objects.create(name='Written', slug='written')
+            # Meanwhile the lease expired and another worker claimed the job.
+            Job.objects.update(claim=uuid.uuid4())
+
+        jobs.job('tests.flaky')(slow)
+        queued = jobs.enqueue('tests.flaky', fail_times=0)
+        with self.assertLogs('apps.core.jobs', 'WARNING'):
+            jobs.run_jobs()
+        self.assertFalse(City.objects.exists())
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.last_error), (Job.STATUS_QUEUED, ''))
+
+
+class BenchmarkCompareTests(SimpleTestCase):
+    def compare(self, before: dict, after: dict, threshold: float = 0.2) -> str:
+        command = benchmark.Command(stdout=io.StringIO())
+        command.compare({'case': before}, {'case': after}, threshold)
+        return command.stdout.getvalue()
+
+    def result(self, time_ms: float = 10.0, spread: float = 0.05, **fields) -> dict:
+        return {
+            'time_ms': time_ms, 'min_ms': time_ms * (1 - spread), 'max_ms': time_ms * (1 + spread),
+            'queries': 4, 'peak_kb': 100, **fields,
+        }
+
+    def test_same_numbers_are_unchanged(self):
+        output = self.compare(self.result(), self.result())
+        self.assertIn('unchanged', output)
+        self.assertIn('No regressions', output)
+
+    def test_slowdown_within_noise_is_ignored(self):
+        # +50% but under NOISE_MS in absolute terms.
+        output = self.compare(self.result(time_ms=1.0), self.result(time_ms=1.0 + benchmark.NOISE_MS / 2))
+        self.assertIn('unchanged', output)
+
+    def test_slowdown_within_threshold_is_ignored(self):
+        output = self.compare(self.result(time_ms=100.0), self.result(time_ms=115.0))
+        self.assertIn('unchanged', output)
+
+    def test_slowdown_beyond_threshold_regresses(self):
+        with self.assertRaisesMessage(CommandError, '1 case(s) regressed beyond 20%: case'):
+            self.compare(self.result(time_ms=100.0), self.result(time_ms=130.0))
+
+    def test_slowdown_within_the_spread_is_noise(self):
+        output = self.compare(self.result(time_ms=100.0, spread=0.4), self.result(time_ms=145.0, spread=0.2))
+        self.assertIn('unchanged', output)
+
+    def test_baseline_without_max_uses_its_median(self):
+        before = self.result(time_ms=100.0)
+        del before['max_ms']
+        with self.assertRaises(CommandError):
+            self.compare(before, self.result(time_ms=130.0))
+
+    def test_speedup_is_reported_as_better(self):
+        output = self.compare(self.result(time_ms=100.0), self.result(time_ms=50.0))
+        self.assertIn('better', output)
+
+    def test_extra_query_regresses(self):
+        with self.assertRaises(CommandError):
+            self.compare(self.result(), self.result(queries=5))
+        self.assertIn('better', self.compare(self.result(), self.result(queries=3)))
+
+    def test_extra_full_sort_regresses(self):
+        with self.assertRaises(CommandError):
+            self.compare(self.result(sorts=0), self.result(sorts=1))
+        # Sorts are compared only when both runs used --explain.
+        self.assertIn('unchanged', self.compare(self.result(), self.result(sorts=1)))
+
+    def test_memory_growth_beyond_threshold_regresses(self):
+        self.assertIn('unchanged', self.compare(self.result(), self.result(peak_kb=110)))
+        with self.assertRaises(CommandError):
+            self.compare(self.result(), self.result(peak_kb=130))
+
+    def test_case_missing_from_baseline_is_skipped(self):
+        command = benchmark.Command(stdout=io.StringIO())
+        command.compare({}, {'case': self.result()}, 0.2)
+        self.assertIn('not in the baseline', command.stdout.getvalue())
+
+    def test_scans_table(self):
+        self.assertTrue(benchmark._scans_table('SCAN events_event'))
+        self.assertTrue(benchmark._scans_table('Seq Scan on events_event  (cost=0.00..1.00 rows=1 width=8)'))
+        self.assertFalse(benchmark._scans_table('SCAN events_event USING INDEX events_start_idx'))
+        self.assertFalse(benchmark._scans_table('SEARCH events_event USING INTEGER PRIMARY KEY (rowid=?)'))
+
+
+class GenerateDataTests(TestCase):
+    SIZES = {
+        'cities': 2, 'venues': 3, 'organizers': 2, 'users': 10, 'events': 10, 'schedules': 10,
+        'ticket_types': 20, 'orders': 20, 'tickets': 40, 'reviews': 20, 'favorites': 20,
+    }
+
+    def generate(self, prefix: str) -> None:
+        call_command('generate_data', prefix=prefix, stdout=io.StringIO(), **self.SIZES)
+
+    def test_second_prefix_adds_its_own_rows(self):
+        self.generate('one')
+        self.generate('two')
+        self.assertEqual(Event.objects.filter(slug__startswith='two-').count(), self.SIZES['events'])
+        self.assertEqual(Ticket.objects.count(), 2 * self.SIZES['tickets'])
+
+    def test_failed_run_leaves_nothing_behind(self):
+        with mock.patch.object(generate_data.Command, 'reviews', side_effect=RuntimeError('boom')):
+            with self.assertRaises(RuntimeError):
+                self.generate('one')
+        self.assertFalse(Event.objects.exists())
+        self.generate('one')
+        self.assertEqual(Event.objects.count(), self.SIZES['events'])
+
+
+class BenchmarkCacheTests(CacheIsolatedTestCase):
+    def test_cold_runs_leave_the_shared_cache_alone(self):
+        make_event()
+        User.objects.create_user('visitor', password='unused')
+        cache.set('session-of-a-running-server', 1)
+        call_command('benchmark', cold=True, repeat=1, only=['queryset_for_cards'], stdout=io.StringIO())
+        self.assertEqual(cache.get('session-of-a-running-server'), 1)
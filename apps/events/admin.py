@@ -1,6 +1,9 @@
 from django.contrib import admin
+from django.db import transaction
+from django.utils import timezone
 
 from apps.events.models import Event, EventImage, EventSchedule
+from apps.events.query import invalidate_event_queries
 
 
 class EventScheduleInline(admin.TabularInline):
@@ -28,12 +31,15 @@ class EventImageAdmin(admin.ModelAdmin):
 
 @admin.action(description='Mark selected events as published')
 def mark_published(modeladmin, request, queryset):
-    queryset.update(status=Event.STATUS_PUBLISHED)
+    # A bulk UPDATE sends no post_save: bump updated_at, which keys the cached fragments, and drop
+    # the cached catalogue id lists as the signal handler would.
+    queryset.update(status=Event.STATUS_PUBLISHED, updated_at=timezone.now())
+    transaction.on_commit(invalidate_event_queries)
 
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
-    list_display = ('title', 'start_at', 'end_at', 'status', 'venue', 'organizer')
+    list_display = ('title', 'start_at', 'end_at', 'status', 'venue', 'organizer', 'avg_rating', 'reviews_count')
     list_filter = ('status', 'start_at', 'venue')
     search_fields = ('title', 'description')
     prepopulated_fields = {'slug': ('title',)}
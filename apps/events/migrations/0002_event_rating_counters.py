@@ -0,0 +1,45 @@
+from django.db import migrations, models
+from django.db.models import Avg, Count, Sum
+
+
+def fill_rating_counters(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    Review = apps.get_model('reviews', 'Review')
+    totals = (
+        Review.objects.order_by()
+        .values('event_id')
+        .annotate(count=Count('id'), total=Sum('rating'), avg=Avg('rating'))
+    )
+    for row in totals.iterator():
+        Event.objects.filter(pk=row['event_id']).update(
+            reviews_count=row['count'],
+            rating_sum=row['total'],
+            avg_rating=row['avg'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+        ('reviews', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='reviews_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='avg_rating',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Средний рейтинг'),
+        ),
+        migrations.RunPython(fill_rating_counters, migrations.RunPython.noop),
+    ]
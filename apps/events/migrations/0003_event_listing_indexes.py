@@ -0,0 +1,37 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_event_rating_counters'),
+        ('organizers', '0001_initial'),
+        ('venues', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(
+                condition=models.Q(status='published'),
+                fields=['start_at', 'id', 'status'],
+                name='event_published_start_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(
+                condition=models.Q(status='published'),
+                fields=['price_from', 'id', 'status'],
+                name='event_published_price_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['venue', 'start_at'], name='event_venue_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['organizer', 'start_at'], name='event_organizer_start_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['end_at', 'start_at'], name='event_end_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventschedule',
+            index=models.Index(fields=['end_at', 'start_at', 'event'], name='schedule_end_start_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.core.exceptions import ValidationError
 from django.core.validators import FileExtensionValidator, MinValueValidator
 from django.db import models
+from django.utils import timezone
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
@@ -12,6 +13,27 @@ from apps.tags.models import Tag
 from apps.venues.models import Venue
 
 
+class EventQuerySet(models.QuerySet):
+    CARD_FIELDS = (
+        'title', 'slug', 'status', 'start_at', 'price_from', 'cover', 'updated_at',
+        'reviews_count', 'avg_rating', 'venue__city__name',
+        # Reverse managers (``organizer.events``) attach the known parent through this column.
+        'organizer',
+    )
+
+    def for_cards(self):
+        """Exactly what ``partials/event_card.html`` renders, fetched in a single query."""
+        return self.select_related('venue__city').only(*self.CARD_FIELDS)
+
+    def for_api(self):
+        """Relations serialized by the JSON API."""
+        return self.select_related('venue', 'organizer').prefetch_related('categories', 'tags')
+
+    def touch(self) -> int:
+        """Bump ``updated_at`` without signals; cached card and detail fragments are keyed on it."""
+        return self.update(updated_at=timezone.now())
+
+
 class Event(TimeStampedModel):
     STATUS_DRAFT = 'draft'
     STATUS_PUBLISHED = 'published'
@@ -47,6 +69,9 @@ class Event(TimeStampedModel):
     )
     is_featured = models.BooleanField(_('Рекомендуемое'), default=False)
     max_attendees = models.PositiveIntegerField(_('Максимум участников'), default=0)
+    reviews_count = models.PositiveIntegerField(_('Количество отзывов'), default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(_('Сумма оценок'), default=0, editable=False)
+    avg_rating = models.FloatField(_('Средний рейтинг'), null=True, blank=True, editable=False)
     cover = models.ImageField(
         _('Обложка'),
         upload_to='events/',
@@ -55,10 +80,38 @@ class Event(TimeStampedModel):
         validators=[FileExtensionValidator(['jpg', 'jpeg', 'png', 'webp']), validate_file_size],
     )
 
+    objects = EventQuerySet.as_manager()
+
     class Meta:
         ordering = ['start_at']
         verbose_name = _('Событие')
         verbose_name_plural = _('События')
+        indexes = [
+            # The catalogue, the API and the home page only list published events. ``status`` is
+            # repeated as a column so SQLite can answer the cached id list from the index alone.
+            models.Index(
+                fields=['start_at', 'id', 'status'],
+                condition=models.Q(status='published'),
+                name='event_published_start_idx',
+            ),
+            models.Index(
+                fields=['price_from', 'id', 'status'],
+                condition=models.Q(status='published'),
+                name='event_published_price_idx',
+            ),
+            models.Index(fields=['venue', 'start_at'], name='event_venue_start_idx'),
+            models.Index(fields=['organizer', 'start_at'], name='event_organizer_start_idx'),
+            # Date windows (``apps.events.query.happening``) read only events that are not over yet.
+            models.Index(fields=['end_at', 'start_at'], name='event_end_start_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        # What attendees were told; a save that changes it notifies them (apps.notifications).
+        instance._loaded_schedule = (loaded.get('status'), loaded.get('start_at'))
+        return instance
 
     def clean(self):
         if not self.start_at or not self.end_at:
@@ -85,6 +138,7 @@ class EventSchedule(TimeStampedModel):
         ordering = ['start_at']
         verbose_name = _('Расписание')
         verbose_name_plural = _('Расписания')
+        indexes = [models.Index(fields=['end_at', 'start_at', 'event'], name='schedule_end_start_idx')]
 
     def __str__(self) -> str:
         return f"{self.event.title}"
@@ -0,0 +1,214 @@
+import hashlib
+import json
+from dataclasses import asdict, dataclass, replace
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.core.cache import CacheNamespace
+from apps.core.pagination import CursorPage, estimate_count, keyset_page
+from apps.events.models import Event, EventSchedule
+from apps.search.engine import search_events
+
+ORDERING_FIELDS = ('start_at', '-start_at', 'price_from', '-price_from')
+COUNT_MODES = ('exact', 'estimate', 'none')
+WHEN_CHOICES = ('now', 'today', 'tomorrow', 'weekend', 'week')
+EVENT_QUERIES = CacheNamespace('events:query')
+# Dates outside these years count as absent: the day after date.max and local midnight of date.min
+# in UTC overflow ``datetime``.
+MIN_YEAR, MAX_YEAR = 1900, 9998
+
+
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.get_current_timezone())
+
+
+def date_window(
+    when: str = '', date_from: date | None = None, date_to: date | None = None, now: datetime | None = None,
+) -> tuple[datetime | None, datetime | None]:
+    """Half-open ``[start, end)`` for a ``WHEN_CHOICES`` preset or an inclusive range of dates.
+
+    Days run from midnight to midnight in ``TIME_ZONE`` (Asia/Almaty), not in UTC. "now" is the
+    current minute, so its cached id list is reused for a minute. Either bound may be ``None``.
+    """
+    now = timezone.localtime(now)
+    today = now.date()
+    if when == 'now':
+        start = now.replace(second=0, microsecond=0)
+        return start, start + timedelta(minutes=1)
+    if when == 'today':
+        return _midnight(today), _midnight(today + timedelta(days=1))
+    if when == 'tomorrow':
+        return _midnight(today + timedelta(days=1)), _midnight(today + timedelta(days=2))
+    if when == 'weekend':
+        # On Saturday and Sunday: the rest of this weekend.
+        saturday = today + timedelta(days=5 - today.weekday()) if today.weekday() < 5 else today
+        return _midnight(saturday), _midnight(today + timedelta(days=7 - today.weekday()))
+    if when == 'week':
+        return _midnight(today), _midnight(today + timedelta(days=7))
+    return (
+        _midnight(date_from) if date_from else None,
+        _midnight(date_to + timedelta(days=1)) if date_to else None,
+    )
+
+
+def happening(start: datetime | None, end: datetime | None) -> Q:
+    """Events on at some moment of ``[start, end)``, by their own dates or by a schedule occurrence.
+
+    Only overlap predicates on the bare columns, so the ``end_at`` indexes apply: an event that is
+    over is never read, however many past events the table holds.
+    """
+    overlaps = Q()
+    if end:
+        overlaps &= Q(start_at__lt=end)
+    if start:
+        overlaps &= Q(end_at__gt=start)
+    own = Event.objects.filter(overlaps).values('pk')
+    occurrences = EventSchedule.objects.filter(overlaps).values('event_id')
+    return Q(pk__in=own) | Q(pk__in=occurrences)
+
+
+def _parse_day(raw: str | None) -> date | None:
+    try:
+        day = parse_date((raw or '').strip())
+    except ValueError:
+        return None
+    return day if day and MIN_YEAR <= day.year <= MAX_YEAR else None
+
+
+@dataclass(frozen=True)
+class EventFilters:
+    """Normalized catalogue filters; two requests that differ only in spelling share a cache entry."""
+
+    q: str = ''
+    category: str = ''
+    city: str = ''
+    year: int | None = None
+    window_start: datetime | None = None
+    window_end: datetime | None = None
+    ordering: str = ''
+    status: str | None = Event.STATUS_PUBLISHED
+    organizer_ids: tuple[int, ...] | None = None
+
+    @classmethod
+    def from_params(cls, params, **scope) -> 'EventFilters':
+        year = (params.get('year') or '').strip()
+        ordering = params.get('ordering') or ''
+        when = params.get('when') or ''
+        # A preset wins over ``from``/``to``; both resolve to concrete instants, so the cache key
+        # of "today" changes at midnight.
+        start, end = date_window(
+            when if when in WHEN_CHOICES else '', _parse_day(params.get('from')), _parse_day(params.get('to')),
+        )
+        return cls(
+            q=' '.join((params.get('q') or '').lower().split()),
+            category=(params.get('category') or '').strip().lower(),
+            city=(params.get('city') or '').strip().lower(),
+            year=int(year) if year.isdigit() and MIN_YEAR <= int(year) <= MAX_YEAR else None,
+            window_start=start,
+            window_end=end,
+            ordering=ordering if ordering in ORDERING_FIELDS else '',
+            **scope,
+        )
+
+    def digest(self) -> str:
+        raw = json.dumps(asdict(self), sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def invalidate_event_queries() -> None:
+    EVENT_QUERIES.invalidate()
+
+
+class EventQuery:
+    """Filter pipeline shared by the catalogue, "my events" and the events API.
+
+    The matching ids are cached per filter combination; a page hydrates only its own rows.
+    """
+
+    def __init__(self, filters: EventFilters):
+        self.filters = filters
+
+    def queryset(self) -> QuerySet:
+        f = self.filters
+        events = Event.objects.all()
+        if f.status:
+            events = events.filter(status=f.status)
+        if f.organizer_ids is not None:
+            events = events.filter(organizer_id__in=f.organizer_ids)
+        if f.q:
+            events = search_events(events, f.q, ranked=not f.ordering)
+        if f.category:
+            events = events.filter(categories__slug=f.category)
+        if f.city:
+            events = events.filter(venue__city__slug=f.city)
+        if f.year:
+            # A plain range on the column, from local midnight on 1 January.
+            events = events.filter(
+                start_at__gte=_midnight(date(f.year, 1, 1)), start_at__lt=_midnight(date(f.year + 1, 1, 1)),
+            )
+        if f.window_start or f.window_end:
+            events = events.filter(happening(f.window_start, f.window_end))
+        if f.ordering:
+            events = events.order_by(*self.key_ordering())
+        elif 'search_rank' not in events.query.annotations:
+            events = events.order_by('start_at', 'id')
+        # Category slugs are unique and the other filters are FK or subquery based,
+        # so the joins never duplicate an event and no DISTINCT is needed.
+        return events
+
+    def cache_key(self) -> str:
+        return EVENT_QUERIES.key('ids', self.filters.digest())
+
+    def ids(self) -> list[int]:
+        key = self.cache_key()
+        ids = cache.get(key)
+        if ids is None:
+            ids = list(self.queryset().values_list('pk', flat=True))
+            cache.set(key, ids, settings.EVENT_QUERY_CACHE_TTL)
+        return ids
+
+    def page(self, number, per_page: int, queryset: QuerySet | None = None) -> Page:
+        page = Paginator(self.ids(), per_page).get_page(number)
+        page.object_list = hydrate(page.object_list, queryset)
+        return page
+
+    def key_ordering(self) -> tuple[str, str]:
+        """Unique keyset for cursor pages; relevance ordering has no key and falls back to date."""
+        ordering = self.filters.ordering or 'start_at'
+        return ordering, '-id' if ordering.startswith('-') else 'id'
+
+    def cursor_page(self, cursor: str | None, per_page: int, queryset: QuerySet | None = None) -> CursorPage:
+        """Keyset page straight from the database: no COUNT, no OFFSET, no cached id list."""
+        ordering = self.key_ordering()
+        fields = [name.lstrip('-') for name in ordering]
+        keyed = EventQuery(replace(self.filters, ordering=ordering[0])).queryset().only(*fields)
+        page = keyset_page(keyed, ordering, cursor, per_page)
+        page.object_list = hydrate([event.pk for event in page.object_list], queryset)
+        return page
+
+    def count(self, mode: str = 'exact') -> int | None:
+        if mode == 'exact':
+            return len(self.ids())
+        if mode == 'estimate':
+            ids = cache.get(self.cache_key())
+            if ids is not None:
+                return len(ids)
+            return estimate_count(self.queryset())
+        return None
+
+
+def hydrate(ids, queryset: QuerySet | None = None) -> list[Event]:
+    """Load the given events in the order of ``ids``."""
+    ids = list(ids)
+    if not ids:
+        return []
+    queryset = queryset if queryset is not None else Event.objects.all()
+    # The page is already ordered by ``ids``; the model's default ordering would only add a sort.
+    by_id = queryset.order_by().in_bulk(ids)
+    return [by_id[pk] for pk in ids if pk in by_id]
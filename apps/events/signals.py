@@ -0,0 +1,41 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.categories.models import Category
+from apps.core.models import City
+from apps.events.models import Event, EventImage
+from apps.events.query import invalidate_event_queries
+from apps.tags.models import Tag
+from apps.venues.models import Venue
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=Venue)
+@receiver(post_delete, sender=Venue)
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def catalogue_changed(sender, **kwargs):
+    transaction.on_commit(invalidate_event_queries)
+
+
+@receiver(m2m_changed, sender=Event.categories.through)
+@receiver(m2m_changed, sender=Event.tags.through)
+def event_links_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in {'post_add', 'post_remove', 'post_clear'}:
+        transaction.on_commit(invalidate_event_queries)
+        if not reverse:
+            Event.objects.filter(pk=instance.pk).touch()
+        elif pk_set:
+            Event.objects.filter(pk__in=pk_set).touch()
+
+
+@receiver(post_save, sender=EventImage)
+@receiver(post_delete, sender=EventImage)
+def event_image_changed(sender, instance, **kwargs):
+    Event.objects.filter(pk=instance.event_id).touch()
@@ -0,0 +1,159 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.categories.models import Category
+from apps.core.models import City
+from apps.core.testing import CacheIsolatedTestCase, make_event
+from apps.events.admin import mark_published
+from apps.events.models import Event
+from apps.favorites.models import Favorite
+from apps.organizers.models import Organizer, OrganizerMember
+from apps.reviews.models import Review
+from apps.stats.models import CategoryDailyStats, EventDailyStats, OrganizerDailyStats
+from apps.users.models import UserProfile
+from apps.venues.models import Venue
+
+
+class ListingQueryBudgetTests(CacheIsolatedTestCase):
+    """Pages rendering event cards run a fixed number of queries however many cards they show.
+
+    Each page is requested with an empty cache, so every card template is rendered and a
+    relation the plan does not load shows up as extra queries. The budgets are the ones the
+    performance middleware warns on, ``PERF_VIEW_QUERY_BUDGETS``.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('listing-check', password='unused')
+        UserProfile.objects.filter(user=cls.user).update(role=UserProfile.ROLE_ORGANIZER)
+        city = City.objects.create(name='Check City', slug='check-city')
+        cls.venue = Venue.objects.create(name='Check Venue', slug='check-venue', city=city, address='-')
+        cls.organizer = Organizer.objects.create(name='Check Organizer', slug='check-organizer')
+        cls.category = Category.objects.create(name='Check Category', slug='check-category')
+        OrganizerMember.objects.create(organizer=cls.organizer, user=cls.user, is_owner=True)
+
+    def add_events(self, count: int) -> None:
+        created = Event.objects.count()
+        for n in range(created, created + count):
+            start = timezone.now() + timezone.timedelta(days=n + 1)
+            event = Event.objects.create(
+                title=f'Check event {n}',
+                slug=f'check-event-{n}',
+                description='-',
+                start_at=start,
+                end_at=start + timezone.timedelta(hours=2),
+                venue=self.venue,
+                organizer=self.organizer,
+                status=Event.STATUS_PUBLISHED,
+            )
+            event.categories.add(self.category)
+            Favorite.objects.create(user=self.user, event=event)
+
+    def test_listing_queries_do_not_grow_with_the_page(self):
+        urls = {
+            'pages:home': reverse('pages:home'),
+            'events:list': reverse('events:list'),
+            'events:my': reverse('events:my'),
+            'venues:detail': reverse('venues:detail', kwargs={'slug': self.venue.slug}),
+            'organizers:detail': reverse('organizers:detail', kwargs={'slug': self.organizer.slug}),
+            'categories:detail': reverse('categories:detail', kwargs={'slug': self.category.slug}),
+            'favorites:list': reverse('favorites:list'),
+            'api:events_collection': reverse('api:events_collection'),
+        }
+        client = Client()
+        client.force_login(self.user)
+        for size in (1, 11):
+            self.add_events(size)
+            for name, url in urls.items():
+                with self.subTest(view=name, events=Event.objects.count()):
+                    cache.clear()
+                    with self.assertNumQueries(settings.PERF_VIEW_QUERY_BUDGETS[name]):
+                        response = client.get(url)
+                    self.assertEqual(response.status_code, 200)
+
+
+class EventDeleteTests(CacheIsolatedTestCase):
+    """Deleting an event cascades to its reviews and favorites without recounting them into its rollups."""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('fan', password='unused')
+        self.event = make_event()
+        self.event.categories.add(Category.objects.create(name='Music', slug='music'))
+        Review.objects.create(event=self.event, user=self.user, rating=5)
+        Favorite.objects.create(event=self.event, user=self.user)
+
+    def assert_deleted(self):
+        # Foreign keys are checked at commit, which a TestCase never reaches.
+        connection.check_constraints()
+        self.assertFalse(Event.objects.filter(pk=self.event.pk).exists())
+        self.assertFalse(EventDailyStats.objects.exists())
+
+    def test_delete_through_the_api(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_login(self.user)
+        response = self.client.delete(reverse('api:event_detail', kwargs={'slug': self.event.slug}))
+        self.assertEqual(response.status_code, 200)
+        self.assert_deleted()
+        # The organizer and category outlive the event and keep its activity.
+        self.assertEqual(OrganizerDailyStats.objects.get().favorites, 1)
+        self.assertEqual(CategoryDailyStats.objects.get().reviews, 1)
+
+    def test_delete_queryset(self):
+        Event.objects.filter(pk=self.event.pk).delete()
+        self.assert_deleted()
+
+    def test_deleting_a_review_still_counts(self):
+        Review.objects.get().delete()
+        Favorite.objects.get().delete()
+        day = EventDailyStats.objects.get(event=self.event)
+        self.assertEqual((day.reviews, day.favorites), (0, 0))
+
+
+class EventDateFilterTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = make_event()
+        self.day = timezone.localdate(self.event.start_at).isoformat()
+
+    def slugs(self, query: str) -> list[str]:
+        page = self.client.get(reverse('events:list') + query)
+        self.assertEqual(page.status_code, 200, query)
+        api = self.client.get(reverse('api:events_collection') + query)
+        self.assertEqual(api.status_code, 200, query)
+        slugs = [event['slug'] for event in api.json()['results']]
+        self.assertEqual([event.slug for event in page.context['page_obj'].object_list], slugs, query)
+        return slugs
+
+    def test_out_of_range_dates_are_ignored(self):
+        for query in ('?to=9999-12-31', '?from=0001-01-01', '?from=1899-12-31', '?year=1', '?year=9999'):
+            self.assertEqual(self.slugs(query), [self.event.slug], query)
+
+    def test_range_edges_are_accepted(self):
+        self.assertEqual(self.slugs('?from=1900-01-01&to=9998-12-31'), [self.event.slug])
+        self.assertEqual(self.slugs('?year=1900'), [])
+        self.assertEqual(self.slugs('?year=9998'), [])
+
+    def test_day_of_the_event(self):
+        self.assertEqual(self.slugs(f'?from={self.day}&to={self.day}'), [self.event.slug])
+
+    def test_from_after_to_is_empty(self):
+        self.assertEqual(self.slugs(f'?from={self.day}&to=2000-01-01'), [])
+
+
+class MarkPublishedTests(CacheIsolatedTestCase):
+    def test_published_events_reach_the_cached_catalogue(self):
+        draft = make_event(status=Event.STATUS_DRAFT)
+        self.assertEqual(self.client.get(reverse('api:events_collection')).json()['results'], [])
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_published(None, None, Event.objects.filter(pk=draft.pk))
+        draft.refresh_from_db()
+        self.assertGreater(draft.updated_at, draft.created_at)
+        results = self.client.get(reverse('api:events_collection')).json()['results']
+        self.assertEqual([event['slug'] for event in results], [draft.slug])
@@ -1,16 +1,19 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
-from django.db.models import Avg, Count, Q
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
+from django.utils.functional import SimpleLazyObject
 from django.views.generic import CreateView, DeleteView, UpdateView
 from django.utils.translation import gettext_lazy as _
 
 from apps.core.mixins import OrganizerMemberRequiredMixin, OrganizerRequiredMixin
+from apps.core.pagination import InvalidCursor
 from apps.events.forms import EventForm
 from apps.events.models import Event
+from apps.events.query import EventFilters, EventQuery
 from apps.organizers.models import OrganizerMember
+from apps.reviews.models import Review
 
 
 class EventCreateView(OrganizerRequiredMixin, CreateView):
@@ -63,42 +66,19 @@ class EventDeleteView(OrganizerMemberRequiredMixin, DeleteView):
 
 
 def event_list(request):
-    events = (
-        Event.objects.select_related('venue', 'organizer')
-        .prefetch_related('categories', 'tags')
-        .filter(status=Event.STATUS_PUBLISHED)
-        .annotate(
-            avg_rating=Avg('reviews__rating', distinct=True),
-            reviews_count=Count('reviews', distinct=True),
-        )
-    )
-
-    q = request.GET.get('q')
-    if q:
-        events = events.filter(Q(title__icontains=q) | Q(organizer__name__icontains=q))
-
-    category = request.GET.get('category')
-    if category:
-        events = events.filter(categories__slug=category)
-
-    city = request.GET.get('city')
-    if city:
-        events = events.filter(venue__city__slug=city)
-
-    year = request.GET.get('year')
-    if year and year.isdigit():
-        events = events.filter(start_at__year=year)
-
-    ordering = request.GET.get('ordering')
-    if ordering in {'start_at', '-start_at', 'price_from', '-price_from'}:
-        events = events.order_by(ordering)
-
-    paginator = Paginator(events.distinct(), 9)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    query = EventQuery(EventFilters.from_params(request.GET))
+    events = Event.objects.for_cards()
+    if 'cursor' in request.GET or request.GET.get('pagination') == 'cursor':
+        try:
+            page_obj = query.cursor_page(request.GET.get('cursor') or None, 9, events)
+        except InvalidCursor:
+            page_obj = query.cursor_page(None, 9, events)
+    else:
+        page_obj = query.page(request.GET.get('page'), 9, events)
 
     querystring = request.GET.copy()
     querystring.pop('page', None)
+    querystring.pop('cursor', None)
     return render(
         request,
         'events/event_list.html',
@@ -107,15 +87,8 @@ def event_list(request):
 
 
 def event_detail(request, slug):
-    event = get_object_or_404(
-        Event.objects.select_related('venue', 'organizer')
-        .prefetch_related('categories', 'tags', 'images', 'reviews')
-        .annotate(
-            avg_rating=Avg('reviews__rating', distinct=True),
-            reviews_count=Count('reviews', distinct=True),
-        ),
-        slug=slug,
-    )
+    # Categories, tags and the first review page are read lazily: a warm fragment cache skips them.
+    event = get_object_or_404(Event.objects.select_related('venue', 'organizer'), slug=slug)
     can_manage = False
     user = request.user
     if user.is_authenticated:
@@ -128,54 +101,42 @@ def event_detail(request, slug):
                     user=user,
                     organizer=event.organizer,
                 ).exists()
-    return render(request, 'events/event_detail.html', {'event': event, 'can_manage': can_manage})
+    reviews = SimpleLazyObject(lambda: Review.objects.filter(event=event).page())
+    return render(
+        request,
+        'events/event_detail.html',
+        {
+            'event': event,
+            'reviews': reviews,
+            # Outside the fragment cache: availability changes with every sale.
+            'ticket_types': event.ticket_types.all(),
+            'can_manage': can_manage,
+        },
+    )
 
 
 @login_required
 def my_events(request):
-    events = (
-        Event.objects.select_related('venue', 'organizer')
-        .prefetch_related('categories', 'tags')
-        .annotate(
-            avg_rating=Avg('reviews__rating', distinct=True),
-            reviews_count=Count('reviews', distinct=True),
-        )
-    )
-
     user = request.user
     has_access = True
+    scope = {'status': None}
     if not (user.is_staff or user.is_superuser):
         profile = getattr(user, 'userprofile', None)
         if not profile or profile.role not in {'organizer', 'staff'}:
-            events = events.none()
             has_access = False
         else:
             allowed_ids = OrganizerMember.objects.filter(user=user).values_list('organizer_id', flat=True)
-            events = events.filter(organizer_id__in=allowed_ids)
-
-    q = request.GET.get('q')
-    if q:
-        events = events.filter(Q(title__icontains=q) | Q(organizer__name__icontains=q))
-
-    category = request.GET.get('category')
-    if category:
-        events = events.filter(categories__slug=category)
-
-    city = request.GET.get('city')
-    if city:
-        events = events.filter(venue__city__slug=city)
-
-    year = request.GET.get('year')
-    if year and year.isdigit():
-        events = events.filter(start_at__year=year)
-
-    ordering = request.GET.get('ordering')
-    if ordering in {'start_at', '-start_at', 'price_from', '-price_from'}:
-        events = events.order_by(ordering)
-
-    paginator = Paginator(events.distinct(), 9)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+            scope['organizer_ids'] = tuple(sorted(allowed_ids))
+
+    if has_access:
+        query = EventQuery(EventFilters.from_params(request.GET, **scope))
+        page_obj = query.page(
+            request.GET.get('page'),
+            9,
+            Event.objects.for_cards(),
+        )
+    else:
+        page_obj = Paginator(Event.objects.none(), 9).get_page(None)
 
     querystring = request.GET.copy()
     querystring.pop('page', None)
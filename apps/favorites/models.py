@@ -12,6 +12,7 @@ class Favorite(TimeStampedModel):
     class Meta:
         unique_together = ('user', 'event')
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['user', '-created_at'], name='favorite_user_created_idx')]
 
     def __str__(self) -> str:
         return f"{self.user} - {self.event}"
@@ -1,6 +1,6 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Avg, Count, Prefetch
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_POST
@@ -24,11 +24,7 @@ def toggle_favorite(request, slug):
 
 @login_required
 def favorite_list(request):
-    events_qs = Event.objects.annotate(
-        avg_rating=Avg('reviews__rating', distinct=True),
-        reviews_count=Count('reviews', distinct=True),
-    )
     favorites = Favorite.objects.filter(user=request.user).prefetch_related(
-        Prefetch('event', queryset=events_qs),
+        Prefetch('event', queryset=Event.objects.for_cards()),
     )
     return render(request, 'favorites/favorite_list.html', {'favorites': favorites})
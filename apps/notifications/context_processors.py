@@ -0,0 +1,11 @@
+from functools import partial
+
+from apps.notifications.inbox import unread_count
+
+
+def unread_notifications(request):
+    """Header badge count; a callable, so pages that do not render the badge never read it."""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {'unread_notifications': 0}
+    return {'unread_notifications': partial(unread_count, user.pk)}
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from apps.core.jobs import enqueue
+from apps.core.mail import queue_mass_mail
+from apps.events.models import Event
+from apps.favorites.models import Favorite
+from apps.notifications import inbox
+from apps.notifications.models import Notification
+from apps.tickets.models import Ticket
+
+FANOUT_CHUNK_SIZE = 1000
+
+CHANGE_CANCELLED = 'cancelled'
+CHANGE_RESCHEDULED = 'rescheduled'
+
+
+def recipient_chunk(event_id: int, after: int = 0, size: int = FANOUT_CHUNK_SIZE) -> list[int]:
+    """Next ``size`` user ids above ``after`` holding a live ticket for the event or favoriting it.
+
+    UNION removes users who are both; keyset on the id keeps every chunk an index range.
+    """
+    holders = (
+        Ticket.objects.filter(ticket_type__event_id=event_id, user_id__gt=after)
+        .exclude(status=Ticket.STATUS_CANCELLED)
+        .values_list('user_id', flat=True)
+        .order_by()
+    )
+    fans = Favorite.objects.filter(event_id=event_id, user_id__gt=after).values_list('user_id', flat=True).order_by()
+    return list(holders.union(fans).order_by('user_id')[:size])
+
+
+def message_for(event: Event, change: str) -> tuple[str, str]:
+    if change == CHANGE_CANCELLED:
+        return _('Событие отменено'), _('Событие «%(title)s» отменено.') % {'title': event.title}
+    start = timezone.localtime(event.start_at).strftime('%d.%m.%Y %H:%M')
+    return (
+        _('Событие перенесено'),
+        _('Событие «%(title)s» перенесено на %(start)s.') % {'title': event.title, 'start': start},
+    )
+
+
+def fan_out(event_id: int, change: str, after: int = 0, size: int = FANOUT_CHUNK_SIZE) -> int:
+    """Notify and email one chunk of recipients and queue the next chunk; returns the number notified.
+
+    Run by the ``notifications.fan_out`` job: the notifications, the queued emails, the follow-up job
+    and the removal of this one commit together, so a retried chunk never notifies twice and a
+    fan-out to tens of thousands of users never holds one long transaction.
+    """
+    event = Event.objects.filter(pk=event_id).only('title', 'start_at').first()
+    if event is None:
+        return 0
+    with transaction.atomic():
+        user_ids = recipient_chunk(event_id, after, size)
+        if not user_ids:
+            return 0
+        title, message = message_for(event, change)
+        Notification.objects.bulk_create(
+            [Notification(user_id=user_id, title=title, message=message) for user_id in user_ids],
+            batch_size=size,
+        )
+        # bulk_create sends no post_save; the badge counters are bumped here instead.
+        inbox.added(user_ids)
+        emails = get_user_model().objects.filter(pk__in=user_ids).exclude(email='').values_list('email', flat=True)
+        queue_mass_mail(title, message, emails)
+        if len(user_ids) == size:
+            enqueue('notifications.fan_out', event=event_id, change=change, after=user_ids[-1])
+    return len(user_ids)
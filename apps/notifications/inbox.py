@@ -0,0 +1,63 @@
+from collections.abc import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from apps.notifications.models import Notification
+
+# The counter is kept up to date on every write; the TTL only bounds drift from a lost update.
+UNREAD_CACHE_TTL = 24 * 60 * 60
+
+
+def unread_key(user_id: int) -> str:
+    return f'notifications:unread:{user_id}'
+
+
+def unread_count(user_id: int) -> int:
+    """Unread notifications of a user: a cache read, or one indexed COUNT after a miss."""
+    count = cache.get(unread_key(user_id))
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        cache.add(unread_key(user_id), count, UNREAD_CACHE_TTL)
+    return count
+
+
+def _shift(user_id: int, delta: int) -> None:
+    try:
+        count = cache.incr(unread_key(user_id), delta)
+    except ValueError:
+        # Not cached: the next read counts.
+        return
+    if count < 0:
+        cache.delete(unread_key(user_id))
+
+
+def added(user_ids: Iterable[int]) -> None:
+    """Count one new unread notification per user once the inserting transaction commits."""
+    user_ids = list(user_ids)
+    transaction.on_commit(lambda: [_shift(user_id, 1) for user_id in user_ids])
+
+
+def mark_read(user_id: int, ids: Iterable[int]) -> int:
+    """Mark some of a user's notifications read; returns how many were unread."""
+    changed = Notification.objects.filter(user_id=user_id, pk__in=list(ids), is_read=False).update(
+        is_read=True, updated_at=timezone.now()
+    )
+    if changed:
+        transaction.on_commit(lambda: _shift(user_id, -changed))
+    return changed
+
+
+def mark_all_read(user_id: int) -> int:
+    """Mark every unread notification of a user read in one UPDATE; returns how many changed.
+
+    The counter drops by the rows this UPDATE changed rather than being reset to zero, so a
+    notification inserted concurrently stays counted.
+    """
+    changed = Notification.objects.filter(user_id=user_id, is_read=False).update(
+        is_read=True, updated_at=timezone.now()
+    )
+    if changed:
+        transaction.on_commit(lambda: _shift(user_id, -changed))
+    return changed
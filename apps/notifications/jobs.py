@@ -0,0 +1,7 @@
+from apps.core.jobs import job
+from apps.notifications.fanout import fan_out
+
+
+@job('notifications.fan_out')
+def fan_out_event_change(event: int, change: str, after: int = 0) -> None:
+    fan_out(event, change, after)
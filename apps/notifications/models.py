@@ -2,6 +2,18 @@ from django.conf import settings
 from django.db import models
 
 from apps.core.models import TimeStampedModel
+from apps.core.pagination import CursorPage, keyset_page
+
+NOTIFICATIONS_PAGE_SIZE = 20
+
+
+class NotificationQuerySet(models.QuerySet):
+    # Newest first; ``id`` breaks ties within a fan-out chunk, which shares one timestamp.
+    KEYSET = ('-created_at', '-id')
+
+    def page(self, cursor: str | None = None, per_page: int = NOTIFICATIONS_PAGE_SIZE) -> CursorPage:
+        """One keyset page; raises ``InvalidCursor`` for a bad cursor."""
+        return keyset_page(self, self.KEYSET, cursor, per_page)
 
 
 class Notification(TimeStampedModel):
@@ -10,8 +22,15 @@ class Notification(TimeStampedModel):
     message = models.TextField()
     is_read = models.BooleanField(default=False)
 
+    objects = NotificationQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Unread counts and mark-all-read read only the index, never the message bodies.
+            models.Index(fields=['user', 'is_read', '-created_at', '-id'], name='notification_user_unread_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='notification_user_created_idx'),
+        ]
 
     def __str__(self) -> str:
         return f"{self.title}"
@@ -0,0 +1,31 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.core.jobs import enqueue
+from apps.events.models import Event
+from apps.notifications import inbox
+from apps.notifications.fanout import CHANGE_CANCELLED, CHANGE_RESCHEDULED
+from apps.notifications.models import Notification
+
+
+@receiver(post_save, sender=Event)
+def event_changed(sender, instance, created, **kwargs):
+    """Queue a fan-out when an event is cancelled or moved; the save itself only adds one job row."""
+    if created or not hasattr(instance, '_loaded_schedule'):
+        return
+    old_status, old_start = instance._loaded_schedule
+    instance._loaded_schedule = (instance.status, instance.start_at)
+    if instance.status == Event.STATUS_CANCELLED and old_status not in (None, Event.STATUS_CANCELLED):
+        enqueue('notifications.fan_out', event=instance.pk, change=CHANGE_CANCELLED)
+    elif (
+        instance.status == Event.STATUS_PUBLISHED
+        and old_start is not None
+        and instance.start_at != old_start
+    ):
+        enqueue('notifications.fan_out', event=instance.pk, change=CHANGE_RESCHEDULED)
+
+
+@receiver(post_save, sender=Notification)
+def notification_created(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        inbox.added([instance.user_id])
@@ -0,0 +1,74 @@
+from django.contrib.auth.models import User
+from django.core import mail
+
+from apps.core.jobs import run_jobs
+from apps.core.mail import send_queued
+from apps.core.models import Job
+from apps.core.testing import CacheIsolatedTestCase, make_event
+from apps.events.models import Event
+from apps.favorites.models import Favorite
+from apps.notifications import inbox
+from apps.notifications.fanout import CHANGE_CANCELLED, fan_out
+from apps.notifications.models import Notification
+from apps.orders.models import Order
+from apps.orders.services import checkout
+from apps.tickets.models import TicketType
+
+
+class FanOutTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.event = make_event()
+        ticket_type = TicketType.objects.create(event=self.event, name='Standard', price=1000, quota=10)
+        self.users = [User.objects.create_user(f'user{n}', f'user{n}@example.com', 'unused') for n in range(5)]
+        holders, fans = self.users[:3], self.users[2:]
+        for user in holders:
+            order = checkout(user, [(ticket_type.pk, 1)])
+            order.status = Order.STATUS_PAID
+            order.save()
+        for user in fans:
+            Favorite.objects.create(user=user, event=self.event)
+        # Ticket notifications are not what this test is about.
+        Notification.objects.all().delete()
+
+    def test_every_holder_and_fan_is_notified_once_in_chunks(self):
+        self.assertEqual(fan_out(self.event.pk, CHANGE_CANCELLED, size=2), 2)
+        self.assertEqual(Job.objects.get().payload['after'], self.users[1].pk)
+        while run_jobs():
+            pass
+        # The queued jobs deliver the remaining chunks of two and one.
+        self.assertEqual(
+            sorted(Notification.objects.values_list('user_id', flat=True)), sorted(user.pk for user in self.users)
+        )
+
+    def test_cancelling_the_event_queues_the_fan_out_and_emails(self):
+        for user in self.users:
+            self.assertEqual(inbox.unread_count(user.pk), 0)
+        event = Event.objects.get(pk=self.event.pk)
+        event.status = Event.STATUS_CANCELLED
+        event.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            run_jobs()
+        self.assertEqual(Notification.objects.count(), len(self.users))
+        self.assertEqual([inbox.unread_count(user.pk) for user in self.users], [1] * len(self.users))
+        send_queued()
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), sorted(u.email for u in self.users))
+
+
+class InboxTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('reader', password='unused')
+        with self.captureOnCommitCallbacks(execute=True):
+            for n in range(3):
+                Notification.objects.create(user=self.user, title=f'n{n}', message='-')
+
+    def test_mark_all_read_keeps_a_concurrent_notification(self):
+        self.assertEqual(inbox.unread_count(self.user.pk), 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(inbox.mark_all_read(self.user.pk), 3)
+            # Another request inserts a notification and bumps the counter before this one commits.
+            Notification.objects.bulk_create([Notification(user=self.user, title='late', message='-')])
+            inbox._shift(self.user.pk, 1)
+        self.assertEqual(inbox.unread_count(self.user.pk), 1)
+        self.assertEqual(Notification.objects.filter(user=self.user, is_read=False).count(), 1)
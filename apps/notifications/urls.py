@@ -0,0 +1,8 @@
+from django.urls import path
+
+from apps.notifications import views
+
+urlpatterns = [
+    path('', views.notification_list, name='list'),
+    path('read/', views.mark_all_read, name='read_all'),
+]
@@ -0,0 +1,33 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import redirect, render
+from django.utils.translation import gettext_lazy as _
+from django.views.decorators.http import require_POST
+
+from apps.core.pagination import InvalidCursor
+from apps.notifications import inbox
+from apps.notifications.models import Notification
+
+
+@login_required
+def notification_list(request):
+    unread_only = request.GET.get('unread') == '1'
+    notifications = Notification.objects.filter(user=request.user)
+    if unread_only:
+        notifications = notifications.filter(is_read=False)
+    try:
+        page = notifications.page(request.GET.get('cursor') or None)
+    except InvalidCursor:
+        page = notifications.page()
+    context = {'page': page, 'unread_only': unread_only}
+    if request.headers.get('X-Requested-With') == 'fetch':
+        return render(request, 'notifications/notification_items.html', context)
+    return render(request, 'notifications/notification_list.html', context)
+
+
+@login_required
+@require_POST
+def mark_all_read(request):
+    if inbox.mark_all_read(request.user.pk):
+        messages.success(request, _('Все уведомления прочитаны.'))
+    return redirect('notifications:list')
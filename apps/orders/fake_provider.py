@@ -0,0 +1,39 @@
+import json
+import urllib.request
+import uuid
+
+from apps.orders.models import Order, Payment
+from apps.orders.payments import SIGNATURE_HEADER, ingest, sign
+
+
+class FakeProvider:
+    """Local stand-in for the card gateway: produces signed callbacks the way the real one would."""
+
+    def __init__(self, secret: str | None = None):
+        self.secret = secret
+
+    def callback(self, order: Order, status: str, transaction_id: str) -> tuple[bytes, str]:
+        body = json.dumps({
+            'transaction_id': transaction_id,
+            'order': order.pk,
+            'status': status,
+            'amount': str(order.total),
+        }).encode()
+        return body, sign(body, self.secret)
+
+    def charge(self, order: Order, fail: bool = False) -> list[tuple[bytes, str]]:
+        """Callbacks of one card payment in the order the gateway sends them."""
+        transaction_id = f'fake_{uuid.uuid4().hex}'
+        final = Payment.STATUS_FAILED if fail else Payment.STATUS_SUCCESS
+        return [self.callback(order, status, transaction_id) for status in (Payment.STATUS_NEW, final)]
+
+    @staticmethod
+    def deliver(body: bytes, signature: str, url: str | None = None) -> str:
+        """Send a callback to the webhook at ``url``, or hand it to ``ingest`` in-process."""
+        if url is None:
+            return ingest(body, signature)
+        request = urllib.request.Request(
+            url, data=body, method='POST', headers={'Content-Type': 'application/json', SIGNATURE_HEADER: signature}
+        )
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return json.loads(response.read())['result']
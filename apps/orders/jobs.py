@@ -0,0 +1,25 @@
+from django.utils.translation import gettext as _
+
+from apps.core.jobs import job
+from apps.notifications.models import Notification
+from apps.orders.models import Order
+from apps.tickets.services import issue_tickets
+
+
+@job('orders.payment_succeeded')
+def payment_succeeded(order: int) -> None:
+    # issue_tickets notifies the buyer and does nothing for an order it has already served.
+    issue_tickets(Order.objects.get(pk=order))
+
+
+@job('orders.payment_failed')
+def payment_failed(order: int) -> None:
+    order = Order.objects.only('user_id', 'status').get(pk=order)
+    if order.status != Order.STATUS_NEW:
+        # Paid by a retry under another transaction, or cancelled, by the time this job ran.
+        return
+    Notification.objects.create(
+        user_id=order.user_id,
+        title=_('Оплата не прошла'),
+        message=_('Платёж по заказу #%(order)s отклонён. Попробуйте оплатить ещё раз.') % {'order': order.pk},
+    )
@@ -0,0 +1,168 @@
+import statistics
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Sum
+from django.utils import timezone
+
+from apps.core.models import City
+from apps.events.models import Event
+from apps.orders.models import OrderItem
+from apps.orders.services import CheckoutError, SoldOut, checkout, checkout_holds, expire_holds, hold, release_holds
+from apps.organizers.models import Organizer
+from apps.tickets.models import TicketHold, TicketType
+from apps.venues.models import Venue
+
+
+class Command(BaseCommand):
+    help = 'Run many concurrent checkouts (or holds) against one ticket type and verify nothing is oversold'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--buyers', type=int, default=300)
+        parser.add_argument('--quota', type=int, default=100)
+        parser.add_argument('--qty', type=int, default=1, help='Tickets per order')
+        parser.add_argument('--workers', type=int, default=50, help='Concurrent threads')
+        parser.add_argument(
+            '--holds',
+            action='store_true',
+            help='Hold first; then half of the holders confirm, a quarter release and the rest expire',
+        )
+        parser.add_argument('--keep', action='store_true', help='Keep the generated event, orders and users')
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        ticket_type, users = self.setup(tag, options['quota'], options['buyers'])
+        qty, workers = options['qty'], options['workers']
+        try:
+            if options['holds']:
+                self.bench_holds(ticket_type, users, qty, workers)
+            else:
+                tasks = [lambda user=user: checkout(user, [(ticket_type.pk, qty)]) for user in users]
+                outcomes, latencies, elapsed, _results = self.run(tasks, workers)
+                self.report('checkout', outcomes, latencies, elapsed)
+            self.verify(ticket_type)
+        finally:
+            if not options['keep']:
+                self.cleanup(ticket_type, users)
+
+    def bench_holds(self, ticket_type, users, qty, workers):
+        tasks = [lambda user=user: (user, hold(user, [(ticket_type.pk, qty)])) for user in users]
+        outcomes, latencies, elapsed, results = self.run(tasks, workers)
+        self.report('hold', outcomes, latencies, elapsed)
+
+        holders = [(user, [h.pk for h in holds]) for user, holds in results]
+        confirming = holders[: len(holders) // 2]
+        releasing = holders[len(holders) // 2: len(holders) * 3 // 4]
+        tasks = [lambda user=user, ids=ids: checkout_holds(user, ids) for user, ids in confirming]
+        tasks += [lambda user=user, ids=ids: release_holds(user, ids) for user, ids in releasing]
+        outcomes, latencies, elapsed, _results = self.run(tasks, workers)
+        self.report('confirm/release', outcomes, latencies, elapsed)
+
+        # The remaining quarter abandons its carts; sweep as if the TTL had passed.
+        started = time.perf_counter()
+        expired = 0
+        while batch := expire_holds(batch_size=100, now=timezone.now() + timezone.timedelta(days=1)):
+            expired += batch
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'expire: {expired} holds in {elapsed:.2f}s ({expired / max(elapsed, 1e-9):.0f} holds/s)')
+
+    def setup(self, tag, quota, buyers):
+        city = City.objects.create(name=f'Bench {tag}', slug=f'bench-{tag}')
+        venue = Venue.objects.create(name=f'Bench {tag}', slug=f'bench-{tag}', city=city, address='-')
+        organizer = Organizer.objects.create(name=f'Bench {tag}', slug=f'bench-{tag}')
+        start = timezone.now() + timezone.timedelta(days=30)
+        event = Event.objects.create(
+            title=f'Bench {tag}',
+            slug=f'bench-{tag}',
+            description='-',
+            start_at=start,
+            end_at=start + timezone.timedelta(hours=2),
+            venue=venue,
+            organizer=organizer,
+            status=Event.STATUS_PUBLISHED,
+        )
+        ticket_type = TicketType.objects.create(event=event, name='Bench', price=1000, quota=quota)
+        User.objects.bulk_create(
+            [User(username=f'bench-{tag}-{i}', password='!') for i in range(buyers)], batch_size=500
+        )
+        users = list(User.objects.filter(username__startswith=f'bench-{tag}-'))
+        return ticket_type, users
+
+    def run(self, tasks, workers):
+        """Start every task at once on ``workers`` threads; each task is one request."""
+        go = threading.Event()
+        outcomes = Counter()
+        latencies = []
+        results = []
+        lock = threading.Lock()
+
+        def call(task):
+            go.wait()
+            started = time.perf_counter()
+            result = None
+            try:
+                result = task()
+                outcome = 'ok'
+            except SoldOut:
+                outcome = 'sold_out'
+            except CheckoutError:
+                outcome = 'rejected'
+            except Exception as exc:
+                outcome = f'error:{type(exc).__name__}'
+            finally:
+                # One connection per "request", as under gunicorn.
+                connections.close_all()
+            with lock:
+                outcomes[outcome] += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+                if outcome == 'ok':
+                    results.append(result)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for task in tasks:
+                pool.submit(call, task)
+            started = time.perf_counter()
+            go.set()
+        return outcomes, latencies, time.perf_counter() - started, results
+
+    def report(self, phase, outcomes, latencies, elapsed):
+        if not latencies:
+            return
+        total = sum(outcomes.values())
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        summary = ' '.join(f'{outcome}={count}' for outcome, count in sorted(outcomes.items()))
+        self.stdout.write(
+            f'{phase}: {summary} elapsed={elapsed:.2f}s throughput={total / elapsed:.0f}/s '
+            f'p50={quantiles[49]:.1f}ms p95={quantiles[94]:.1f}ms max={max(latencies):.1f}ms'
+        )
+
+    def verify(self, ticket_type):
+        ticket_type.refresh_from_db()
+        in_orders = OrderItem.objects.filter(ticket_type=ticket_type).aggregate(total=Sum('qty'))['total'] or 0
+        in_holds = TicketHold.objects.filter(ticket_type=ticket_type).aggregate(total=Sum('qty'))['total'] or 0
+        self.stdout.write(
+            f'quota={ticket_type.quota} sold={ticket_type.sold} held={ticket_type.held} '
+            f'tickets in orders={in_orders} in holds={in_holds}'
+        )
+        if (
+            ticket_type.sold != in_orders
+            or ticket_type.held != in_holds
+            or ticket_type.sold + ticket_type.held > ticket_type.quota
+        ):
+            raise CommandError('Inventory mismatch: counters, orders, holds and quota disagree.')
+        self.stdout.write(self.style.SUCCESS('No oversell.'))
+
+    def cleanup(self, ticket_type, users):
+        event = ticket_type.event
+        User.objects.filter(pk__in=[user.pk for user in users]).delete()
+        venue, organizer = event.venue, event.organizer
+        event.delete()
+        venue.delete()
+        organizer.delete()
+        venue.city.delete()
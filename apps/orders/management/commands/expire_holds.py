@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.orders.services import expire_holds
+
+
+class Command(BaseCommand):
+    help = 'Return expired ticket holds to availability, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--loop', action='store_true', help='Keep running and sweep every --interval seconds')
+        parser.add_argument('--interval', type=float, default=15.0)
+
+    def handle(self, *args, **options):
+        while True:
+            expired = 0
+            while True:
+                batch = expire_holds(batch_size=options['batch_size'])
+                expired += batch
+                if batch < options['batch_size']:
+                    break
+            if expired or not options['loop']:
+                self.stdout.write(f'Expired {expired} holds.')
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,140 @@
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from apps.core.jobs import run_jobs
+from apps.core.models import Job
+from apps.orders.fake_provider import FakeProvider
+from apps.orders.management.commands.bench_checkout import Command as BenchCommand
+from apps.orders.models import Order, Payment
+from apps.orders.payments import SIGNATURE_HEADER
+from apps.orders.services import checkout
+
+# One test client per worker thread.
+_clients = threading.local()
+
+
+class Command(BenchCommand):
+    help = 'Replay thousands of fake provider callbacks, with duplicates and out of order, and verify the outcome'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=1000)
+        parser.add_argument('--duplicates', type=float, default=0.3, help='Share of callbacks sent twice')
+        parser.add_argument('--failures', type=float, default=0.1, help='Share of payments that end failed')
+        parser.add_argument(
+            '--retries', type=float, default=0.1, help='Share that fail first, then succeed under a new transaction',
+        )
+        parser.add_argument('--in-order', action='store_true', help='Do not shuffle the callbacks')
+        parser.add_argument('--workers', type=int, default=16, help='Concurrent threads')
+        parser.add_argument('--url', help='Webhook of a running server; default: in-process test client')
+        parser.add_argument('--no-jobs', action='store_true', help='Leave the queued post-processing jobs')
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--keep', action='store_true', help='Keep the generated event, orders and users')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        tag = uuid.uuid4().hex[:8]
+        total = options['orders']
+        ticket_type, users = self.setup(tag, total, max(total // 10, 1))
+        try:
+            started = time.perf_counter()
+            orders = [checkout(users[i % len(users)], [(ticket_type.pk, 1)]) for i in range(total)]
+            self.stdout.write(f'setup: {total} orders in {time.perf_counter() - started:.2f}s')
+
+            callbacks, expected = self.callbacks(orders, rng, options)
+            tasks = [lambda body=body, signature=signature: self.send(body, signature, options['url'])
+                     for body, signature in callbacks]
+            # The in-process client calls itself "testserver".
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                outcomes, latencies, elapsed, results = self.run(tasks, options['workers'])
+            self.report('webhook', outcomes, latencies, elapsed)
+            self.stdout.write('results: ' + ' '.join(f'{k}={v}' for k, v in sorted(Counter(results).items())))
+
+            if not options['no_jobs']:
+                started = time.perf_counter()
+                ran = 0
+                while batch := run_jobs(batch_size=200):
+                    ran += batch
+                elapsed = time.perf_counter() - started
+                self.stdout.write(f'jobs: {ran} in {elapsed:.2f}s ({ran / max(elapsed, 1e-9):.0f} jobs/s)')
+            self.check_outcome(expected, issued=not options['no_jobs'])
+        finally:
+            if not options['keep']:
+                Job.objects.filter(payload__order__in=[order.pk for order in orders]).delete()
+                self.cleanup(ticket_type, users)
+
+    def callbacks(self, orders, rng, options):
+        """Every order's callbacks, plus duplicates, shuffled; and each order's expected transaction statuses."""
+        provider = FakeProvider()
+        callbacks, expected = [], {}
+        for order in orders:
+            roll = rng.random()
+            if roll < options['failures']:
+                attempts = [Payment.STATUS_FAILED]
+            elif roll < options['failures'] + options['retries']:
+                # The buyer pays again after a decline; the gateway opens a new transaction.
+                attempts = [Payment.STATUS_FAILED, Payment.STATUS_SUCCESS]
+            else:
+                attempts = [Payment.STATUS_SUCCESS]
+            expected[order.pk] = {}
+            for final in attempts:
+                transaction_id = f'fake_{uuid.uuid4().hex}'
+                statuses = (Payment.STATUS_NEW, final)
+                callbacks += [provider.callback(order, status, transaction_id) for status in statuses]
+                expected[order.pk][transaction_id] = final
+        callbacks += rng.sample(callbacks, int(len(callbacks) * options['duplicates']))
+        if not options['in_order']:
+            rng.shuffle(callbacks)
+        self.stdout.write(f'callbacks: {len(callbacks)} for {len(orders)} orders')
+        return callbacks, expected
+
+    def send(self, body: bytes, signature: str, url: str | None) -> str:
+        if url:
+            return FakeProvider.deliver(body, signature, url)
+        client = getattr(_clients, 'client', None) or Client()
+        _clients.client = client
+        response = client.post(
+            reverse('api:payment_webhook'), body, content_type='application/json', headers={SIGNATURE_HEADER: signature}
+        )
+        if response.status_code != 200:
+            raise CommandError(f'webhook returned {response.status_code}: {response.content[:200]!r}')
+        return response.json()['result']
+
+    def check_outcome(self, expected: dict[int, dict[str, str]], issued: bool) -> None:
+        rows = (
+            Order.objects.filter(pk__in=expected)
+            .annotate(ticket_count=Count('tickets'))
+            .values_list('pk', 'status', 'ticket_count')
+        )
+        recorded = {pk: {} for pk in expected}
+        for order_id, transaction_id, status in Payment.objects.filter(order__in=expected).values_list(
+            'order_id', 'transaction_id', 'status'
+        ):
+            recorded[order_id][transaction_id] = status
+        problems = Counter()
+        paid_orders = 0
+        for pk, status, ticket_count in rows:
+            paid = Payment.STATUS_SUCCESS in expected[pk].values()
+            paid_orders += paid
+            if recorded[pk] != expected[pk]:
+                problems['payment status'] += 1
+            if status != (Order.STATUS_PAID if paid else Order.STATUS_NEW):
+                problems['order status'] += 1
+            if issued and ticket_count != (1 if paid else 0):
+                problems['tickets issued'] += 1
+        payments = sum(map(len, recorded.values()))
+        transactions = sum(map(len, expected.values()))
+        self.stdout.write(f'orders={len(expected)} transactions={transactions} payments={payments} paid={paid_orders}')
+        if payments != transactions:
+            problems['payment rows'] += abs(payments - transactions)
+        if problems:
+            raise CommandError('Mismatch: ' + ', '.join(f'{name}: {count}' for name, count in problems.items()))
+        self.stdout.write(self.style.SUCCESS('Every order ended in the expected state.'))
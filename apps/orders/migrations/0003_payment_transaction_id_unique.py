@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0002_order_tickets_issued_at'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='payment',
+            constraint=models.UniqueConstraint(
+                condition=models.Q(('transaction_id', ''), _negated=True),
+                fields=('transaction_id',),
+                name='payment_transaction_id_unique',
+            ),
+        ),
+    ]
@@ -20,9 +20,12 @@ class Order(TimeStampedModel):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_NEW)
     total = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
+    # Set in the same transaction that issues the tickets; a replayed payment finds it set.
+    tickets_issued_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['user', '-created_at'], name='order_user_created_idx')]
 
     def __str__(self) -> str:
         return f"Order #{self.pk}"
@@ -51,12 +54,19 @@ class Payment(TimeStampedModel):
 
     provider = models.CharField(max_length=20, default=PROVIDER_CARD)
     status = models.CharField(max_length=20, default=STATUS_NEW)
-    order = models.OneToOneField(Order, on_delete=models.CASCADE, related_name='payment')
+    # One row per provider transaction: a failed payment is retried under a new transaction_id.
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='payments')
     amount = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
+    # The provider's id; webhook callbacks are deduplicated on it.
     transaction_id = models.CharField(max_length=120, blank=True)
 
     class Meta:
         ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['transaction_id'], condition=~models.Q(transaction_id=''), name='payment_transaction_id_unique'
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Payment {self.order_id}"
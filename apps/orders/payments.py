@@ -0,0 +1,104 @@
+import hashlib
+import hmac
+import json
+import logging
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.jobs import enqueue
+from apps.orders.models import Order, Payment
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = 'X-Signature'
+
+APPLIED = 'applied'
+DUPLICATE = 'duplicate'
+
+# Statuses a payment may move to, and from which. ``success`` is final, so a late or replayed
+# ``new``/``failed`` callback arriving after it changes nothing.
+TRANSITIONS = {
+    Payment.STATUS_NEW: set(),
+    Payment.STATUS_FAILED: {Payment.STATUS_NEW},
+    Payment.STATUS_SUCCESS: {Payment.STATUS_NEW, Payment.STATUS_FAILED},
+}
+
+
+class WebhookError(Exception):
+    def __init__(self, message: str, code: str, status: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+        self.status = status
+
+
+def sign(body: bytes, secret: str | None = None) -> str:
+    secret = secret or settings.PAYMENT_WEBHOOK_SECRET
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def ingest(body: bytes, signature: str) -> str:
+    """Verify and apply one provider callback; returns ``APPLIED`` or ``DUPLICATE``.
+
+    The body is ``{"transaction_id", "order", "status", "amount"}`` signed with HMAC-SHA256.
+    Without ``PAYMENT_WEBHOOK_SECRET`` every callback is rejected: an empty key signs nothing.
+    """
+    if not settings.PAYMENT_WEBHOOK_SECRET:
+        raise WebhookError('Payment webhooks are not configured.', 'not_configured', 503)
+    if not hmac.compare_digest(sign(body), signature or ''):
+        raise WebhookError('Invalid signature.', 'invalid_signature', 403)
+    try:
+        data = json.loads(body.decode('utf-8'))
+        transaction_id = str(data['transaction_id']).strip()
+        order_id = int(data['order'])
+        status = data['status']
+        amount = Decimal(str(data['amount']))
+    except (ValueError, KeyError, TypeError, InvalidOperation):
+        raise WebhookError('Invalid callback payload.', 'validation_error')
+    if not transaction_id or status not in TRANSITIONS:
+        raise WebhookError('Invalid callback payload.', 'validation_error')
+    return apply_callback(transaction_id, order_id, status, amount)
+
+
+def apply_callback(transaction_id: str, order_id: int, status: str, amount: Decimal) -> str:
+    """Record a payment status and pay the order in one transaction; post-processing is queued.
+
+    Replays and callbacks that arrive after a later status are no-ops and return ``DUPLICATE``.
+    """
+    total = Order.objects.filter(pk=order_id).values_list('total', flat=True).first()
+    if total is None:
+        raise WebhookError('Order not found.', 'not_found', 404)
+    if amount != total:
+        raise WebhookError('Amount does not match the order total.', 'amount_mismatch')
+
+    now = timezone.now()
+    with transaction.atomic():
+        # Insert-or-nothing on the unique transaction_id; being a write, it also takes
+        # SQLite's write lock before anything is read.
+        Payment.objects.bulk_create(
+            [Payment(order_id=order_id, transaction_id=transaction_id, amount=amount)], ignore_conflicts=True
+        )
+        payment = Payment.objects.filter(transaction_id=transaction_id).only('order_id').first()
+        if payment is None or payment.order_id != order_id:
+            raise WebhookError('The transaction belongs to another order.', 'conflict', 409)
+
+        changed = Payment.objects.filter(pk=payment.pk, status__in=TRANSITIONS[status]).update(
+            status=status, updated_at=now
+        )
+        if not changed:
+            return DUPLICATE
+        if status == Payment.STATUS_SUCCESS:
+            # update() rather than save(): the paid order is finished by the job, not by post_save.
+            paid = Order.objects.filter(pk=order_id, status=Order.STATUS_NEW).update(
+                status=Order.STATUS_PAID, updated_at=now
+            )
+            if paid:
+                enqueue('orders.payment_succeeded', order=order_id)
+            else:
+                logger.warning('payment %s captured for order %s, which is not awaiting payment', transaction_id, order_id)
+        elif status == Payment.STATUS_FAILED:
+            enqueue('orders.payment_failed', order=order_id)
+    return APPLIED
@@ -0,0 +1,206 @@
+import uuid
+from collections import Counter, defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from apps.orders.models import Order, OrderItem
+from apps.stats.rollups import record_order
+from apps.tickets import checkin
+from apps.tickets.models import Ticket, TicketHold, TicketType
+
+MAX_TICKETS_PER_ORDER = 10
+
+
+class CheckoutError(Exception):
+    def __init__(self, message, ticket_type: TicketType | None = None):
+        super().__init__(message)
+        self.message = message
+        self.ticket_type = ticket_type
+
+
+class SoldOut(CheckoutError):
+    pass
+
+
+class SaleClosed(CheckoutError):
+    pass
+
+
+class HoldExpired(CheckoutError):
+    pass
+
+
+def _on_sale(now) -> Q:
+    return (Q(sale_start__isnull=True) | Q(sale_start__lte=now)) & (Q(sale_end__isnull=True) | Q(sale_end__gt=now))
+
+
+def _normalize(lines) -> list[tuple[int, int]]:
+    wanted = Counter()
+    for ticket_type_id, qty in lines:
+        if qty:
+            wanted[int(ticket_type_id)] += int(qty)
+    if not wanted:
+        raise CheckoutError(_('Выберите хотя бы один билет.'))
+    if any(qty < 0 for qty in wanted.values()) or sum(wanted.values()) > MAX_TICKETS_PER_ORDER:
+        raise CheckoutError(_('В одном заказе можно купить от 1 до %(max)s билетов.') % {'max': MAX_TICKETS_PER_ORDER})
+    # A fixed reservation order means two buyers never wait on each other's rows crosswise.
+    return sorted(wanted.items())
+
+
+def reserve(lines, now=None, counter: str = 'sold') -> None:
+    """Move ``qty`` of free quota into ``sold`` or ``held`` for each line, all or nothing.
+
+    Call inside a transaction. Each line is one conditional UPDATE, so concurrent buyers cannot oversell and nobody
+    holds a lock while counting. It is the first write of the transaction, which on SQLite
+    also takes the write lock up front instead of upgrading a read lock later.
+    """
+    now = now or timezone.now()
+    for ticket_type_id, qty in lines:
+        reserved = (
+            TicketType.objects.filter(_on_sale(now), pk=ticket_type_id, sold__lte=F('quota') - F('held') - qty)
+            .update(**{counter: F(counter) + qty})
+        )
+        if not reserved:
+            ticket_type = TicketType.objects.filter(pk=ticket_type_id).first()
+            if ticket_type is None:
+                raise CheckoutError(_('Тип билета не найден.'))
+            if not ticket_type.on_sale(now):
+                raise SaleClosed(_('Продажа билетов «%(name)s» закрыта.') % {'name': ticket_type.name}, ticket_type)
+            raise SoldOut(
+                _('Билетов «%(name)s» осталось: %(left)s.') % {'name': ticket_type.name, 'left': ticket_type.available},
+                ticket_type,
+            )
+
+
+def release(lines) -> None:
+    for ticket_type_id, qty in lines:
+        TicketType.objects.filter(pk=ticket_type_id).update(sold=F('sold') - qty)
+
+
+def checkout(user, lines, now=None) -> Order:
+    """Create a new order for ``lines`` of ``(ticket_type_id, qty)`` with the quota reserved.
+
+    Raises ``CheckoutError`` (``SoldOut``, ``SaleClosed``) and leaves nothing behind on failure.
+    """
+    lines = _normalize(lines)
+    with transaction.atomic():
+        reserve(lines, now)
+        return _create_order(user, lines)
+
+
+def _create_order(user, lines) -> Order:
+    ticket_types = TicketType.objects.only('price').in_bulk([ticket_type_id for ticket_type_id, qty in lines])
+    prices = {pk: ticket_type.price for pk, ticket_type in ticket_types.items()}
+    order = Order.objects.create(
+        user=user,
+        total=sum((prices[ticket_type_id] * qty for ticket_type_id, qty in lines), Decimal('0')),
+    )
+    OrderItem.objects.bulk_create([
+        OrderItem(order=order, ticket_type_id=ticket_type_id, qty=qty, price=prices[ticket_type_id])
+        for ticket_type_id, qty in lines
+    ])
+    return order
+
+
+def cancel_order(order: Order) -> bool:
+    """Cancel a live order, void its issued tickets and return the seats to the quota.
+
+    Returns ``False`` if the order was already cancelled.
+    """
+    with transaction.atomic():
+        cancelled = (
+            Order.objects.filter(pk=order.pk)
+            .exclude(status=Order.STATUS_CANCELLED)
+            .update(status=Order.STATUS_CANCELLED, updated_at=timezone.now())
+        )
+        if not cancelled:
+            return False
+        release(sorted(order.items.values_list('ticket_type_id', 'qty')))
+        if Order.objects.filter(pk=order.pk, tickets_issued_at__isnull=False).exists():
+            record_order(order.pk, sign=-1)
+        tickets = Ticket.objects.filter(order=order).exclude(status=Ticket.STATUS_CANCELLED)
+        codes_by_event = defaultdict(list)
+        for event_id, code in tickets.values_list('ticket_type__event_id', 'code'):
+            codes_by_event[event_id].append(code)
+        tickets.update(status=Ticket.STATUS_CANCELLED, updated_at=timezone.now())
+        # Door check-in validates against in-memory code indexes, which never reread a code they hold.
+        transaction.on_commit(lambda: checkin.revoke(codes_by_event))
+    order.status = Order.STATUS_CANCELLED
+    return True
+
+
+def hold(user, lines, now=None) -> list[TicketHold]:
+    """Set tickets aside for ``TICKET_HOLD_TTL`` seconds; same checks and errors as ``checkout``."""
+    lines = _normalize(lines)
+    now = now or timezone.now()
+    expires_at = now + timedelta(seconds=settings.TICKET_HOLD_TTL)
+    with transaction.atomic():
+        reserve(lines, now, counter='held')
+        return TicketHold.objects.bulk_create([
+            TicketHold(ticket_type_id=ticket_type_id, user=user, qty=qty, expires_at=expires_at)
+            for ticket_type_id, qty in lines
+        ])
+
+
+def _claim(holds) -> tuple[uuid.UUID, int]:
+    """Mark unclaimed holds as ours in one UPDATE; a hold is never released or converted twice."""
+    token = uuid.uuid4()
+    return token, holds.filter(claim__isnull=True).update(claim=token)
+
+
+def _claimed_lines(token) -> list[tuple[int, int]]:
+    claimed = TicketHold.objects.filter(claim=token).values('ticket_type').annotate(qty=Sum('qty'))
+    return sorted((row['ticket_type'], row['qty']) for row in claimed.order_by())
+
+
+def _release_claimed(token) -> int:
+    for ticket_type_id, qty in _claimed_lines(token):
+        TicketType.objects.filter(pk=ticket_type_id).update(held=F('held') - qty)
+    deleted, _by_model = TicketHold.objects.filter(claim=token).delete()
+    return deleted
+
+
+def checkout_holds(user, hold_ids, now=None) -> Order:
+    """Turn the user's live holds into an order; raises ``HoldExpired`` if any is gone."""
+    now = now or timezone.now()
+    hold_ids = set(hold_ids)
+    if not hold_ids:
+        raise CheckoutError(_('Выберите хотя бы один билет.'))
+    with transaction.atomic():
+        holds = TicketHold.objects.filter(pk__in=hold_ids, user=user, expires_at__gt=now)
+        token, claimed = _claim(holds)
+        if claimed != len(hold_ids):
+            raise HoldExpired(_('Время брони истекло. Выберите билеты заново.'))
+        lines = _claimed_lines(token)
+        for ticket_type_id, qty in lines:
+            TicketType.objects.filter(pk=ticket_type_id).update(held=F('held') - qty, sold=F('sold') + qty)
+        TicketHold.objects.filter(claim=token).delete()
+        return _create_order(user, lines)
+
+
+def release_holds(user, hold_ids) -> int:
+    """Give up the user's holds before they expire; returns the number released."""
+    with transaction.atomic():
+        token, claimed = _claim(TicketHold.objects.filter(pk__in=list(hold_ids), user=user))
+        return _release_claimed(token) if claimed else 0
+
+
+def expire_holds(batch_size: int = 500, now=None) -> int:
+    """Return one batch of expired holds to availability; returns how many were expired."""
+    now = now or timezone.now()
+    ids = list(
+        TicketHold.objects.filter(expires_at__lte=now, claim__isnull=True)
+        .order_by('expires_at')
+        .values_list('pk', flat=True)[:batch_size]
+    )
+    if not ids:
+        return 0
+    with transaction.atomic():
+        token, claimed = _claim(TicketHold.objects.filter(pk__in=ids))
+        return _release_claimed(token) if claimed else 0
@@ -0,0 +1,219 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core.jobs import run_jobs
+from apps.core.testing import CacheIsolatedTestCase, make_event
+from apps.notifications.models import Notification
+from apps.orders.fake_provider import FakeProvider
+from apps.orders.models import Order, Payment
+from apps.orders.payments import APPLIED, DUPLICATE, SIGNATURE_HEADER, WebhookError, ingest
+from apps.orders.services import (
+    MAX_TICKETS_PER_ORDER,
+    CheckoutError,
+    HoldExpired,
+    SaleClosed,
+    SoldOut,
+    cancel_order,
+    checkout,
+    checkout_holds,
+    expire_holds,
+    hold,
+    release_holds,
+)
+from apps.tickets.models import TicketHold, TicketType
+
+
+class CheckoutTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('buyer', password='unused')
+        cls.event = make_event()
+        cls.standard = TicketType.objects.create(event=cls.event, name='Standard', price=1000, quota=3)
+        cls.vip = TicketType.objects.create(event=cls.event, name='VIP', price=5000, quota=1)
+
+    def test_checkout_reserves_quota_and_prices_the_order(self):
+        order = checkout(self.user, [(self.standard.pk, 2), (self.vip.pk, 1)])
+        self.assertEqual(order.status, Order.STATUS_NEW)
+        self.assertEqual(order.total, 7000)
+        self.assertEqual(
+            sorted(order.items.values_list('ticket_type_id', 'qty')),
+            [(self.standard.pk, 2), (self.vip.pk, 1)],
+        )
+        self.standard.refresh_from_db()
+        self.assertEqual((self.standard.sold, self.standard.available), (2, 1))
+
+    def test_repeated_lines_are_merged(self):
+        order = checkout(self.user, [(self.standard.pk, 1), (self.standard.pk, 1)])
+        self.assertEqual(list(order.items.values_list('qty', flat=True)), [2])
+
+    def test_oversell_is_refused_and_leaves_nothing_behind(self):
+        checkout(self.user, [(self.standard.pk, 2)])
+        with self.assertRaises(SoldOut) as raised:
+            checkout(self.user, [(self.standard.pk, 1), (self.vip.pk, 2)])
+        self.assertEqual(raised.exception.ticket_type, self.vip)
+        # The standard seat reserved before the VIP line failed is rolled back with it.
+        self.standard.refresh_from_db()
+        self.vip.refresh_from_db()
+        self.assertEqual((self.standard.sold, self.vip.sold), (2, 0))
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_last_seats_go_to_one_buyer(self):
+        checkout(self.user, [(self.vip.pk, 1)])
+        with self.assertRaises(SoldOut):
+            checkout(self.user, [(self.vip.pk, 1)])
+        self.vip.refresh_from_db()
+        self.assertEqual(self.vip.sold, self.vip.quota)
+
+    def test_sale_window_is_checked(self):
+        self.standard.sale_end = timezone.now() - timedelta(minutes=1)
+        self.standard.save()
+        with self.assertRaises(SaleClosed):
+            checkout(self.user, [(self.standard.pk, 1)])
+
+    def test_invalid_quantities(self):
+        for lines in ([], [(self.standard.pk, 0)], [(self.standard.pk, MAX_TICKETS_PER_ORDER + 1)], [(0, 1)]):
+            with self.subTest(lines=lines), self.assertRaises(CheckoutError):
+                checkout(self.user, lines)
+        self.assertFalse(Order.objects.exists())
+
+    def test_cancel_returns_the_seats_once(self):
+        order = checkout(self.user, [(self.standard.pk, 3)])
+        self.assertTrue(cancel_order(order))
+        self.assertFalse(cancel_order(order))
+        self.standard.refresh_from_db()
+        self.assertEqual(self.standard.sold, 0)
+        checkout(self.user, [(self.standard.pk, 3)])
+
+
+class HoldTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('holder', password='unused')
+        cls.other = User.objects.create_user('other', password='unused')
+        cls.ticket_type = TicketType.objects.create(event=make_event(), name='Standard', price=1000, quota=3)
+
+    def counters(self) -> tuple[int, int]:
+        self.ticket_type.refresh_from_db()
+        return self.ticket_type.sold, self.ticket_type.held
+
+    def test_hold_sets_seats_aside(self):
+        hold(self.user, [(self.ticket_type.pk, 2)])
+        self.assertEqual(self.counters(), (0, 2))
+        with self.assertRaises(SoldOut):
+            checkout(self.other, [(self.ticket_type.pk, 2)])
+
+    def test_claiming_holds_moves_them_into_an_order(self):
+        holds = hold(self.user, [(self.ticket_type.pk, 2)])
+        order = checkout_holds(self.user, [h.pk for h in holds])
+        self.assertEqual(order.total, 2000)
+        self.assertEqual(self.counters(), (2, 0))
+        self.assertFalse(TicketHold.objects.exists())
+        with self.assertRaises(HoldExpired):
+            checkout_holds(self.user, [h.pk for h in holds])
+
+    def test_another_user_cannot_claim_a_hold(self):
+        holds = hold(self.user, [(self.ticket_type.pk, 1)])
+        with self.assertRaises(HoldExpired):
+            checkout_holds(self.other, [h.pk for h in holds])
+        self.assertEqual(self.counters(), (0, 1))
+
+    def test_expired_hold_cannot_be_claimed_and_is_released(self):
+        holds = hold(self.user, [(self.ticket_type.pk, 2)])
+        later = timezone.now() + timedelta(seconds=settings.TICKET_HOLD_TTL + 1)
+        with self.assertRaises(HoldExpired):
+            checkout_holds(self.user, [h.pk for h in holds], now=later)
+        # The failed claim is rolled back, so the sweep still finds the hold.
+        self.assertEqual(expire_holds(now=later), 1)
+        self.assertEqual(expire_holds(now=later), 0)
+        self.assertEqual(self.counters(), (0, 0))
+
+    def test_live_holds_survive_the_sweep(self):
+        hold(self.user, [(self.ticket_type.pk, 1)])
+        self.assertEqual(expire_holds(), 0)
+        self.assertEqual(self.counters(), (0, 1))
+
+    def test_release_gives_seats_back_once(self):
+        holds = hold(self.user, [(self.ticket_type.pk, 3)])
+        ids = [h.pk for h in holds]
+        self.assertEqual(release_holds(self.other, ids), 0)
+        self.assertEqual(release_holds(self.user, ids), 1)
+        self.assertEqual(release_holds(self.user, ids), 0)
+        self.assertEqual(self.counters(), (0, 0))
+
+
+class PaymentWebhookTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('payer', password='unused')
+        cls.ticket_type = TicketType.objects.create(event=make_event(), name='Standard', price=1000, quota=10)
+
+    def setUp(self):
+        super().setUp()
+        self.order = checkout(self.user, [(self.ticket_type.pk, 2)])
+        self.provider = FakeProvider()
+
+    def deliver(self, callbacks) -> list[str]:
+        return [ingest(body, signature) for body, signature in callbacks]
+
+    def test_bad_signature_is_rejected(self):
+        body, signature = self.provider.callback(self.order, Payment.STATUS_SUCCESS, 'tx-1')
+        forged = FakeProvider(secret='not-the-secret').callback(self.order, Payment.STATUS_SUCCESS, 'tx-1')[1]
+        for bad in ('', forged, signature[:-1]):
+            with self.subTest(signature=bad), self.assertRaises(WebhookError) as raised:
+                ingest(body, bad)
+            self.assertEqual(raised.exception.status, 403)
+        response = self.client.post(
+            reverse('api:payment_webhook'), body, content_type='application/json', headers={SIGNATURE_HEADER: forged}
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Payment.objects.exists())
+
+    def test_empty_secret_rejects_every_callback(self):
+        with self.settings(PAYMENT_WEBHOOK_SECRET=''):
+            body, signature = FakeProvider().callback(self.order, Payment.STATUS_SUCCESS, 'tx-1')
+            with self.assertRaises(WebhookError) as raised:
+                ingest(body, signature)
+            self.assertEqual(raised.exception.status, 503)
+            response = self.client.post(
+                reverse('api:payment_webhook'), body, content_type='application/json',
+                headers={SIGNATURE_HEADER: signature},
+            )
+            self.assertEqual(response.status_code, 503)
+        self.assertFalse(Payment.objects.exists())
+
+    def test_amount_must_match(self):
+        self.order.total += 1
+        body, signature = self.provider.callback(self.order, Payment.STATUS_SUCCESS, 'tx-1')
+        with self.assertRaises(WebhookError):
+            ingest(body, signature)
+
+    def test_replayed_and_late_callbacks_are_duplicates(self):
+        new, success = self.provider.charge(self.order)
+        self.assertEqual(self.deliver([success, new, success]), [APPLIED, DUPLICATE, DUPLICATE])
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, Order.STATUS_PAID)
+        self.assertEqual(run_jobs(), 1)
+        self.assertEqual(self.order.tickets.count(), 2)
+
+    def test_retry_under_a_new_transaction_pays_the_order(self):
+        self.deliver(self.provider.charge(self.order, fail=True))
+        self.deliver(self.provider.charge(self.order))
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, Order.STATUS_PAID)
+        statuses = sorted(self.order.payments.values_list('status', flat=True))
+        self.assertEqual(statuses, [Payment.STATUS_FAILED, Payment.STATUS_SUCCESS])
+        run_jobs()
+        self.assertEqual(self.order.tickets.count(), 2)
+        # The decline was overtaken by the retry, so the buyer only hears about the tickets.
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 1)
+
+    def test_transaction_of_another_order_conflicts(self):
+        other = checkout(self.user, [(self.ticket_type.pk, 2)])
+        self.deliver([self.provider.callback(self.order, Payment.STATUS_NEW, 'tx-1')])
+        with self.assertRaises(WebhookError) as raised:
+            self.deliver([self.provider.callback(other, Payment.STATUS_SUCCESS, 'tx-1')])
+        self.assertEqual(raised.exception.status, 409)
@@ -4,4 +4,9 @@ from apps.orders import views
 
 urlpatterns = [
     path('my/', views.my_orders, name='my'),
+    path('cart/', views.cart, name='cart'),
+    path('cart/confirm/', views.confirm_holds, name='confirm'),
+    path('cart/release/', views.release_view, name='release'),
+    path('checkout/<slug:slug>/', views.checkout_view, name='checkout'),
+    path('<int:pk>/pay/', views.fake_pay, name='pay'),
 ]
@@ -1,10 +1,94 @@
+from django.contrib import messages
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import render
+from django.http import Http404
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from django.views.decorators.http import require_POST
 
+from apps.events.models import Event
+from apps.orders.fake_provider import FakeProvider
 from apps.orders.models import Order
+from apps.orders.payments import WebhookError
+from apps.orders.services import CheckoutError, checkout_holds, hold, release_holds
+from apps.tickets.models import TicketHold
 
 
 @login_required
 def my_orders(request):
     orders = Order.objects.filter(user=request.user).order_by('-created_at')
-    return render(request, 'orders/my_orders.html', {'orders': orders})
+    return render(request, 'orders/my_orders.html', {
+        'orders': orders,
+        'can_pay': settings.PAYMENT_PROVIDER == 'fake',
+    })
+
+
+@login_required
+@require_POST
+def checkout_view(request, slug):
+    event = get_object_or_404(Event, slug=slug, status=Event.STATUS_PUBLISHED)
+    lines = []
+    for ticket_type_id in event.ticket_types.values_list('pk', flat=True):
+        raw = request.POST.get(f'qty_{ticket_type_id}', '').strip() or '0'
+        if not raw.isdigit():
+            messages.error(request, _('Укажите количество билетов числом.'))
+            return redirect('events:detail', slug=slug)
+        lines.append((ticket_type_id, int(raw)))
+    try:
+        hold(request.user, lines)
+    except CheckoutError as exc:
+        messages.error(request, exc.message)
+        return redirect('events:detail', slug=slug)
+    return redirect('orders:cart')
+
+
+def _hold_ids(request) -> list[int]:
+    return [int(value) for value in request.POST.getlist('hold') if value.isdigit()]
+
+
+@login_required
+def cart(request):
+    holds = (
+        TicketHold.objects.filter(user=request.user, expires_at__gt=timezone.now(), claim__isnull=True)
+        .select_related('ticket_type__event')
+    )
+    return render(request, 'orders/cart.html', {'holds': holds})
+
+
+@login_required
+@require_POST
+def confirm_holds(request):
+    try:
+        order = checkout_holds(request.user, _hold_ids(request))
+    except CheckoutError as exc:
+        messages.error(request, exc.message)
+        return redirect('orders:cart')
+    messages.success(request, _('Заказ #%(id)s оформлен.') % {'id': order.pk})
+    return redirect('orders:my')
+
+
+@login_required
+@require_POST
+def release_view(request):
+    release_holds(request.user, _hold_ids(request))
+    messages.info(request, _('Бронь снята.'))
+    return redirect('orders:cart')
+
+
+@login_required
+@require_POST
+def fake_pay(request, pk):
+    """Pay an order through the local stand-in provider; its callbacks go the webhook's way."""
+    if settings.PAYMENT_PROVIDER != 'fake':
+        raise Http404
+    order = get_object_or_404(Order, pk=pk, user=request.user, status=Order.STATUS_NEW)
+    provider = FakeProvider()
+    try:
+        for body, signature in provider.charge(order):
+            provider.deliver(body, signature)
+    except WebhookError as exc:
+        messages.error(request, exc.message)
+        return redirect('orders:my')
+    messages.success(request, _('Заказ #%(id)s оплачен. Билеты появятся в течение минуты.') % {'id': order.pk})
+    return redirect('orders:my')
@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Sum
+from django.utils import timezone
+
+from apps.stats.models import SALES_METRICS, EventDailyStats, EventHourlySales, OrganizerDailyStats
+from apps.tickets.models import TicketType
+
+BUCKETS = {
+    # bucket: (default span, longest span), in buckets
+    'hour': (48, 24 * 14),
+    'day': (30, 366),
+}
+
+
+def dashboard_data(organizer_id: int, event_id: int | None = None, bucket: str = 'day', span: int | None = None) -> dict:
+    """Dashboard payload for an organizer, or one of its events, cached for ``DASHBOARD_CACHE_TTL``.
+
+    Everything comes from the rollups in ``apps.stats`` and the ticket type counters, so a
+    refresh never scans orders or tickets.
+    """
+    default, longest = BUCKETS[bucket]
+    span = min(max(span or default, 1), longest)
+    key = f'organizers:dashboard:{organizer_id}:{event_id or "all"}:{bucket}:{span}'
+    data = cache.get(key)
+    if data is None:
+        data = _build(organizer_id, event_id, bucket, span)
+        cache.set(key, data, settings.DASHBOARD_CACHE_TTL)
+    return data
+
+
+def _build(organizer_id: int, event_id: int | None, bucket: str, span: int) -> dict:
+    now = timezone.localtime()
+    today = now.date()
+    if event_id:
+        daily = EventDailyStats.objects.filter(event_id=event_id, event__organizer_id=organizer_id)
+        hourly = EventHourlySales.objects.filter(event_id=event_id, event__organizer_id=organizer_id)
+    else:
+        daily = OrganizerDailyStats.objects.filter(organizer_id=organizer_id)
+        hourly = EventHourlySales.objects.filter(event__organizer_id=organizer_id)
+
+    if bucket == 'hour':
+        end = now.replace(minute=0, second=0, microsecond=0)
+        slots = [end - timedelta(hours=n) for n in reversed(range(span))]
+        rows = (
+            hourly.filter(hour__gte=slots[0])
+            .values('hour')
+            .annotate(**{metric: Sum(metric) for metric in SALES_METRICS})
+            .order_by()
+        )
+        by_slot = {timezone.localtime(row.pop('hour')): row for row in rows}
+    else:
+        slots = [today - timedelta(days=n) for n in reversed(range(span))]
+        rows = daily.filter(day__gte=slots[0]).totals('day')
+        by_slot = {row.pop('day'): row for row in rows}
+    empty = dict.fromkeys(SALES_METRICS, 0)
+    sales = [
+        {'t': slot.isoformat(), **{metric: by_slot.get(slot, empty)[metric] or 0 for metric in SALES_METRICS}}
+        for slot in slots
+    ]
+
+    # Ratings move slowly: always per day, over at least the last month.
+    rating_days = [today - timedelta(days=n) for n in reversed(range(max(span if bucket == 'day' else 0, 30)))]
+    rating_rows = {
+        row['day']: row for row in daily.filter(day__gte=rating_days[0]).totals('day')
+    }
+    ratings = []
+    for day in rating_days:
+        row = rating_rows.get(day)
+        reviews = row['reviews'] if row else 0
+        rating_sum = row['rating_sum'] if row else 0
+        ratings.append({
+            't': day.isoformat(),
+            'reviews': reviews,
+            'avg': round(rating_sum / reviews, 2) if reviews > 0 else None,
+        })
+
+    totals = daily.totals()
+    favorites, orders = totals['favorites'] or 0, totals['orders'] or 0
+    ticket_types = TicketType.objects.filter(event__organizer_id=organizer_id, event__end_at__gte=now)
+    if event_id:
+        ticket_types = ticket_types.filter(event_id=event_id)
+    ticket_types = ticket_types.values('id', 'name', 'event_id', 'event__title', 'quota', 'sold', 'held')
+
+    return {
+        'bucket': bucket,
+        'generated_at': now.isoformat(),
+        'sales': [{**row, 'revenue': str(row['revenue'])} for row in sales],
+        'ratings': ratings,
+        'totals': {
+            'tickets_sold': totals['tickets_sold'] or 0,
+            'revenue': str(totals['revenue'] or 0),
+            'orders': orders,
+            'checkins': totals['checkins'] or 0,
+            'favorites': favorites,
+            'reviews': totals['reviews'] or 0,
+        },
+        'conversion': {
+            'favorites': favorites,
+            'orders': orders,
+            'rate': round(orders / favorites, 4) if favorites > 0 else None,
+        },
+        'ticket_types': [
+            {
+                'id': row['id'],
+                'event': row['event_id'],
+                'event_title': row['event__title'],
+                'name': row['name'],
+                'quota': row['quota'],
+                'sold': row['sold'],
+                'held': row['held'],
+                'available': max(row['quota'] - row['sold'] - row['held'], 0),
+            }
+            for row in ticket_types
+        ],
+    }
@@ -5,4 +5,6 @@ from apps.organizers import views
 urlpatterns = [
     path('', views.organizer_list, name='list'),
     path('<slug:slug>/', views.organizer_detail, name='detail'),
+    path('<slug:slug>/dashboard/', views.dashboard, name='dashboard'),
+    path('<slug:slug>/dashboard/data/', views.dashboard_data_view, name='dashboard_data'),
 ]
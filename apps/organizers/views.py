@@ -1,8 +1,19 @@
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator
-from django.db.models import Avg, Count
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, render
 
-from apps.organizers.models import Organizer
+from apps.organizers.dashboard import BUCKETS, dashboard_data
+from apps.organizers.models import Organizer, OrganizerMember
+
+
+def _can_view_dashboard(user, organizer: Organizer) -> bool:
+    if not user.is_authenticated:
+        return False
+    if user.is_staff or user.is_superuser:
+        return True
+    return OrganizerMember.objects.filter(user=user, organizer=organizer).exists()
 
 
 def organizer_list(request):
@@ -20,8 +31,37 @@ def organizer_list(request):
 
 def organizer_detail(request, slug):
     organizer = get_object_or_404(Organizer, slug=slug)
-    events = organizer.events.annotate(
-        avg_rating=Avg('reviews__rating', distinct=True),
-        reviews_count=Count('reviews', distinct=True),
-    ).order_by('start_at')
-    return render(request, 'organizers/organizer_detail.html', {'organizer': organizer, 'events': events})
+    events = organizer.events.for_cards().order_by('start_at')
+    return render(request, 'organizers/organizer_detail.html', {
+        'organizer': organizer,
+        'events': events,
+        'can_view_dashboard': _can_view_dashboard(request.user, organizer),
+    })
+
+
+@login_required
+def dashboard(request, slug):
+    organizer = get_object_or_404(Organizer, slug=slug)
+    if not _can_view_dashboard(request.user, organizer):
+        raise PermissionDenied
+    events = organizer.events.order_by('-start_at').only('id', 'title', 'start_at')
+    return render(request, 'organizers/dashboard.html', {'organizer': organizer, 'events': events})
+
+
+@login_required
+def dashboard_data_view(request, slug):
+    """JSON for the dashboard charts: ``?bucket=hour|day&span=<buckets>&event=<id>``."""
+    organizer = get_object_or_404(Organizer, slug=slug)
+    if not _can_view_dashboard(request.user, organizer):
+        raise PermissionDenied
+    bucket = request.GET.get('bucket', 'day')
+    if bucket not in BUCKETS:
+        message = f"bucket must be one of: {', '.join(BUCKETS)}"
+        return JsonResponse({'error': {'code': 'validation_error', 'message': message}}, status=400)
+    try:
+        span = int(request.GET['span']) if request.GET.get('span') else None
+        event_id = int(request.GET['event']) if request.GET.get('event') else None
+    except ValueError:
+        message = 'span and event must be integers.'
+        return JsonResponse({'error': {'code': 'validation_error', 'message': message}}, status=400)
+    return JsonResponse(dashboard_data(organizer.pk, event_id, bucket, span))
@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.categories.models import Category
+from apps.core.testing import CacheIsolatedTestCase, make_event
+from apps.stats.models import CategoryDailyStats
+
+
+class StatsPageTests(CacheIsolatedTestCase):
+    @override_settings(STATS_WINDOW_DAYS=7)
+    def test_event_counts_and_windowed_totals(self):
+        music = Category.objects.create(name='Music', slug='music')
+        Category.objects.create(name='Empty', slug='empty')
+        make_event('first').categories.add(music)
+        make_event('second').categories.add(music)
+        today = timezone.localdate()
+        CategoryDailyStats.objects.create(category=music, day=today, tickets_sold=3)
+        CategoryDailyStats.objects.create(category=music, day=today - timedelta(days=6), tickets_sold=4)
+        CategoryDailyStats.objects.create(category=music, day=today - timedelta(days=7), tickets_sold=100)
+
+        response = self.client.get(reverse('pages:stats'))
+        self.assertEqual(response.status_code, 200)
+        categories = {category.name: category for category in response.context['categories']}
+        self.assertEqual(categories['Music'].event_count, 2)
+        self.assertEqual(categories['Music'].totals['tickets_sold'], 7)
+        self.assertEqual(categories['Empty'].totals['tickets_sold'], 0)
+        self.assertContains(response, 'Empty')
@@ -1,20 +1,20 @@
-from django.db.models import Avg, Count
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count
 from django.shortcuts import render
+from django.utils import timezone
 
 from apps.categories.models import Category
 from apps.events.models import Event
+from apps.stats.models import METRICS, CategoryDailyStats, VenueDailyStats
 from apps.venues.models import Venue
 
 
 def home(request):
     events = (
-        Event.objects.select_related('venue', 'organizer')
-        .prefetch_related('categories', 'tags')
+        Event.objects.for_cards()
         .filter(status=Event.STATUS_PUBLISHED)
-        .annotate(
-            avg_rating=Avg('reviews__rating', distinct=True),
-            reviews_count=Count('reviews', distinct=True),
-        )
         .order_by('start_at')[:6]
     )
     return render(request, 'pages/home.html', {'events': events})
@@ -32,10 +32,27 @@ def faq(request):
     return render(request, 'pages/faq.html')
 
 
+def _with_totals(objects, rollups, field: str, since) -> list:
+    """Attach the rollup sums since ``since`` to each object as ``totals``; missing rows read as zero."""
+    totals = {row[field]: row for row in rollups.filter(day__gte=since).totals(field)}
+    empty = dict.fromkeys(METRICS, 0)
+    objects = list(objects)
+    for obj in objects:
+        obj.totals = totals.get(obj.pk, empty)
+    return objects
+
+
 def stats(request):
-    categories = Category.objects.annotate(event_count=Count('events')).order_by('-event_count')
-    venues = Venue.objects.annotate(event_count=Count('events')).order_by('-event_count')
-    return render(request, 'pages/stats.html', {'categories': categories, 'venues': venues})
+    # Event counts per category and venue; activity is summed from the daily rollups (apps.stats)
+    # over the last STATS_WINDOW_DAYS only, so the page reads a bounded number of rollup rows.
+    since = timezone.localdate() - timedelta(days=settings.STATS_WINDOW_DAYS - 1)
+    categories = Category.objects.annotate(event_count=Count('events')).order_by('-event_count', 'name')
+    venues = Venue.objects.annotate(event_count=Count('events')).order_by('-event_count', 'name')
+    return render(request, 'pages/stats.html', {
+        'categories': _with_totals(categories, CategoryDailyStats.objects, 'category', since),
+        'venues': _with_totals(venues, VenueDailyStats.objects, 'venue', since),
+        'window_days': settings.STATS_WINDOW_DAYS,
+    })
 
 
 def page_not_found(request, exception):
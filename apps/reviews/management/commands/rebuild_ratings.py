@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.reviews.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = 'Rebuild stored rating counters (avg_rating, reviews_count) for all events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        updated = rebuild_ratings(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Ratings rebuilt for {updated} events.'))
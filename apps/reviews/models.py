@@ -4,8 +4,20 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 from apps.core.models import TimeStampedModel
+from apps.core.pagination import CursorPage, keyset_page
 from apps.events.models import Event
 
+REVIEWS_PAGE_SIZE = 10
+
+
+class ReviewQuerySet(models.QuerySet):
+    # Newest first; ``id`` breaks ties between reviews saved in the same instant.
+    KEYSET = ('-created_at', '-id')
+
+    def page(self, cursor: str | None = None, per_page: int = REVIEWS_PAGE_SIZE) -> CursorPage:
+        """One keyset page with authors joined; raises ``InvalidCursor`` for a bad cursor."""
+        return keyset_page(self.select_related('user'), self.KEYSET, cursor, per_page)
+
 
 class Review(TimeStampedModel):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='reviews', verbose_name=_('Событие'))
@@ -16,11 +28,23 @@ class Review(TimeStampedModel):
     )
     comment = models.TextField(_('Комментарий'), blank=True)
 
+    objects = ReviewQuerySet.as_manager()
+
     class Meta:
         unique_together = ('event', 'user')
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['event', '-created_at', '-id'], name='review_event_created_idx'),
+        ]
         verbose_name = _('Отзыв')
         verbose_name_plural = _('Отзывы')
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance._loaded_rating = (loaded.get('event_id'), loaded.get('rating'))
+        return instance
+
     def __str__(self) -> str:
         return f"{self.event.title} - {self.rating}"
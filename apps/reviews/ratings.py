@@ -0,0 +1,56 @@
+from django.db.models import Avg, Case, Count, F, FloatField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from apps.events.models import Event
+from apps.reviews.models import Review
+from apps.stats.rollups import record
+
+
+def apply_rating_delta(event_id: int, count_delta: int, sum_delta: int) -> None:
+    """Shift the stored counters of one event in a single UPDATE statement.
+
+    ``updated_at`` moves as well, so cached fragments showing ratings and reviews are rebuilt.
+    """
+    events = Event.objects.filter(pk=event_id)
+    if not count_delta and not sum_delta:
+        events.touch()
+        return
+    record(event_id, reviews=count_delta, rating_sum=sum_delta)
+    new_count = F('reviews_count') + count_delta
+    new_sum = F('rating_sum') + sum_delta
+    events.update(
+        updated_at=timezone.now(),
+        reviews_count=new_count,
+        rating_sum=new_sum,
+        avg_rating=Case(
+            When(Q(reviews_count__gt=-count_delta), then=Cast(new_sum, FloatField()) / new_count),
+            default=Value(None),
+            output_field=FloatField(),
+        ),
+    )
+
+
+def rebuild_ratings(batch_size: int = 1000) -> int:
+    """Recompute counters for every event from the reviews table, one id range at a time."""
+    reviews = Review.objects.filter(event=OuterRef('pk')).order_by().values('event')
+    count_sq = Subquery(reviews.annotate(value=Count('id')).values('value'))
+    sum_sq = Subquery(reviews.annotate(value=Sum('rating')).values('value'))
+    avg_sq = Subquery(reviews.annotate(value=Avg('rating')).values('value'), output_field=FloatField())
+
+    bounds = Event.objects.order_by('pk').values_list('pk', flat=True)
+    now = timezone.now()
+    updated = 0
+    last_pk = 0
+    while True:
+        chunk = list(bounds.filter(pk__gt=last_pk)[:batch_size])
+        if not chunk:
+            break
+        updated += Event.objects.filter(pk__gte=chunk[0], pk__lte=chunk[-1]).update(
+            reviews_count=Coalesce(count_sq, 0),
+            rating_sum=Coalesce(sum_sq, 0),
+            avg_rating=avg_sq,
+            updated_at=now,
+        )
+        last_pk = chunk[-1]
+    return updated
@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.reviews.models import Review
+from apps.reviews.ratings import apply_rating_delta
+from apps.stats.rollups import deleted_with_event
+
+
+@receiver(post_save, sender=Review)
+def update_event_rating_on_save(sender, instance, created, **kwargs):
+    if created:
+        apply_rating_delta(instance.event_id, 1, instance.rating)
+    else:
+        old_event_id, old_rating = getattr(instance, '_loaded_rating', (instance.event_id, instance.rating))
+        if old_event_id != instance.event_id:
+            apply_rating_delta(old_event_id, -1, -old_rating)
+            apply_rating_delta(instance.event_id, 1, instance.rating)
+        else:
+            apply_rating_delta(instance.event_id, 0, instance.rating - old_rating)
+    instance._loaded_rating = (instance.event_id, instance.rating)
+
+
+@receiver(post_delete, sender=Review)
+def update_event_rating_on_delete(sender, instance, origin=None, **kwargs):
+    event_id, rating = getattr(instance, '_loaded_rating', (instance.event_id, instance.rating))
+    if deleted_with_event(origin, event_id):
+        return
+    apply_rating_delta(event_id, -1, -rating)
@@ -3,5 +3,6 @@ from django.urls import path
 from apps.reviews import views
 
 urlpatterns = [
+    path('<slug:slug>/', views.event_reviews, name='list'),
     path('<slug:slug>/add/', views.add_review, name='add'),
 ]
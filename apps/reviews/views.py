@@ -3,8 +3,10 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.translation import gettext_lazy as _
 
+from apps.core.pagination import InvalidCursor
 from apps.events.models import Event
 from apps.reviews.forms import ReviewForm
+from apps.reviews.models import Review
 
 
 @login_required
@@ -23,3 +25,18 @@ def add_review(request, slug):
     else:
         form = ReviewForm()
     return render(request, 'reviews/review_form.html', {'form': form, 'event': event})
+
+
+def event_reviews(request, slug):
+    event = get_object_or_404(Event, slug=slug)
+    reviews = Review.objects.filter(event=event)
+    try:
+        page = reviews.page(request.GET.get('cursor') or None)
+    except InvalidCursor:
+        page = reviews.page()
+    # "Show more" on the event page fetches just the next items; a direct visit gets a full page.
+    if request.headers.get('X-Requested-With') == 'fetch':
+        template = 'reviews/review_items.html'
+    else:
+        template = 'reviews/event_reviews.html'
+    return render(request, template, {'event': event, 'page': page})
@@ -0,0 +1,14 @@
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_migrate
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.search'
+    verbose_name = 'Search'
+
+    def ready(self) -> None:
+        from apps.search import signals
+
+        # post_migrate is only sent to apps with models; this one has none.
+        post_migrate.connect(signals.build_initial_index, sender=apps.get_app_config('events'))
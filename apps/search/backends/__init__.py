@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.db import connections
+from django.utils.module_loading import import_string
+
+VENDOR_BACKENDS = {
+    'postgresql': 'apps.search.backends.postgres.PostgresSearchBackend',
+    'sqlite': 'apps.search.backends.sqlite.SQLiteSearchBackend',
+}
+FALLBACK_BACKEND = 'apps.search.backends.simple.SimpleSearchBackend'
+
+
+def backend_for(connection):
+    """Backend configured by ``SEARCH_BACKEND`` or, if empty, the one matching the database vendor."""
+    path = getattr(settings, 'SEARCH_BACKEND', '') or VENDOR_BACKENDS.get(connection.vendor, FALLBACK_BACKEND)
+    return import_string(path)(connection)
+
+
+def get_backend(using: str = 'default'):
+    return backend_for(connections[using])
@@ -0,0 +1,42 @@
+from typing import Iterable
+
+from django.db.models import QuerySet
+
+from apps.search.documents import EventDocument
+from apps.search.stemmer import tokenize
+
+MAX_QUERY_TERMS = 8
+
+
+class BaseSearchBackend:
+    """Interface every search backend implements; storage is owned by the backend itself."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def install(self, schema_editor) -> None:
+        """Create index storage. Called from the search app migration."""
+
+    def uninstall(self, schema_editor) -> None:
+        """Drop index storage. Called when the search migration is reversed."""
+
+    def index(self, documents: Iterable[EventDocument]) -> int:
+        raise NotImplementedError
+
+    def remove(self, event_ids: Iterable[int]) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def filter(self, queryset: QuerySet, query: str) -> QuerySet:
+        """Restrict ``queryset`` to matching events."""
+        raise NotImplementedError
+
+    def rank(self, queryset: QuerySet, query: str) -> QuerySet:
+        """Annotate ``search_rank`` (higher is better) on an already filtered queryset."""
+        return queryset
+
+    @staticmethod
+    def terms(query: str) -> list[str]:
+        return tokenize(query)[:MAX_QUERY_TERMS]
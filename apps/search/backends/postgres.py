@@ -0,0 +1,93 @@
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+
+from apps.search.backends.base import BaseSearchBackend
+
+TABLE = 'search_event_document'
+CONFIG = 'russian'
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Generated, weighted tsvector column with a GIN index, one row per event."""
+
+    def install(self, schema_editor):
+        schema_editor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {TABLE} (
+                event_id bigint PRIMARY KEY REFERENCES events_event (id) ON DELETE CASCADE,
+                title text NOT NULL DEFAULT '',
+                keywords text NOT NULL DEFAULT '',
+                body text NOT NULL DEFAULT '',
+                vector tsvector GENERATED ALWAYS AS (
+                    setweight(to_tsvector('{CONFIG}', title), 'A')
+                    || setweight(to_tsvector('{CONFIG}', keywords), 'B')
+                    || setweight(to_tsvector('{CONFIG}', body), 'C')
+                ) STORED
+            )
+            """
+        )
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {TABLE}_vector_gin ON {TABLE} USING gin (vector)'
+        )
+
+    def uninstall(self, schema_editor):
+        schema_editor.execute(f'DROP TABLE IF EXISTS {TABLE}')
+
+    def index(self, documents):
+        rows = [(doc.event_id, doc.title, doc.keywords, doc.body) for doc in documents]
+        if not rows:
+            return 0
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"""
+                INSERT INTO {TABLE} (event_id, title, keywords, body) VALUES (%s, %s, %s, %s)
+                ON CONFLICT (event_id) DO UPDATE
+                SET title = EXCLUDED.title, keywords = EXCLUDED.keywords, body = EXCLUDED.body
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def remove(self, event_ids):
+        ids = list(event_ids)
+        if not ids:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABLE} WHERE event_id = ANY(%s)', [ids])
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {TABLE}')
+
+    def tsquery(self, query: str) -> str:
+        # AND of all terms, the last one as a prefix so results update while typing.
+        terms = self.terms(query)
+        if not terms:
+            return ''
+        terms[-1] = f'{terms[-1]}:*'
+        return ' & '.join(terms)
+
+    def filter(self, queryset, query):
+        tsquery = self.tsquery(query)
+        if not tsquery:
+            return queryset
+        return queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT event_id FROM {TABLE} WHERE vector @@ to_tsquery('{CONFIG}', %s)",
+                [tsquery],
+            )
+        )
+
+    def rank(self, queryset, query):
+        tsquery = self.tsquery(query)
+        if not tsquery:
+            return queryset
+        table = queryset.model._meta.db_table
+        return queryset.annotate(
+            search_rank=RawSQL(
+                f"SELECT ts_rank_cd(vector, to_tsquery('{CONFIG}', %s), 32) FROM {TABLE} "
+                f'WHERE {TABLE}.event_id = "{table}"."id"',
+                [tsquery],
+                output_field=FloatField(),
+            )
+        )
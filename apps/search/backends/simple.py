@@ -0,0 +1,39 @@
+from django.db.models import Q
+
+from apps.search.backends.base import BaseSearchBackend
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """Index-less fallback for databases without full-text support. Every term must match somewhere."""
+
+    FIELDS = (
+        'title',
+        'description',
+        'organizer__name',
+        'venue__name',
+        'venue__city__name',
+        'categories__name',
+        'tags__name',
+    )
+
+    def index(self, documents):
+        return sum(1 for _ in documents)
+
+    def remove(self, event_ids):
+        pass
+
+    def clear(self):
+        pass
+
+    def filter(self, queryset, query):
+        terms = self.terms(query)
+        if not terms:
+            return queryset
+        model = queryset.model
+        matches = model.objects.all()
+        for term in terms:
+            condition = Q()
+            for field in self.FIELDS:
+                condition |= Q(**{f'{field}__icontains': term})
+            matches = matches.filter(condition)
+        return queryset.filter(pk__in=matches.values('pk'))
@@ -0,0 +1,72 @@
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+
+from apps.search.backends.base import BaseSearchBackend
+from apps.search.stemmer import stem, stem_text
+
+TABLE = 'search_event_fts'
+# bm25() column weights for (title, keywords, body).
+WEIGHTS = (10.0, 4.0, 1.0)
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """FTS5 virtual table keyed by event id. Text is stemmed in Python since FTS5 has no Russian stemmer."""
+
+    def install(self, schema_editor):
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+            "title, keywords, body, tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')"
+        )
+
+    def uninstall(self, schema_editor):
+        schema_editor.execute(f'DROP TABLE IF EXISTS {TABLE}')
+
+    def index(self, documents):
+        rows = [
+            (doc.event_id, doc.event_id, stem_text(doc.title), stem_text(doc.keywords), stem_text(doc.body))
+            for doc in documents
+        ]
+        if not rows:
+            return 0
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {TABLE} WHERE rowid = %s', [row[:1] for row in rows])
+            cursor.executemany(
+                f'INSERT INTO {TABLE} (rowid, title, keywords, body) VALUES (%s, %s, %s, %s)',
+                [row[1:] for row in rows],
+            )
+        return len(rows)
+
+    def remove(self, event_ids):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {TABLE} WHERE rowid = %s', [(pk,) for pk in event_ids])
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABLE}')
+
+    def match_expression(self, query: str) -> str:
+        # Every term is a quoted prefix of its stem, so partially typed words still match.
+        return ' '.join(f'"{stem(term)}"*' for term in self.terms(query))
+
+    def filter(self, queryset, query):
+        match = self.match_expression(query)
+        if not match:
+            return queryset
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {TABLE} WHERE {TABLE} MATCH %s', [match])
+        )
+
+    def rank(self, queryset, query):
+        match = self.match_expression(query)
+        if not match:
+            return queryset
+        table = queryset.model._meta.db_table
+        weights = ', '.join(str(w) for w in WEIGHTS)
+        return queryset.annotate(
+            search_rank=RawSQL(
+                f'SELECT -bm25({TABLE}, {weights}) FROM {TABLE} '
+                f'WHERE {TABLE} MATCH %s AND {TABLE}.rowid = "{table}"."id"',
+                [match],
+                output_field=FloatField(),
+            )
+        )
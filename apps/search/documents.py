@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from django.db.models import Prefetch
+
+from apps.categories.models import Category
+from apps.events.models import Event
+from apps.tags.models import Tag
+
+
+@dataclass(frozen=True)
+class EventDocument:
+    event_id: int
+    title: str
+    keywords: str
+    body: str
+
+
+def build_documents(event_ids: Iterable[int]) -> Iterator[EventDocument]:
+    """Collect the searchable text of the given events: title, related names and description."""
+    events = (
+        Event.objects.filter(pk__in=list(event_ids))
+        .select_related('organizer', 'venue__city')
+        .only('title', 'description', 'organizer__name', 'venue__name', 'venue__city__name')
+        .prefetch_related(
+            Prefetch('categories', queryset=Category.objects.only('name')),
+            Prefetch('tags', queryset=Tag.objects.only('name')),
+        )
+        .order_by()
+    )
+    for event in events:
+        keywords = [event.organizer.name, event.venue.name, event.venue.city.name]
+        keywords += [category.name for category in event.categories.all()]
+        keywords += [tag.name for tag in event.tags.all()]
+        yield EventDocument(
+            event_id=event.pk,
+            title=event.title,
+            keywords=' '.join(keywords),
+            body=event.description,
+        )
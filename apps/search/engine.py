@@ -0,0 +1,43 @@
+from typing import Iterable
+
+from django.db.models import QuerySet
+
+from apps.events.models import Event
+from apps.search.backends import get_backend
+from apps.search.documents import build_documents
+
+
+def search_events(queryset: QuerySet, query: str, *, ranked: bool = False) -> QuerySet:
+    backend = get_backend(queryset.db)
+    queryset = backend.filter(queryset, query)
+    if ranked:
+        queryset = backend.rank(queryset, query)
+        if 'search_rank' in queryset.query.annotations:
+            queryset = queryset.order_by('-search_rank', 'start_at', 'id')
+    return queryset
+
+
+def reindex_events(event_ids: Iterable[int]) -> int:
+    ids = set(event_ids)
+    if not ids:
+        return 0
+    backend = get_backend()
+    existing = set(Event.objects.filter(pk__in=ids).values_list('pk', flat=True))
+    backend.remove(ids - existing)
+    return backend.index(build_documents(existing))
+
+
+def reindex_all(batch_size: int = 500, clear: bool = False) -> int:
+    backend = get_backend()
+    if clear:
+        backend.clear()
+    indexed = 0
+    last_pk = 0
+    ids = Event.objects.order_by('pk').values_list('pk', flat=True)
+    while True:
+        chunk = list(ids.filter(pk__gt=last_pk)[:batch_size])
+        if not chunk:
+            break
+        indexed += backend.index(build_documents(chunk))
+        last_pk = chunk[-1]
+    return indexed
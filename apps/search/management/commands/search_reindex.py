@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.search.engine import reindex_all
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for all events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--clear', action='store_true', help='Drop all indexed documents first')
+
+    def handle(self, *args, **options):
+        indexed = reindex_all(batch_size=options['batch_size'], clear=options['clear'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} events.'))
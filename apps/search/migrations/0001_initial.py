@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+def install_index(apps, schema_editor):
+    from apps.search.backends import backend_for
+
+    backend_for(schema_editor.connection).install(schema_editor)
+
+
+def uninstall_index(apps, schema_editor):
+    from apps.search.backends import backend_for
+
+    backend_for(schema_editor.connection).uninstall(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('events', '0002_event_rating_counters'),
+        ('venues', '0001_initial'),
+        ('organizers', '0001_initial'),
+        ('categories', '0001_initial'),
+        ('tags', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_index, uninstall_index),
+    ]
@@ -0,0 +1,89 @@
+import threading
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.categories.models import Category
+from apps.core.models import City
+from apps.events.models import Event
+from apps.events.query import invalidate_event_queries
+from apps.organizers.models import Organizer
+from apps.search.engine import reindex_all, reindex_events
+from apps.tags.models import Tag
+from apps.venues.models import Venue
+
+_pending = threading.local()
+
+
+def schedule_reindex(event_ids) -> None:
+    """Reindex once the surrounding transaction commits, coalescing repeated saves of the same event."""
+    ids = getattr(_pending, 'ids', None)
+    if ids is None:
+        ids = _pending.ids = set()
+    ids.update(event_ids)
+    transaction.on_commit(_flush)
+
+
+def _flush() -> None:
+    ids = getattr(_pending, 'ids', None)
+    if ids:
+        _pending.ids = set()
+        reindex_events(ids)
+        # Cached catalogue id lists may have been built from the old index.
+        invalidate_event_queries()
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def event_changed(sender, instance, **kwargs):
+    schedule_reindex([instance.pk])
+
+
+@receiver(m2m_changed, sender=Event.categories.through)
+@receiver(m2m_changed, sender=Event.tags.through)
+def event_links_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in {'post_add', 'post_remove', 'post_clear'}:
+            schedule_reindex([instance.pk])
+        return
+    if action == 'pre_clear':
+        instance._search_event_ids = list(instance.events.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        schedule_reindex(getattr(instance, '_search_event_ids', []))
+    elif action in {'post_add', 'post_remove'}:
+        schedule_reindex(pk_set or [])
+
+
+@receiver(post_save, sender=Organizer)
+@receiver(post_save, sender=Venue)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Tag)
+def related_name_changed(sender, instance, created, **kwargs):
+    if not created:
+        schedule_reindex(instance.events.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=City)
+def city_changed(sender, instance, created, **kwargs):
+    if not created:
+        schedule_reindex(Event.objects.filter(venue__city=instance).values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Tag)
+def label_deleting(sender, instance, **kwargs):
+    instance._search_event_ids = list(instance.events.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Tag)
+def label_deleted(sender, instance, **kwargs):
+    schedule_reindex(getattr(instance, '_search_event_ids', []))
+
+
+def build_initial_index(sender, using, plan=None, **kwargs):
+    """Index existing events once the migrate run that created the index finishes, with the current models."""
+    applied = {(migration.app_label, migration.name) for migration, backwards in plan or () if not backwards}
+    if using == 'default' and ('search', '0001_initial') in applied:
+        reindex_all()
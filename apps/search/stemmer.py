@@ -0,0 +1,80 @@
+"""Snowball stemmer for Russian, used where the database has no Russian dictionary (SQLite FTS5)."""
+
+import re
+
+VOWELS = 'аеиоуыэюя'
+
+PERFECTIVE_GERUND = re.compile(r'((ив|ивши|ившись|ыв|ывши|ывшись)|((?<=[ая])(в|вши|вшись)))$')
+REFLEXIVE = re.compile(r'(с[яь])$')
+ADJECTIVE = re.compile(
+    r'(ее|ие|ые|ое|ими|ыми|ей|ий|ый|ой|ем|им|ым|ом|его|ого|ему|ому|их|ых|ую|юю|ая|яя|ою|ею)$'
+)
+PARTICIPLE = re.compile(r'((ивш|ывш|ующ)|((?<=[ая])(ем|нн|вш|ющ|щ)))$')
+VERB = re.compile(
+    r'((ила|ыла|ена|ейте|уйте|ите|или|ыли|ей|уй|ил|ыл|им|ым|ен|ило|ыло|ено|ят|ует|уют|ит|ыт|ены|ить'
+    r'|ыть|ишь|ую|ю)|((?<=[ая])(ла|на|ете|йте|ли|й|л|ем|н|ло|но|ет|ют|ны|ть|ешь|нно)))$'
+)
+NOUN = re.compile(
+    r'(а|ев|ов|ие|ье|е|иями|ями|ами|еи|ии|и|ией|ей|ой|ий|й|иям|ям|ием|ем|ам|ом|о|у|ах|иях|ях|ы|ь'
+    r'|ию|ью|ю|ия|ья|я)$'
+)
+DERIVATIONAL = re.compile(r'(ост|ость)$')
+SUPERLATIVE = re.compile(r'(ейше|ейш)$')
+CYRILLIC = re.compile(r'^[а-я]+$')
+TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def _region(word: str, start: int = 0) -> int:
+    """Index after the first non-vowel that follows a vowel, searching from ``start``."""
+    for i in range(start + 1, len(word)):
+        if word[i] not in VOWELS and word[i - 1] in VOWELS:
+            return i + 1
+    return len(word)
+
+
+def stem(word: str) -> str:
+    word = word.lower().replace('ё', 'е')
+    if not CYRILLIC.match(word):
+        return word
+
+    rv_start = next((i + 1 for i, ch in enumerate(word) if ch in VOWELS), len(word))
+    r2_start = _region(word, _region(word))
+    head, rv = word[:rv_start], word[rv_start:]
+
+    stripped = PERFECTIVE_GERUND.sub('', rv, count=1)
+    if stripped == rv:
+        rv = REFLEXIVE.sub('', rv, count=1)
+        stripped = ADJECTIVE.sub('', rv, count=1)
+        if stripped != rv:
+            stripped = PARTICIPLE.sub('', stripped, count=1)
+        else:
+            stripped = VERB.sub('', rv, count=1)
+            if stripped == rv:
+                stripped = NOUN.sub('', rv, count=1)
+    rv = stripped
+
+    if rv.endswith('и'):
+        rv = rv[:-1]
+
+    match = DERIVATIONAL.search(rv)
+    if match and rv_start + match.start() >= r2_start:
+        rv = rv[:match.start()]
+
+    if SUPERLATIVE.search(rv):
+        rv = SUPERLATIVE.sub('', rv, count=1)
+        if rv.endswith('нн'):
+            rv = rv[:-1]
+    elif rv.endswith('нн'):
+        rv = rv[:-1]
+    elif rv.endswith('ь'):
+        rv = rv[:-1]
+
+    return head + rv
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN.findall(text.lower())
+
+
+def stem_text(text: str) -> str:
+    return ' '.join(stem(token) for token in tokenize(text))
@@ -0,0 +1,38 @@
+from django.contrib import admin
+
+from apps.stats.models import CategoryDailyStats, EventDailyStats, OrganizerDailyStats, VenueDailyStats
+
+
+class DailyStatsAdmin(admin.ModelAdmin):
+    list_display = ('day', 'tickets_sold', 'revenue', 'checkins', 'favorites', 'reviews')
+    date_hierarchy = 'day'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(EventDailyStats)
+class EventDailyStatsAdmin(DailyStatsAdmin):
+    list_display = ('event', *DailyStatsAdmin.list_display)
+    list_select_related = ('event',)
+
+
+@admin.register(OrganizerDailyStats)
+class OrganizerDailyStatsAdmin(DailyStatsAdmin):
+    list_display = ('organizer', *DailyStatsAdmin.list_display)
+    list_select_related = ('organizer',)
+
+
+@admin.register(VenueDailyStats)
+class VenueDailyStatsAdmin(DailyStatsAdmin):
+    list_display = ('venue', *DailyStatsAdmin.list_display)
+    list_select_related = ('venue',)
+
+
+@admin.register(CategoryDailyStats)
+class CategoryDailyStatsAdmin(DailyStatsAdmin):
+    list_display = ('category', *DailyStatsAdmin.list_display)
+    list_select_related = ('category',)
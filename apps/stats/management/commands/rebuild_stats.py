@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from apps.stats.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily statistics rollups from orders, tickets, favorites and reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Only rebuild days from this date (YYYY-MM-DD) on')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            since = parse_date(options['since'])
+            if since is None:
+                raise CommandError('--since must be a date, YYYY-MM-DD.')
+        rows = rebuild(since)
+        self.stdout.write(f'Rebuilt {rows} event-day rows.')
@@ -0,0 +1,93 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('categories', '0001_initial'),
+        ('events', '0002_event_rating_counters'),
+        ('organizers', '0001_initial'),
+        ('venues', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('tickets_sold', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('checkins', models.IntegerField(default=0)),
+                ('favorites', models.IntegerField(default=0)),
+                ('reviews', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='categories.category')),
+            ],
+            options={
+                'ordering': ['day'],
+                'abstract': False,
+                'constraints': [models.UniqueConstraint(fields=('category', 'day'), name='categorydailystats_unique_day')],
+            },
+        ),
+        migrations.CreateModel(
+            name='EventDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('tickets_sold', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('checkins', models.IntegerField(default=0)),
+                ('favorites', models.IntegerField(default=0)),
+                ('reviews', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='events.event')),
+            ],
+            options={
+                'ordering': ['day'],
+                'abstract': False,
+                'constraints': [models.UniqueConstraint(fields=('event', 'day'), name='eventdailystats_unique_day')],
+            },
+        ),
+        migrations.CreateModel(
+            name='OrganizerDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('tickets_sold', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('checkins', models.IntegerField(default=0)),
+                ('favorites', models.IntegerField(default=0)),
+                ('reviews', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('organizer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='organizers.organizer')),
+            ],
+            options={
+                'ordering': ['day'],
+                'abstract': False,
+                'constraints': [models.UniqueConstraint(fields=('organizer', 'day'), name='organizerdailystats_unique_day')],
+            },
+        ),
+        migrations.CreateModel(
+            name='VenueDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('tickets_sold', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('checkins', models.IntegerField(default=0)),
+                ('favorites', models.IntegerField(default=0)),
+                ('reviews', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='venues.venue')),
+            ],
+            options={
+                'ordering': ['day'],
+                'abstract': False,
+                'constraints': [models.UniqueConstraint(fields=('venue', 'day'), name='venuedailystats_unique_day')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_event_rating_counters'),
+        ('stats', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='categorydailystats',
+            name='orders',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='eventdailystats',
+            name='orders',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='organizerdailystats',
+            name='orders',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='venuedailystats',
+            name='orders',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='EventHourlySales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('tickets_sold', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('orders', models.IntegerField(default=0)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hourly_sales', to='events.event')),
+            ],
+            options={
+                'ordering': ['hour'],
+                'constraints': [models.UniqueConstraint(fields=('event', 'hour'), name='eventhourlysales_unique_hour')],
+            },
+        ),
+    ]
@@ -0,0 +1,85 @@
+from django.db import models
+from django.db.models import Sum
+
+from apps.categories.models import Category
+from apps.events.models import Event
+from apps.organizers.models import Organizer
+from apps.venues.models import Venue
+
+METRICS = ('tickets_sold', 'revenue', 'orders', 'checkins', 'favorites', 'reviews', 'rating_sum')
+SALES_METRICS = ('tickets_sold', 'revenue', 'orders')
+
+
+class DailyStatsQuerySet(models.QuerySet):
+    def totals(self, *group_by):
+        """Every metric summed, per ``group_by`` values (or overall with none)."""
+        sums = {metric: Sum(metric) for metric in METRICS}
+        if group_by:
+            return self.order_by().values(*group_by).annotate(**sums)
+        return self.aggregate(**sums)
+
+
+class DailyStats(models.Model):
+    """One day of activity, local time; written by ``apps.stats.rollups``, never by hand.
+
+    Values are net for the day: a cancelled order or a removed favorite counts negative.
+    """
+
+    day = models.DateField()
+    tickets_sold = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    # Paid orders with seats at the event; an order spanning two events counts for each.
+    orders = models.IntegerField(default=0)
+    checkins = models.IntegerField(default=0)
+    favorites = models.IntegerField(default=0)
+    reviews = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+
+    objects = DailyStatsQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+        ordering = ['day']
+
+
+class EventDailyStats(DailyStats):
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='daily_stats')
+
+    class Meta(DailyStats.Meta):
+        constraints = [models.UniqueConstraint(fields=['event', 'day'], name='eventdailystats_unique_day')]
+
+
+class OrganizerDailyStats(DailyStats):
+    organizer = models.ForeignKey(Organizer, on_delete=models.CASCADE, related_name='daily_stats')
+
+    class Meta(DailyStats.Meta):
+        constraints = [models.UniqueConstraint(fields=['organizer', 'day'], name='organizerdailystats_unique_day')]
+
+
+class VenueDailyStats(DailyStats):
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='daily_stats')
+
+    class Meta(DailyStats.Meta):
+        constraints = [models.UniqueConstraint(fields=['venue', 'day'], name='venuedailystats_unique_day')]
+
+
+class CategoryDailyStats(DailyStats):
+    # An event in several categories counts fully in each of them.
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='daily_stats')
+
+    class Meta(DailyStats.Meta):
+        constraints = [models.UniqueConstraint(fields=['category', 'day'], name='categorydailystats_unique_day')]
+
+
+class EventHourlySales(models.Model):
+    """Sales of one event per clock hour, for sales velocity; maintained alongside the daily rows."""
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='hourly_sales')
+    hour = models.DateTimeField()
+    tickets_sold = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    orders = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['hour']
+        constraints = [models.UniqueConstraint(fields=['event', 'hour'], name='eventhourlysales_unique_hour')]
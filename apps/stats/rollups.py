@@ -0,0 +1,153 @@
+from collections import defaultdict
+from datetime import date, datetime, time
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, QuerySet, Sum
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from apps.events.models import Event
+from apps.favorites.models import Favorite
+from apps.orders.models import Order, OrderItem
+from apps.reviews.models import Review
+from apps.stats.models import (
+    METRICS,
+    SALES_METRICS,
+    CategoryDailyStats,
+    EventDailyStats,
+    EventHourlySales,
+    OrganizerDailyStats,
+    VenueDailyStats,
+)
+from apps.tickets.models import Ticket
+
+BATCH_SIZE = 1000
+# Rollups above the event level and the event field each one groups by.
+DIMENSIONS = (
+    (OrganizerDailyStats, 'organizer', 'event__organizer'),
+    (VenueDailyStats, 'venue', 'event__venue'),
+    (CategoryDailyStats, 'category', 'event__categories'),
+)
+
+
+def _bump(model, lookup: dict, deltas: dict) -> None:
+    """Add ``deltas`` to one rollup row, creating it on the first write of its day or hour."""
+    changes = {metric: F(metric) + value for metric, value in deltas.items()}
+    if model.objects.filter(**lookup).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:
+        # Another writer created the row first.
+        model.objects.filter(**lookup).update(**changes)
+
+
+def deleted_with_event(origin, event_id: int) -> bool:
+    """Whether a ``post_delete`` is part of deleting the event itself, whose rollups go with it.
+
+    ``origin`` is what ``delete()`` was called on. Counting such a row would recreate a rollup of
+    an event the same cascade is about to delete.
+    """
+    if isinstance(origin, Event):
+        return origin.pk == event_id
+    if isinstance(origin, QuerySet) and origin.model is Event:
+        return origin.filter(pk=event_id).exists()
+    return False
+
+
+def record(event_id: int, when: datetime | None = None, **deltas) -> None:
+    """Count activity of one event on the local day of ``when`` at every rollup level."""
+    deltas = {metric: value for metric, value in deltas.items() if value}
+    if not deltas:
+        return
+    day = timezone.localdate(when)
+    event = Event.objects.filter(pk=event_id).values('organizer_id', 'venue_id').first()
+    if event is None:
+        return
+    _bump(EventDailyStats, {'event_id': event_id, 'day': day}, deltas)
+    _bump(OrganizerDailyStats, {'organizer_id': event['organizer_id'], 'day': day}, deltas)
+    _bump(VenueDailyStats, {'venue_id': event['venue_id'], 'day': day}, deltas)
+    for category_id in Event.categories.through.objects.filter(event_id=event_id).values_list('category_id', flat=True):
+        _bump(CategoryDailyStats, {'category_id': category_id, 'day': day}, deltas)
+
+
+def record_order(order_id: int, sign: int = 1, when: datetime | None = None) -> None:
+    """Count an order's seats and revenue as sold (``sign=1``) or refunded (``sign=-1``)."""
+    hour = timezone.localtime(when).replace(minute=0, second=0, microsecond=0)
+    lines = (
+        OrderItem.objects.filter(order_id=order_id)
+        .values('ticket_type__event')
+        .annotate(seats=Sum('qty'), revenue=Sum(F('price') * F('qty')))
+        .order_by()
+    )
+    for line in lines:
+        sales = {'tickets_sold': sign * line['seats'], 'revenue': sign * line['revenue'], 'orders': sign}
+        record(line['ticket_type__event'], when, **sales)
+        _bump(EventHourlySales, {'event_id': line['ticket_type__event'], 'hour': hour}, sales)
+
+
+def rebuild(since: date | None = None) -> int:
+    """Recompute the rollups from orders, tickets, favorites and reviews; returns event-day rows.
+
+    Only days from ``since`` on are replaced. Favorites and reviews count on the day they were
+    created, so a rebuilt day can differ from the incremental one, never the totals.
+    """
+    tz = timezone.get_current_timezone()
+    start = datetime.combine(since, time.min, tzinfo=tz) if since else None
+    days: dict[tuple[int, date], dict] = defaultdict(lambda: dict.fromkeys(METRICS, 0))
+    hours: dict[tuple[int, datetime], dict] = defaultdict(lambda: dict.fromkeys(SALES_METRICS, 0))
+
+    def collect(rows, trunc, queryset, stamp: str, event: str, sign: int = 1, **metrics):
+        if start:
+            queryset = queryset.filter(**{f'{stamp}__gte': start})
+        grouped = (
+            queryset.annotate(bucket=trunc(stamp, tzinfo=tz))
+            .values(event, 'bucket')
+            .annotate(**metrics)
+            .order_by()
+        )
+        for row in grouped.iterator():
+            totals = rows[row[event], row['bucket']]
+            for metric in metrics:
+                totals[metric] += sign * (row[metric] or 0)
+
+    sold = {
+        'tickets_sold': Sum('qty'),
+        'revenue': Sum(F('price') * F('qty')),
+        'orders': Count('order', distinct=True),
+    }
+    issued = OrderItem.objects.filter(order__tickets_issued_at__isnull=False)
+    # Cancelling stamps the order's updated_at; a refund counts at that time.
+    refunded = issued.filter(order__status=Order.STATUS_CANCELLED)
+    for rows, trunc in ((days, TruncDate), (hours, TruncHour)):
+        collect(rows, trunc, issued, 'order__tickets_issued_at', 'ticket_type__event', **sold)
+        collect(rows, trunc, refunded, 'order__updated_at', 'ticket_type__event', sign=-1, **sold)
+    used = Ticket.objects.filter(status=Ticket.STATUS_USED)
+    collect(days, TruncDate, used, 'updated_at', 'ticket_type__event', checkins=Count('id'))
+    collect(days, TruncDate, Favorite.objects.all(), 'created_at', 'event', favorites=Count('id'))
+    reviews = Review.objects.all()
+    collect(days, TruncDate, reviews, 'created_at', 'event', reviews=Count('id'), rating_sum=Sum('rating'))
+
+    models = [EventDailyStats] + [model for model, _field, _path in DIMENSIONS]
+    with transaction.atomic():
+        for model in models:
+            stale = model.objects.filter(day__gte=since) if since else model.objects.all()
+            stale.delete()
+        (EventHourlySales.objects.filter(hour__gte=start) if start else EventHourlySales.objects.all()).delete()
+        EventDailyStats.objects.bulk_create(
+            [EventDailyStats(event_id=event_id, day=day, **totals) for (event_id, day), totals in days.items()],
+            batch_size=BATCH_SIZE,
+        )
+        EventHourlySales.objects.bulk_create(
+            [EventHourlySales(event_id=event_id, hour=hour, **totals) for (event_id, hour), totals in hours.items()],
+            batch_size=BATCH_SIZE,
+        )
+        events = EventDailyStats.objects.filter(day__gte=since) if since else EventDailyStats.objects.all()
+        for model, field, path in DIMENSIONS:
+            grouped = events.filter(**{f'{path}__isnull': False}).totals(path, 'day')
+            model.objects.bulk_create(
+                [model(**{f'{field}_id': row.pop(path)}, **row) for row in grouped.iterator()],
+                batch_size=BATCH_SIZE,
+            )
+    return len(days)
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.favorites.models import Favorite
+from apps.stats.rollups import deleted_with_event, record
+
+
+@receiver(post_save, sender=Favorite)
+def count_favorite(sender, instance, created, **kwargs):
+    if created:
+        record(instance.event_id, favorites=1)
+
+
+@receiver(post_delete, sender=Favorite)
+def uncount_favorite(sender, instance, origin=None, **kwargs):
+    if not deleted_with_event(origin, instance.event_id):
+        record(instance.event_id, favorites=-1)
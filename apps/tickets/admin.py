@@ -1,17 +1,23 @@
 from django.contrib import admin
 
-from apps.tickets.models import Ticket, TicketType
+from apps.tickets.models import Ticket, TicketHold, TicketType
 
 
 @admin.register(TicketType)
 class TicketTypeAdmin(admin.ModelAdmin):
-    list_display = ('event', 'name', 'price', 'quota')
+    list_display = ('event', 'name', 'price', 'quota', 'sold', 'held')
     list_filter = ('event',)
     search_fields = ('name',)
 
 
 @admin.register(Ticket)
 class TicketAdmin(admin.ModelAdmin):
-    list_display = ('ticket_type', 'user', 'status', 'created_at')
+    list_display = ('ticket_type', 'user', 'order', 'status', 'created_at')
     list_filter = ('status',)
     search_fields = ('code',)
+
+
+@admin.register(TicketHold)
+class TicketHoldAdmin(admin.ModelAdmin):
+    list_display = ('ticket_type', 'user', 'qty', 'expires_at')
+    raw_id_fields = ('ticket_type', 'user')
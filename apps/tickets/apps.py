@@ -5,3 +5,6 @@ class TicketsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.tickets'
     verbose_name = 'Tickets'
+
+    def ready(self) -> None:
+        from apps.tickets import signals  # noqa: F401
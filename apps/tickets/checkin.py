@@ -0,0 +1,310 @@
+import atexit
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import BinaryIO, Iterable
+
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.stats.rollups import record
+from apps.tickets.models import Ticket
+
+logger = logging.getLogger(__name__)
+
+OK = 'ok'
+ALREADY_USED = 'already_used'
+CANCELLED = 'cancelled'
+UNKNOWN = 'unknown'
+
+UPDATE_BATCH_SIZE = 500
+# Pending scans are written once this many have piled up or the oldest is this many seconds old.
+FLUSH_SIZE = 200
+FLUSH_INTERVAL = 2.0
+# How long the shared-cache double-scan guard remembers a code; longer than any door window.
+SCAN_GUARD_TTL = 60 * 60 * 24
+# Seconds a user's permission to check in tickets of an event is trusted before it is checked again.
+STAFF_RECHECK_INTERVAL = 60
+# Event indexes kept per process; the least recently scanned is dropped beyond this, and any index
+# without a scan for INDEX_IDLE_TTL seconds, which is every index once its event is over.
+MAX_INDEXES = 32
+INDEX_IDLE_TTL = 60 * 60
+
+
+class TicketCodeIndex:
+    """Ticket codes of one event as 128-bit ints, for validating scans without reading the database.
+
+    ``scan`` moves a code from valid to used under a lock, so a double scan within the process is
+    rejected atomically; the ``used`` transitions are written later by ``flush`` in batched UPDATEs.
+    Codes of cancelled orders are moved out of ``valid`` by ``revoke``.
+    """
+
+    def __init__(
+        self, event_id: int, valid: Iterable[int] = (), used: Iterable[int] = (), cancelled: Iterable[int] = ()
+    ):
+        self.event_id = event_id
+        self._valid = set(valid)
+        self._used = set(used)
+        self._cancelled = set(cancelled)
+        self._pending: list[int] = []
+        self._pending_since = 0.0
+        self._lock = threading.Lock()
+        # User id -> monotonic time until which their check-in permission is trusted.
+        self._staff: dict[int, float] = {}
+        self.last_scan = time.monotonic()
+
+    @classmethod
+    def load(cls, event_id: int) -> 'TicketCodeIndex':
+        rows = (
+            Ticket.objects.filter(ticket_type__event_id=event_id)
+            .values_list('code', 'status')
+            .order_by()
+            .iterator(chunk_size=5000)
+        )
+        index = cls(event_id)
+        sets = {
+            Ticket.STATUS_NEW: index._valid,
+            Ticket.STATUS_USED: index._used,
+            Ticket.STATUS_CANCELLED: index._cancelled,
+        }
+        for code, status in rows:
+            sets[status].add(code.int)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._valid) + len(self._used)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(self, code: uuid.UUID) -> None:
+        """Admit a ticket issued after the index was loaded."""
+        with self._lock:
+            if code.int not in self._used and code.int not in self._cancelled:
+                self._valid.add(code.int)
+
+    def revoke(self, codes: Iterable[uuid.UUID]) -> None:
+        """Reject tickets of a cancelled order from now on; a code already scanned stays used."""
+        with self._lock:
+            for code in codes:
+                if code.int not in self._used:
+                    self._valid.discard(code.int)
+                    self._cancelled.add(code.int)
+
+    def refresh(self, code: uuid.UUID) -> bool:
+        """Look up a code missing from the index; returns whether the event has such a ticket.
+
+        Tickets issued after ``load`` are admitted, cancelled ones are recorded as such.
+        """
+        status = (
+            Ticket.objects.filter(code=code, ticket_type__event_id=self.event_id)
+            .values_list('status', flat=True)
+            .first()
+        )
+        if status == Ticket.STATUS_NEW:
+            self.add(code)
+        elif status == Ticket.STATUS_CANCELLED:
+            self.revoke([code])
+        return status in (Ticket.STATUS_NEW, Ticket.STATUS_CANCELLED)
+
+    def is_staff(self, user_id: int) -> bool:
+        """Whether ``user_id`` was allowed to check in for this event within ``STAFF_RECHECK_INTERVAL``."""
+        return self._staff.get(user_id, 0.0) > time.monotonic()
+
+    def admit_staff(self, user_id: int) -> None:
+        self._staff[user_id] = time.monotonic() + STAFF_RECHECK_INTERVAL
+
+    def scan(self, code: uuid.UUID, shared_guard: bool = False) -> str:
+        """Check a code in and return ``OK``, ``ALREADY_USED``, ``CANCELLED`` or ``UNKNOWN``.
+
+        ``shared_guard`` also claims the code in the shared cache, which rejects a second scan
+        of the same ticket handled by another worker process, and a ticket another process revoked.
+        """
+        key = code.int
+        self.last_scan = time.monotonic()
+        with self._lock:
+            if key in self._used:
+                return ALREADY_USED
+            if key in self._cancelled:
+                return CANCELLED
+            if key not in self._valid:
+                return UNKNOWN
+            guard_key = _guard_key(self.event_id, code)
+            if shared_guard and not cache.add(guard_key, OK, SCAN_GUARD_TTL):
+                self._valid.discard(key)
+                if cache.get(guard_key) == CANCELLED:
+                    self._cancelled.add(key)
+                    return CANCELLED
+                self._used.add(key)
+                return ALREADY_USED
+            self._valid.discard(key)
+            self._used.add(key)
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append(key)
+        return OK
+
+    def drain(self) -> list[uuid.UUID]:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        return [uuid.UUID(int=key) for key in pending]
+
+    def requeue(self, codes: list[uuid.UUID]) -> None:
+        with self._lock:
+            self._pending[:0] = [code.int for code in codes]
+
+    def should_flush(self) -> bool:
+        return bool(self._pending) and (
+            len(self._pending) >= FLUSH_SIZE or time.monotonic() - self._pending_since >= FLUSH_INTERVAL
+        )
+
+    def flush(self) -> int:
+        """Persist pending scans; on a database error they stay queued for the next flush."""
+        codes = self.drain()
+        if not codes:
+            return 0
+        try:
+            return mark_used(codes)
+        except Exception:
+            self.requeue(codes)
+            raise
+
+    def dump(self, fh: BinaryIO) -> None:
+        """Write the index for an offline door station: a JSON header line, then 16-byte codes."""
+        with self._lock:
+            valid, used = sorted(self._valid), sorted(self._used)
+        header = {'event': self.event_id, 'valid': len(valid), 'used': len(used)}
+        fh.write(json.dumps(header).encode('ascii') + b'\n')
+        for key in valid + used:
+            fh.write(key.to_bytes(16, 'big'))
+
+    @classmethod
+    def read(cls, fh: BinaryIO) -> 'TicketCodeIndex':
+        header = json.loads(fh.readline())
+        codes = [int.from_bytes(fh.read(16), 'big') for _ in range(header['valid'] + header['used'])]
+        return cls(header['event'], codes[:header['valid']], codes[header['valid']:])
+
+
+def mark_used(codes: list[uuid.UUID], batch_size: int = UPDATE_BATCH_SIZE) -> int:
+    """Flip ``new`` tickets to ``used`` in batched UPDATEs; returns how many rows changed.
+
+    Codes that were already used elsewhere (another door, an earlier sync) are logged.
+    """
+    now = timezone.now()
+    updated = 0
+    per_event = Counter()
+    for start in range(0, len(codes), batch_size):
+        batch = codes[start:start + batch_size]
+        changed = Ticket.objects.filter(code__in=batch, status=Ticket.STATUS_NEW).update(
+            status=Ticket.STATUS_USED, updated_at=now
+        )
+        if changed < len(batch):
+            logger.warning('check-in: %s of %s scanned tickets were not new', len(batch) - changed, len(batch))
+        updated += changed
+        if changed:
+            per_event.update(dict(
+                Ticket.objects.filter(code__in=batch, status=Ticket.STATUS_USED, updated_at=now)
+                .values_list('ticket_type__event')
+                .annotate(count=Count('id'))
+                .order_by()
+            ))
+    for event_id, count in per_event.items():
+        record(event_id, now, checkins=count)
+    return updated
+
+
+def _guard_key(event_id: int, code: uuid.UUID) -> str:
+    return f'checkin:{event_id}:{code.hex}'
+
+
+def revoke(codes_by_event: dict[int, list[uuid.UUID]]) -> None:
+    """Stop admitting the tickets of a cancelled order in this process and, via the scan guard, in the others."""
+    for event_id, codes in codes_by_event.items():
+        index = loaded(event_id)
+        if index is not None:
+            index.revoke(codes)
+        cache.set_many({_guard_key(event_id, code): CANCELLED for code in codes}, SCAN_GUARD_TTL)
+
+
+_indexes: dict[int, TicketCodeIndex] = {}
+_indexes_lock = threading.Lock()
+_flusher: threading.Thread | None = None
+
+
+def loaded(event_id: int) -> TicketCodeIndex | None:
+    return _indexes.get(event_id)
+
+
+def index_for(event_id: int) -> TicketCodeIndex:
+    """Process-wide index of an event, loaded on first use; starts the background flusher."""
+    index = _indexes.get(event_id)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(event_id)
+            if index is None:
+                index = _indexes[event_id] = TicketCodeIndex.load(event_id)
+                if len(_indexes) > MAX_INDEXES:
+                    _evict(min(_indexes.values(), key=lambda other: other.last_scan))
+        start_flusher()
+    return index
+
+
+def _flush(index: TicketCodeIndex) -> bool:
+    """Write an index's pending scans; a failure is logged and the scans stay queued."""
+    try:
+        index.flush()
+    except Exception:
+        logger.exception('check-in: could not flush %s pending scans of event %s', index.pending, index.event_id)
+        return False
+    return True
+
+
+def _evict(index: TicketCodeIndex) -> None:
+    """Drop an index after writing its pending scans; it stays loaded if they cannot be written."""
+    if _flush(index) and _indexes.get(index.event_id) is index:
+        del _indexes[index.event_id]
+
+
+def flush_due() -> None:
+    """Write the scans that waited ``FLUSH_INTERVAL`` and drop the indexes idle for ``INDEX_IDLE_TTL``."""
+    idle_since = time.monotonic() - INDEX_IDLE_TTL
+    for index in list(_indexes.values()):
+        if index.last_scan < idle_since:
+            with _indexes_lock:
+                _evict(index)
+        elif index.should_flush():
+            _flush(index)
+
+
+def _flush_loop() -> None:
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        try:
+            flush_due()
+        except Exception:
+            logger.exception('check-in: background flush failed')
+        finally:
+            close_old_connections()
+
+
+def start_flusher() -> None:
+    """Write pending scans from a daemon thread, so the last scans before a quiet spell reach the database."""
+    global _flusher
+    if _flusher is None:
+        with _indexes_lock:
+            if _flusher is None:
+                _flusher = threading.Thread(target=_flush_loop, name='checkin-flusher', daemon=True)
+                _flusher.start()
+
+
+@atexit.register
+def flush_all() -> None:
+    """Write the scans still pending in this process."""
+    for index in list(_indexes.values()):
+        _flush(index)
@@ -0,0 +1,99 @@
+import sys
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tickets.checkin import ALREADY_USED, CANCELLED, OK, UNKNOWN, TicketCodeIndex, mark_used
+
+
+class Command(BaseCommand):
+    help = 'Door check-in station: scan ticket codes from stdin, online or offline with a journal synced later'
+
+    def add_arguments(self, parser):
+        parser.add_argument('event', nargs='?', type=int, help='Event id (online mode and --export)')
+        parser.add_argument('--export', metavar='FILE', help='Write the event code index for an offline station')
+        parser.add_argument('--offline', metavar='FILE', help='Scan against an exported index without the database')
+        parser.add_argument('--journal', metavar='FILE', help='Where offline scans are appended (with --offline)')
+        parser.add_argument('--sync', metavar='JOURNAL', help='Mark the tickets of an offline journal as used')
+
+    def handle(self, *args, **options):
+        if options['sync']:
+            return self.sync(options['sync'])
+        if options['offline']:
+            if not options['journal']:
+                raise CommandError('--offline needs --journal.')
+            return self.offline(options['offline'], options['journal'])
+        if options['event'] is None:
+            raise CommandError('Give an event id, --offline or --sync.')
+
+        started = time.perf_counter()
+        index = TicketCodeIndex.load(options['event'])
+        self.stderr.write(f'Loaded {len(index)} codes in {(time.perf_counter() - started) * 1000:.0f} ms.')
+        if options['export']:
+            with open(options['export'], 'wb') as fh:
+                index.dump(fh)
+            self.stdout.write(f"Exported event {index.event_id} to {options['export']}.")
+            return
+
+        try:
+            self.scan_stdin(index, refresh=True)
+        finally:
+            written = index.flush()
+            self.stderr.write(f'Marked {written} tickets as used.')
+
+    def offline(self, path: str, journal_path: str) -> None:
+        with open(path, 'rb') as fh:
+            index = TicketCodeIndex.read(fh)
+        # Scans from an earlier run of this station still count: a restart must not readmit anyone.
+        for code in read_journal(journal_path, missing_ok=True):
+            index.scan(code)
+        index.drain()
+        with open(journal_path, 'a', encoding='ascii') as journal:
+            def record(code):
+                journal.write(f'{code.hex}\n')
+                journal.flush()
+            self.scan_stdin(index, on_ok=record)
+
+    def scan_stdin(self, index: TicketCodeIndex, refresh: bool = False, on_ok=None) -> None:
+        counts = {OK: 0, ALREADY_USED: 0, CANCELLED: 0, UNKNOWN: 0}
+        elapsed = 0.0
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                code = uuid.UUID(line)
+            except ValueError:
+                self.stdout.write(f'{line} invalid')
+                continue
+            started = time.perf_counter()
+            result = index.scan(code)
+            elapsed += time.perf_counter() - started
+            if result == UNKNOWN and refresh and index.refresh(code):
+                result = index.scan(code)
+            counts[result] += 1
+            if result == OK and on_ok:
+                on_ok(code)
+            if refresh and index.should_flush():
+                index.flush()
+            self.stdout.write(f'{code} {result}')
+        scanned = sum(counts.values())
+        if scanned:
+            summary = ', '.join(f'{name}={count}' for name, count in counts.items())
+            self.stderr.write(f'{summary}; {elapsed / scanned * 1e6:.1f} µs per lookup.')
+
+    def sync(self, journal_path: str) -> None:
+        codes = list(dict.fromkeys(read_journal(journal_path)))
+        written = mark_used(codes)
+        self.stdout.write(f'Synced {len(codes)} scans: {written} marked as used, {len(codes) - written} conflicts.')
+
+
+def read_journal(path: str, missing_ok: bool = False) -> list[uuid.UUID]:
+    try:
+        with open(path, encoding='ascii') as fh:
+            return [uuid.UUID(line.strip()) for line in fh if line.strip()]
+    except FileNotFoundError:
+        if missing_ok:
+            return []
+        raise CommandError(f'Journal {path} not found.')
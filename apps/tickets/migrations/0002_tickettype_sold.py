@@ -0,0 +1,42 @@
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_sold(apps, schema_editor):
+    TicketType = apps.get_model('tickets', 'TicketType')
+    OrderItem = apps.get_model('orders', 'OrderItem')
+    sold = (
+        OrderItem.objects.exclude(order__status='cancelled')
+        .values('ticket_type')
+        .annotate(total=Sum('qty'))
+        .values_list('ticket_type', 'total')
+    )
+    for ticket_type_id, total in sold:
+        ticket_type = TicketType.objects.get(pk=ticket_type_id)
+        ticket_type.sold = total
+        # Types oversold before the counter existed keep their sales; the constraint needs sold <= quota.
+        ticket_type.quota = max(ticket_type.quota, total)
+        ticket_type.save(update_fields=['sold', 'quota'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0001_initial'),
+        ('orders', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tickettype',
+            name='sold',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_sold, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='tickettype',
+            constraint=models.CheckConstraint(
+                check=models.Q(sold__lte=models.F('quota')), name='tickettype_sold_within_quota'
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tickets', '0002_tickettype_sold'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='tickettype',
+            name='tickettype_sold_within_quota',
+        ),
+        migrations.AddField(
+            model_name='tickettype',
+            name='held',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddConstraint(
+            model_name='tickettype',
+            constraint=models.CheckConstraint(
+                check=models.Q(sold__lte=models.F('quota') - models.F('held')), name='tickettype_sold_within_quota'
+            ),
+        ),
+        migrations.CreateModel(
+            name='TicketHold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('qty', models.PositiveIntegerField()),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('claim', models.UUIDField(blank=True, db_index=True, editable=False, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                (
+                    'ticket_type',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name='holds', to='tickets.tickettype'
+                    ),
+                ),
+                (
+                    'user',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='ticket_holds',
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                'ordering': ['expires_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0001_initial'),
+        ('tickets', '0003_tickethold'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='order',
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='tickets',
+                to='orders.order',
+            ),
+        ),
+    ]
@@ -3,6 +3,7 @@ import uuid
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.utils import timezone
 
 from apps.core.models import TimeStampedModel
 from apps.events.models import Event
@@ -13,17 +14,52 @@ class TicketType(TimeStampedModel):
     name = models.CharField(max_length=120)
     price = models.DecimalField(max_digits=10, decimal_places=2, validators=[MinValueValidator(0)])
     quota = models.PositiveIntegerField(default=0)
+    # Tickets in live (not cancelled) orders and in unexpired holds; both are changed only by
+    # conditional UPDATEs in apps.orders.services, so availability never needs a scan.
+    sold = models.PositiveIntegerField(default=0, editable=False)
+    held = models.PositiveIntegerField(default=0, editable=False)
     sale_start = models.DateTimeField(null=True, blank=True)
     sale_end = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ['price']
         unique_together = ('event', 'name')
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(sold__lte=models.F('quota') - models.F('held')), name='tickettype_sold_within_quota'
+            ),
+        ]
+
+    @property
+    def available(self) -> int:
+        return max(self.quota - self.sold - self.held, 0)
+
+    def on_sale(self, now=None) -> bool:
+        now = now or timezone.now()
+        return (self.sale_start is None or self.sale_start <= now) and (self.sale_end is None or now < self.sale_end)
 
     def __str__(self) -> str:
         return f"{self.event.title} - {self.name}"
 
 
+class TicketHold(models.Model):
+    """Tickets set aside for a buyer until ``expires_at``; the row exists only while the hold is live."""
+
+    ticket_type = models.ForeignKey(TicketType, on_delete=models.CASCADE, related_name='holds')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='ticket_holds')
+    qty = models.PositiveIntegerField()
+    expires_at = models.DateTimeField(db_index=True)
+    # Set by whoever converts, releases or expires the hold, in the same UPDATE that checks it is unclaimed.
+    claim = models.UUIDField(null=True, blank=True, editable=False, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['expires_at']
+
+    def __str__(self) -> str:
+        return f"{self.ticket_type} x{self.qty}"
+
+
 class Ticket(TimeStampedModel):
     STATUS_NEW = 'new'
     STATUS_USED = 'used'
@@ -37,11 +73,15 @@ class Ticket(TimeStampedModel):
 
     ticket_type = models.ForeignKey(TicketType, on_delete=models.PROTECT, related_name='tickets')
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    order = models.ForeignKey(
+        'orders.Order', on_delete=models.SET_NULL, null=True, blank=True, related_name='tickets'
+    )
     code = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_NEW)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['user', '-created_at'], name='ticket_user_created_idx')]
 
     def __str__(self) -> str:
         return f"{self.ticket_type}"
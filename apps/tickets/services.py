@@ -0,0 +1,49 @@
+import uuid
+from itertools import chain, islice, repeat
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from apps.notifications.models import Notification
+from apps.orders.models import Order
+from apps.stats.rollups import record_order
+from apps.tickets.models import Ticket
+
+ISSUE_BATCH_SIZE = 500
+
+
+def issue_tickets(order: Order) -> int:
+    """Issue one ticket per seat of a paid order and notify the buyer once.
+
+    Safe to call again for the same order (a replayed payment confirmation): only the call
+    that flips ``tickets_issued_at`` issues anything. Returns the number of tickets created.
+    """
+    issued_at = timezone.now()
+    with transaction.atomic():
+        claimed = Order.objects.filter(
+            pk=order.pk, status=Order.STATUS_PAID, tickets_issued_at__isnull=True
+        ).update(tickets_issued_at=issued_at)
+        if not claimed:
+            return 0
+        # A later save() of this instance must not write the flag back to NULL.
+        order.tickets_issued_at = issued_at
+        items = order.items.values_list('ticket_type_id', 'qty')
+        seats = chain.from_iterable(repeat(ticket_type_id, qty) for ticket_type_id, qty in items)
+        issued = 0
+        while batch := list(islice(seats, ISSUE_BATCH_SIZE)):
+            # Codes are generated here rather than by the database, so the batch needs no read-back.
+            Ticket.objects.bulk_create([
+                Ticket(order_id=order.pk, user_id=order.user_id, ticket_type_id=ticket_type_id, code=uuid.uuid4())
+                for ticket_type_id in batch
+            ])
+            issued += len(batch)
+        if issued:
+            record_order(order.pk, when=issued_at)
+            Notification.objects.create(
+                user_id=order.user_id,
+                title=_('Билеты готовы'),
+                message=_('Заказ #%(order)s оплачен: выпущено билетов — %(count)s. Они в разделе «Мои билеты».')
+                % {'order': order.pk, 'count': issued},
+            )
+    return issued
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.orders.models import Order
+from apps.tickets.services import issue_tickets
+
+
+@receiver(post_save, sender=Order)
+def order_paid(sender, instance, **kwargs):
+    if instance.status == Order.STATUS_PAID and instance.tickets_issued_at is None:
+        issue_tickets(instance)
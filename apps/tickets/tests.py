@@ -0,0 +1,133 @@
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from apps.core.testing import CacheIsolatedTestCase, make_event
+from apps.notifications.models import Notification
+from apps.orders.models import Order
+from apps.orders.services import cancel_order, checkout
+from apps.organizers.models import OrganizerMember
+from apps.tickets import checkin
+from apps.tickets.models import Ticket, TicketType
+from apps.tickets.services import issue_tickets
+from apps.users.models import UserProfile
+
+
+class IssueTicketsTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('buyer', password='unused')
+        event = make_event()
+        cls.standard = TicketType.objects.create(event=event, name='Standard', price=1000, quota=10)
+        cls.vip = TicketType.objects.create(event=event, name='VIP', price=5000, quota=10)
+
+    def setUp(self):
+        super().setUp()
+        self.order = checkout(self.user, [(self.standard.pk, 3), (self.vip.pk, 1)])
+
+    def test_unpaid_order_gets_no_tickets(self):
+        self.assertEqual(issue_tickets(self.order), 0)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_paying_issues_one_ticket_per_seat_and_one_notification(self):
+        self.order.status = Order.STATUS_PAID
+        self.order.save()
+        tickets = Ticket.objects.filter(order=self.order)
+        self.assertEqual(
+            sorted(tickets.values_list('ticket_type_id', flat=True)),
+            [self.standard.pk] * 3 + [self.vip.pk],
+        )
+        self.assertEqual(len(set(tickets.values_list('code', flat=True))), 4)
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 1)
+        self.order.refresh_from_db()
+        self.assertIsNotNone(self.order.tickets_issued_at)
+
+    def test_replayed_confirmation_issues_nothing(self):
+        self.order.status = Order.STATUS_PAID
+        self.order.save()
+        # A stale copy of the order, as a replayed payment callback would load it.
+        stale = Order.objects.get(pk=self.order.pk)
+        stale.tickets_issued_at = None
+        self.assertEqual(issue_tickets(stale), 0)
+        self.order.save()
+        self.assertEqual(Ticket.objects.filter(order=self.order).count(), 4)
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 1)
+
+
+class CheckinTests(CacheIsolatedTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.event = make_event()
+        cls.door = User.objects.create_user('door', password='unused')
+        UserProfile.objects.filter(user=cls.door).update(role=UserProfile.ROLE_STAFF)
+        OrganizerMember.objects.create(organizer=cls.event.organizer, user=cls.door)
+        ticket_type = TicketType.objects.create(event=cls.event, name='Standard', price=1000, quota=10)
+        cls.order = checkout(User.objects.create_user('buyer', password='unused'), [(ticket_type.pk, 2)])
+        cls.order.status = Order.STATUS_PAID
+        cls.order.save()
+
+    def setUp(self):
+        super().setUp()
+        # The indexes are process-wide; pending scans must not outlive the test database.
+        self.addCleanup(checkin._indexes.clear)
+        # The tests flush by hand; a flusher thread would write through a connection outside the test transaction.
+        patcher = mock.patch.object(checkin, 'start_flusher')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client.force_login(self.door)
+        self.first, self.second = Ticket.objects.filter(order=self.order).values_list('code', flat=True)
+
+    def scan(self, code):
+        body = json.dumps({'event': self.event.pk, 'code': str(code)})
+        return self.client.post(reverse('api:checkin'), body, content_type='application/json')
+
+    def test_second_scan_is_rejected(self):
+        self.assertEqual(self.scan(self.first).status_code, 200)
+        response = self.scan(self.first)
+        self.assertEqual((response.status_code, response.json()['error']['code']), (409, 'already_used'))
+        self.assertEqual(checkin.loaded(self.event.pk).flush(), 1)
+        self.assertEqual(Ticket.objects.get(code=self.first).status, Ticket.STATUS_USED)
+
+    def test_cancelled_order_is_rejected_by_loaded_indexes(self):
+        self.assertEqual(self.scan(self.first).status_code, 200)
+        # Another worker process loaded the codes before the cancellation too.
+        elsewhere = checkin.TicketCodeIndex.load(self.event.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            cancel_order(self.order)
+        response = self.scan(self.second)
+        self.assertEqual((response.status_code, response.json()['error']['code']), (409, 'cancelled'))
+        self.assertEqual(elsewhere.scan(self.second, shared_guard=True), checkin.CANCELLED)
+        self.assertEqual(checkin.TicketCodeIndex.load(self.event.pk).scan(self.second), checkin.CANCELLED)
+
+    def test_permission_is_checked_again(self):
+        self.assertEqual(self.scan(self.first).status_code, 200)
+        OrganizerMember.objects.filter(user=self.door).delete()
+        with mock.patch('time.monotonic', return_value=10**9):
+            self.assertEqual(self.scan(self.second).status_code, 403)
+
+    def later(self, seconds: float):
+        return mock.patch('time.monotonic', return_value=checkin.time.monotonic() + seconds)
+
+    def test_pending_scans_are_flushed_in_the_background(self):
+        self.assertEqual(self.scan(self.first).status_code, 200)
+        checkin.flush_due()
+        self.assertEqual(Ticket.objects.get(code=self.first).status, Ticket.STATUS_NEW)
+        with self.later(checkin.FLUSH_INTERVAL):
+            checkin.flush_due()
+        self.assertEqual(Ticket.objects.get(code=self.first).status, Ticket.STATUS_USED)
+
+    def test_idle_index_is_written_and_dropped(self):
+        self.assertEqual(self.scan(self.first).status_code, 200)
+        with self.later(checkin.INDEX_IDLE_TTL + 1):
+            checkin.flush_due()
+        self.assertIsNone(checkin.loaded(self.event.pk))
+        self.assertEqual(Ticket.objects.get(code=self.first).status, Ticket.STATUS_USED)
+
+    def test_least_recently_scanned_index_is_dropped(self):
+        self.assertEqual(self.scan(self.first).status_code, 200)
+        with mock.patch.object(checkin, 'MAX_INDEXES', 1), self.later(1):
+            checkin.index_for(make_event('other-event').pk)
+        self.assertIsNone(checkin.loaded(self.event.pk))
+        self.assertEqual(Ticket.objects.get(code=self.first).status, Ticket.STATUS_USED)
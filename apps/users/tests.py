@@ -0,0 +1,37 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.core.testing import CacheIsolatedTestCase
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class LoginThrottleTests(CacheIsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        User.objects.create_user('alice', password='right-password')
+        self.url = reverse('users:login')
+
+    def post(self, password: str):
+        return self.client.post(self.url, {'username': 'alice', 'password': password})
+
+    @override_settings(LOGIN_ATTEMPT_LIMIT=2)
+    def test_failed_attempts_beyond_the_limit_are_throttled(self):
+        self.assertEqual(self.post('wrong').status_code, 200)
+        self.assertEqual(self.post('wrong').status_code, 200)
+        self.assertEqual(self.post('right-password').status_code, 429)
+        self.assertEqual(self.client.get(self.url).status_code, 429)
+
+    @override_settings(LOGIN_ATTEMPT_LIMIT=2)
+    def test_login_clears_the_count(self):
+        self.post('wrong')
+        self.assertEqual(self.post('right-password').status_code, 302)
+        self.client.logout()
+        self.post('wrong')
+        self.assertEqual(self.post('right-password').status_code, 302)
+
+    @override_settings(LOGIN_ATTEMPT_LIMIT=0)
+    def test_zero_limit_turns_the_throttle_off(self):
+        for _ in range(10):
+            self.assertEqual(self.post('wrong').status_code, 200)
+        self.assertEqual(self.post('right-password').status_code, 302)
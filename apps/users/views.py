@@ -1,11 +1,9 @@
-import logging
-
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import AuthenticationForm
 from django.core.cache import cache
-from django.core.mail import send_mail
 from django.http import HttpRequest
 from django.shortcuts import redirect, render
 from django.template.loader import render_to_string
@@ -14,15 +12,13 @@ from django.utils.encoding import force_bytes, force_str
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from django.utils.translation import gettext_lazy as _
 
+from apps.core.cache import count_hit
+from apps.core.mail import queue_mail
 from apps.users.forms import ProfileForm, RegisterForm, UserUpdateForm
 from apps.users.models import UserProfile
 from apps.users.tokens import email_verification_token
 
 
-logger = logging.getLogger(__name__)
-
-
-ATTEMPT_LIMIT = 5
 ATTEMPT_TTL = 600
 
 
@@ -31,7 +27,7 @@ def _attempt_key(request: HttpRequest) -> str:
     return f"login-attempts:{ip}"
 
 
-def _send_verification_email(request: HttpRequest, user) -> bool:
+def _queue_verification_email(request: HttpRequest, user) -> None:
     uid = urlsafe_base64_encode(force_bytes(user.pk))
     token = email_verification_token.make_token(user)
     verify_url = request.build_absolute_uri(
@@ -43,12 +39,8 @@ def _send_verification_email(request: HttpRequest, user) -> bool:
         {'user': user, 'verify_url': verify_url},
         request=request,
     )
-    try:
-        send_mail(subject, message, None, [user.email])
-    except Exception:
-        logger.exception('Failed to send verification email for user=%s', user.pk)
-        return False
-    return True
+    # Delivered by `send_queued_mail`; the mail server is never waited on in the request.
+    queue_mail(str(subject), message, [user.email])
 
 
 def register_view(request):
@@ -58,10 +50,8 @@ def register_view(request):
             user = form.save(commit=False)
             user.is_active = False
             user.save()
-            if _send_verification_email(request, user):
-                messages.success(request, _('Проверьте почту и подтвердите регистрацию.'))
-            else:
-                messages.error(request, _('Не удалось отправить письмо подтверждения. Попробуйте позже.'))
+            _queue_verification_email(request, user)
+            messages.success(request, _('Проверьте почту и подтвердите регистрацию.'))
             return redirect('users:login')
         messages.error(request, _('Исправьте ошибки формы.'))
     else:
@@ -71,11 +61,19 @@ def register_view(request):
 
 def login_view(request):
     key = _attempt_key(request)
-    attempts = cache.get(key, 0)
+    limit = settings.LOGIN_ATTEMPT_LIMIT
     next_url = request.GET.get('next') or request.POST.get('next')
-    if attempts >= ATTEMPT_LIMIT:
+    if not limit:
+        blocked = False
+    elif request.method == 'POST':
+        # Counted before the password check so parallel guesses cannot all pass under the limit.
+        blocked = count_hit(key, ATTEMPT_TTL) > limit
+    else:
+        blocked = cache.get(key, 0) >= limit
+    if blocked:
         messages.error(request, _('Слишком много попыток входа. Попробуйте позже.'))
-        return render(request, 'users/login.html', {'form': AuthenticationForm(request), 'next': next_url})
+        context = {'form': AuthenticationForm(request), 'next': next_url}
+        return render(request, 'users/login.html', context, status=429)
 
     if request.method == 'POST':
         form = AuthenticationForm(request, data=request.POST)
@@ -90,7 +88,6 @@ def login_view(request):
             if User.objects.filter(username=username, is_active=False).exists():
                 messages.error(request, _('Почта не подтверждена. Проверьте письмо.'))
                 return render(request, 'users/login.html', {'form': form, 'next': next_url})
-        cache.set(key, attempts + 1, ATTEMPT_TTL)
         messages.error(request, _('Неверный логин или пароль.'))
     else:
         form = AuthenticationForm(request)
@@ -1,6 +1,5 @@
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Avg, Count
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, DeleteView, UpdateView
@@ -54,8 +53,5 @@ def venue_list(request):
 
 def venue_detail(request, slug):
     venue = get_object_or_404(Venue.objects.select_related('city'), slug=slug)
-    events = venue.events.annotate(
-        avg_rating=Avg('reviews__rating', distinct=True),
-        reviews_count=Count('reviews', distinct=True),
-    ).order_by('start_at')
+    events = venue.events.for_cards().order_by('start_at')
     return render(request, 'venues/venue_detail.html', {'venue': venue, 'events': events})
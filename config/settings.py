@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -44,10 +45,13 @@ INSTALLED_APPS = [
     'apps.pages',
     'apps.api',
     'apps.notifications',
+    'apps.search',
+    'apps.stats',
 ]
 
 
 MIDDLEWARE = [
+    'apps.core.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
@@ -58,14 +62,6 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'cityevents-cache',
-    }
-}
-
-
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -79,6 +75,8 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'apps.core.context_processors.fragment_cache',
+                'apps.notifications.context_processors.unread_notifications',
             ],
         },
     },
@@ -105,6 +103,10 @@ if os.getenv('DB_ENGINE') or os.getenv('POSTGRES_DB'):
         'PORT': os.getenv('POSTGRES_PORT', '5432'),
     }
 
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # Concurrent checkouts queue for SQLite's write lock instead of failing with "database is locked".
+    DATABASES['default']['OPTIONS'] = {'timeout': int(os.getenv('SQLITE_TIMEOUT', '20'))}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -153,13 +155,80 @@ DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'CityEvents <no-reply@citye
 if DEBUG and not EMAIL_HOST:
     EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
+# Messages per minute `send_queued_mail` may hand to the mail server, across all workers; 0 = no limit.
+EMAIL_RATE_LIMIT = int(os.getenv('EMAIL_RATE_LIMIT', '60'))
+
 
+# Cache tier shared by all worker processes: sqlite (default, a local file), file, redis
+# (needs the `redis` package) or locmem (per process, for development only).
+CACHE_BACKENDS = {
+    'sqlite': ('apps.core.cache.SQLiteCache', str(BASE_DIR / 'var' / 'cache.sqlite3')),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / 'var' / 'cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'cityevents-cache'),
+}
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'sqlite')
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'cityevents-cache',
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': os.getenv('CACHE_LOCATION', CACHE_BACKENDS[CACHE_BACKEND][1]),
+        'KEY_PREFIX': os.getenv('CACHE_KEY_PREFIX', 'cityevents'),
     }
 }
+if CACHE_BACKEND != 'redis':
+    # Redis evicts by its own maxmemory policy and passes OPTIONS to its connection pool.
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '100000'))}
+
+# Seconds tickets stay held between "buy" and order confirmation; `expire_holds` frees the rest.
+TICKET_HOLD_TTL = int(os.getenv('TICKET_HOLD_TTL', '600'))
+
+# 'fake' adds a "pay" button to unpaid orders that runs the local stand-in provider.
+PAYMENT_PROVIDER = os.getenv('PAYMENT_PROVIDER', 'fake' if DEBUG else '')
+# Key of the HMAC-SHA256 signature on payment provider callbacks (POST /api/payments/webhook/).
+# Only development has a default; without a key the webhook rejects every callback.
+PAYMENT_WEBHOOK_SECRET = os.getenv('PAYMENT_WEBHOOK_SECRET', 'dev-webhook-secret-change-me' if DEBUG else '')
+if not PAYMENT_WEBHOOK_SECRET and PAYMENT_PROVIDER not in ('', 'fake'):
+    raise ImproperlyConfigured(f'PAYMENT_PROVIDER={PAYMENT_PROVIDER} needs PAYMENT_WEBHOOK_SECRET.')
+
+# Dotted path to a search backend class; empty selects one by database vendor.
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', '')
+
+# Seconds a catalogue id list stays cached; writes invalidate it earlier.
+EVENT_QUERY_CACHE_TTL = int(os.getenv('EVENT_QUERY_CACHE_TTL', '300'))
+
+# Seconds an event card or detail fragment stays cached. Keys include the event's updated_at,
+# so this only bounds how long a renamed city, venue or organizer can show its old name.
+FRAGMENT_CACHE_TTL = int(os.getenv('FRAGMENT_CACHE_TTL', '600'))
+
+# Seconds an organizer dashboard payload is reused; it is read from the statistics rollups.
+DASHBOARD_CACHE_TTL = int(os.getenv('DASHBOARD_CACHE_TTL', '30'))
+
+# Failed logins per IP in ATTEMPT_TTL before the login form refuses; 0 turns the limit off for load tests.
+LOGIN_ATTEMPT_LIMIT = int(os.getenv('LOGIN_ATTEMPT_LIMIT', '5'))
+
+# Days of rollups summed on the public /stats/ page.
+STATS_WINDOW_DAYS = int(os.getenv('STATS_WINDOW_DAYS', '30'))
+
+# Upper bound for ?page_size= in the JSON API; bulk reads go through /api/events/export/.
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', '100'))
+
+# Opt-in request instrumentation: Server-Timing header and `cityevents.perf` log records.
+PERF_INSTRUMENTATION = os.getenv('PERF_INSTRUMENTATION', 'False').lower() == 'true'
+# Requests running more SQL queries than this are logged as warnings; 0 disables the check.
+PERF_QUERY_BUDGET = int(os.getenv('PERF_QUERY_BUDGET', '30'))
+# Tighter budgets keyed by URL name. The listing entries are exact: a signed-in request with an
+# empty cache runs that many queries however many cards it shows, as apps/events/tests.py asserts.
+PERF_VIEW_QUERY_BUDGETS = {
+    'pages:home': 4,
+    'events:list': 5,
+    'events:my': 7,
+    'venues:detail': 5,
+    'organizers:detail': 6,  # plus the dashboard membership check
+    'categories:detail': 5,
+    'favorites:list': 5,
+    'api:events_collection': 4,
+    'api:event_detail': 8,
+}
 
 LOGGING = {
     'version': 1,
@@ -173,4 +242,9 @@ LOGGING = {
         'handlers': ['console'],
         'level': os.getenv('LOG_LEVEL', 'INFO'),
     },
+    'loggers': {
+        'cityevents.perf': {
+            'level': os.getenv('PERF_LOG_LEVEL', 'INFO'),
+        },
+    },
 }
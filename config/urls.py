@@ -16,6 +16,7 @@ urlpatterns = [
     path('tags/', include(('apps.tags.urls', 'tags'), namespace='tags')),
     path('reviews/', include(('apps.reviews.urls', 'reviews'), namespace='reviews')),
     path('favorites/', include(('apps.favorites.urls', 'favorites'), namespace='favorites')),
+    path('notifications/', include(('apps.notifications.urls', 'notifications'), namespace='notifications')),
     path('api/', include(('apps.api.urls', 'api'), namespace='api')),
     path('', include(('apps.pages.urls', 'pages'), namespace='pages')),
 ]
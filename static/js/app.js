@@ -188,4 +188,72 @@
             $input.data('dtp-init', true);
         });
     }
+
+    // 17) "Show more" links that append the next page fragment in place
+    doc.addEventListener('click', (event) => {
+        const link = event.target.closest('[data-load-more]');
+        if (!link) return;
+        event.preventDefault();
+        link.classList.add('is-loading');
+        fetch(link.href, { headers: { 'X-Requested-With': 'fetch' } })
+            .then((response) => (response.ok ? response.text() : Promise.reject(response)))
+            .then((html) => {
+                link.insertAdjacentHTML('afterend', html);
+                link.remove();
+            })
+            .catch(() => {
+                window.location.href = link.href;
+            });
+    });
+
+    // 18) Organizer dashboard: bar charts from the cached JSON, refreshed periodically
+    const dashboard = doc.querySelector('[data-dashboard]');
+    if (dashboard) {
+        const controls = dashboard.querySelector('[data-dashboard-controls]');
+        const bars = (container, points, value, label) => {
+            const max = Math.max(1, ...points.map((p) => value(p) || 0));
+            container.innerHTML = '';
+            points.forEach((point) => {
+                const bar = doc.createElement('span');
+                bar.className = 'dash-bar';
+                bar.style.height = `${((value(point) || 0) / max) * 100}%`;
+                bar.title = label(point);
+                container.appendChild(bar);
+            });
+        };
+        const render = (data) => {
+            Object.entries(data.totals).forEach(([key, value]) => {
+                const el = dashboard.querySelector(`[data-total="${key}"]`);
+                if (el) el.textContent = value;
+            });
+            const rate = data.conversion.rate;
+            dashboard.querySelector('[data-total="conversion"]').textContent =
+                rate === null ? '—' : `${(rate * 100).toFixed(1)}%`;
+            bars(dashboard.querySelector('[data-chart="sales"]'), data.sales, (p) => p.tickets_sold,
+                (p) => `${p.t}: ${p.tickets_sold} / ${p.revenue}`);
+            bars(dashboard.querySelector('[data-chart="ratings"]'), data.ratings, (p) => p.avg,
+                (p) => `${p.t}: ${p.avg === null ? '—' : p.avg} (${p.reviews})`);
+            const body = dashboard.querySelector('[data-ticket-types]');
+            body.innerHTML = '';
+            data.ticket_types.forEach((tt) => {
+                const row = body.insertRow();
+                [tt.event_title, tt.name, tt.quota, tt.sold, tt.held, tt.available].forEach((value) => {
+                    row.insertCell().textContent = value;
+                });
+            });
+            dashboard.querySelector('[data-generated]').textContent = data.generated_at;
+        };
+        const load = () => {
+            const params = new URLSearchParams(new FormData(controls));
+            fetch(`${dashboard.dataset.dashboard}?${params}`, { headers: { 'X-Requested-With': 'fetch' } })
+                .then((response) => (response.ok ? response.json() : Promise.reject(response)))
+                .then(render)
+                .catch(() => {});
+        };
+        controls.addEventListener('change', load);
+        load();
+        setInterval(() => {
+            if (!doc.hidden) load();
+        }, Number(dashboard.dataset.refresh || 30) * 1000);
+    }
 })();